@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+AI 카드 생성 오프라인 벤치마크
+
+실제 AICardGenerator.generate_full_season 코드 경로를 가짜 백엔드로 실행합니다.
+- 네트워크 / Firebase / Genspark 크레딧 없이 실행
+- 시즌 크기별 처리량, 카드 지연 시간 백분위수, 최대 메모리 측정
+  (최대 메모리는 같은 설정으로 한 번 더 실행해서 측정 → 시간 측정에는 tracemalloc 비용 없음)
+
+사용법:
+    python3 benchmark.py --sizes 70,700,7000 --concurrency 8 --latency-ms 50
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+from contextlib import redirect_stdout
+from typing import Dict, List
+
+from generate_cards_with_ai import AICardGenerator, CardStyle, GenerationMode
+from card_allocation import (
+    allocate_counts, parse_best_of_spec, thematic_table, DEFAULT_RARITY_WEIGHTS
+)
+from fake_backends import FakeImageServer, FakeGenSparkSDK, FakeBucket, FakeFirestore
+from image_cache import ImageCache
+from image_variants import DEFAULT_VARIANT_SIZES, DEFAULT_VARIANT_FORMATS
+from image_quality import QualityGate
+from model_router import ModelRouter
+from run_metrics import Stage
+
+def build_benchmark_concepts(total: int) -> List[Dict]:
+    """시즌 크기에 맞춘 벤치마크용 카드 컨셉 (기본 희귀도 비율로 분배)"""
+
+    table = thematic_table(allocate_counts(total, DEFAULT_RARITY_WEIGHTS), 'Bench Card')
+    return [dict(concept, description=f"Benchmark card {concept['index'] + 1}")
+            for concept in table]
+
+
+def run_benchmark(total: int, args: argparse.Namespace, server: FakeImageServer,
+                  trace_memory: bool = False) -> Dict:
+    """시즌 1회 벤치마크 실행 (trace_memory: tracemalloc으로 최대 메모리 측정, 시간은 참고용)"""
+
+    error_rates = {
+        'rate_limit': args.rate_limit_errors,
+        'timeout': args.timeout_errors,
+        'content': args.content_errors,
+        'blank': args.blank_rate,
+        'duplicate': args.duplicate_rate,
+        'stall': args.stall_rate,
+    }
+    best_of = parse_best_of_spec(args.best_of) if args.best_of else {}
+    sdk = FakeGenSparkSDK(server, latency_ms=args.latency_ms,
+                          latency_sigma=args.latency_sigma,
+                          error_rates={k: v for k, v in error_rates.items() if v > 0},
+                          seed=args.seed,
+                          images_per_call=max(best_of.values(), default=1),
+                          stall_ms=args.stall_ms)
+    backups = [model.strip() for model in (args.hedge_models or '').split(',') if model.strip()]
+    router = ModelRouter(backups=backups, min_hedge_delay=args.min_hedge_delay)
+
+    with tempfile.TemporaryDirectory(prefix='gacha_bench_') as work_dir:
+        image_cache = None
+        if args.cache:
+            image_cache = ImageCache(os.path.join(work_dir, 'cache'))
+        quality_gate = None
+        if args.quality_gate:
+            quality_gate = QualityGate(os.path.join(work_dir, 'hashes'))
+
+        generator = AICardGenerator(
+            season_id=f'BENCH_{total}',
+            manifest_dir=os.path.join(work_dir, 'manifests'),
+            image_cache=image_cache,
+            rate_limit=args.rate_limit,
+            report_dir=None,
+            catalog_dir=os.path.join(work_dir, 'catalog'),
+            db=FakeFirestore(commit_latency=args.commit_latency_ms / 1000),
+            bucket=FakeBucket(upload_latency=args.upload_latency_ms / 1000),
+            variant_sizes=DEFAULT_VARIANT_SIZES if args.variants else None,
+            variant_formats=DEFAULT_VARIANT_FORMATS,
+            quality_gate=quality_gate,
+            best_of=best_of,
+            router=router,
+            sdk_factory=sdk.factory
+        )
+        concepts = build_benchmark_concepts(total)
+
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+
+        # 카드별 로그는 숨김 (메모리 측정에 포함되지 않도록 버리기)
+        log = sys.stdout if args.verbose else open(os.devnull, 'w')
+        with redirect_stdout(log):
+            result = generator.generate_full_season(
+                mode=GenerationMode.THEMATIC,
+                theme='benchmark',
+                style=CardStyle.CUTE,
+                concurrency=args.concurrency,
+                card_concepts=concepts
+            )
+
+        wall_clock = time.perf_counter() - start
+        peak_memory = None
+        if trace_memory:
+            _, peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        if log is not sys.stdout:
+            log.close()
+
+    stages = generator.metrics.stage_summary()
+    card = stages.get(Stage.CARD, {})
+    generate = stages.get(Stage.GENERATE, {})
+    return {
+        'cards': total,
+        'generated': result['generated'],
+        'failed': result['failed'],
+        'wall_clock': round(wall_clock, 3),
+        'throughput': round(result['generated'] / wall_clock, 2) if wall_clock else 0.0,
+        'generate_p50': generate.get('p50', 0.0),
+        'generate_p95': generate.get('p95', 0.0),
+        'card_p50': card.get('p50', 0.0),
+        'card_p95': card.get('p95', 0.0),
+        'card_max': card.get('max', 0.0),
+        'provider_calls': sdk.calls,
+        'billed_images': sum(generator.metrics.billed_images.values()),
+        'hedges': dict(generator.metrics.hedges),
+        'bytes': generator.metrics.bytes_transferred,
+        'peak_memory_mb': round(peak_memory / (1024 * 1024), 2) if peak_memory is not None else None,
+        'quality_rejected': dict(quality_gate.rejected) if quality_gate else None,
+        'stages': stages,
+    }
+
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    """커맨드라인 옵션 파싱"""
+
+    parser = argparse.ArgumentParser(description='Weekly Gacha offline generation benchmark')
+    parser.add_argument('--sizes', default='70,700,7000',
+                        help='시즌 크기 목록 (쉼표 구분, 기본값: 70,700,7000)')
+    parser.add_argument('--concurrency', type=int, default=8, help='동시 생성 요청 수')
+    parser.add_argument('--rate-limit', type=float, default=1000.0,
+                        help='초당 생성 요청 수 제한 (기본값: 1000, 사실상 무제한)')
+    parser.add_argument('--latency-ms', type=float, default=50.0,
+                        help='가짜 provider 지연 시간 중앙값 (ms)')
+    parser.add_argument('--latency-sigma', type=float, default=0.5,
+                        help='provider 지연 시간 로그정규 분산')
+    parser.add_argument('--upload-latency-ms', type=float, default=5.0,
+                        help='가짜 Storage 업로드 지연 (ms)')
+    parser.add_argument('--commit-latency-ms', type=float, default=20.0,
+                        help='가짜 Firestore 커밋 지연 (ms)')
+    parser.add_argument('--rate-limit-errors', type=float, default=0.0, help='429 오류 비율')
+    parser.add_argument('--timeout-errors', type=float, default=0.0, help='timeout 오류 비율')
+    parser.add_argument('--content-errors', type=float, default=0.0, help='콘텐츠 거부 비율')
+    parser.add_argument('--image-size', type=int, default=256, help='가짜 PNG 한 변 크기 (px)')
+    parser.add_argument('--cache', action='store_true', help='이미지 캐시 사용')
+    parser.add_argument('--variants', action='store_true',
+                        help='해상도 / 포맷 변형 생성 포함 (Pillow 필요)')
+    parser.add_argument('--quality-gate', action='store_true',
+                        help='업로드 전 중복 / 빈 이미지 검사 포함 (NumPy, Pillow 필요)')
+    parser.add_argument('--blank-rate', type=float, default=0.0,
+                        help='단색(빈) 이미지 반환 비율 (품질 검사용)')
+    parser.add_argument('--duplicate-rate', type=float, default=0.0,
+                        help='중복 이미지 반환 비율 (품질 검사용)')
+    parser.add_argument('--best-of', default=None,
+                        help='희귀도별 후보 이미지 수 (예: ultraRare=3,secret=4, NumPy / Pillow 필요)')
+    parser.add_argument('--stall-rate', type=float, default=0.0,
+                        help='응답이 stall-ms만큼 늦어지는 요청 비율 (꼬리 지연 재현)')
+    parser.add_argument('--stall-ms', type=float, default=2000.0,
+                        help='stall 요청의 추가 지연 (ms)')
+    parser.add_argument('--hedge-models', default=None,
+                        help='백업 모델 (쉼표 구분, 지정하면 p95를 넘긴 요청을 hedge)')
+    parser.add_argument('--min-hedge-delay', type=float, default=0.05,
+                        help='hedge 전 최소 대기 시간 (초, 가짜 provider 기준 기본값: 0.05)')
+    parser.add_argument('--seed', type=int, default=42, help='난수 시드')
+    parser.add_argument('--json', dest='json_path', default=None,
+                        help='결과를 JSON 파일로 저장')
+    parser.add_argument('--no-memory', dest='memory', action='store_false',
+                        help='최대 메모리 측정 실행 생략 (시즌마다 한 번 더 실행하지 않음)')
+    parser.add_argument('--verbose', action='store_true', help='카드별 로그 출력')
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+
+    print("\n🧪 Weekly Gacha Generation Benchmark (offline)")
+    print("=" * 60)
+    print(f"   Concurrency: {args.concurrency}, Provider latency: {args.latency_ms:.0f}ms")
+    print("=" * 60)
+
+    results = []
+    # 품질 검사 시에는 카드마다 다른 이미지 (이미지 풀 반복은 중복으로 판정됨)
+    with FakeImageServer(image_size=args.image_size,
+                         unique=args.quality_gate or bool(args.best_of)) as server:
+        for total in sizes:
+            print(f"\n▶️  {total} cards...")
+            result = run_benchmark(total, args, server)
+            if args.memory:
+                result['peak_memory_mb'] = run_benchmark(
+                    total, args, server, trace_memory=True
+                )['peak_memory_mb']
+            results.append(result)
+            print(f"   ✅ {result['generated']}/{total} in {result['wall_clock']:.1f}s "
+                  f"({result['throughput']:.1f} cards/s)")
+            if result['quality_rejected']:
+                print(f"   🔍 Rejected: {result['quality_rejected']}")
+            if result['hedges']:
+                print(f"   🏁 Hedged: {result['hedges'].get('sent', 0)} sent, "
+                      f"{result['hedges'].get('won', 0)} won")
+
+    print("\n" + "=" * 60)
+    # gen: provider 호출 1회 지연, card: 대기 포함 카드 완료까지 지연
+    print(f"{'cards':>7}{'time(s)':>9}{'cards/s':>9}{'gen p50':>9}{'gen p95':>9}"
+          f"{'card p95':>10}{'card max':>10}{'peak MB':>9}")
+    for r in results:
+        peak = f"{r['peak_memory_mb']:.1f}" if r['peak_memory_mb'] is not None else '-'
+        print(f"{r['cards']:>7}{r['wall_clock']:>9.1f}{r['throughput']:>9.1f}"
+              f"{r['generate_p50']:>9.3f}{r['generate_p95']:>9.3f}"
+              f"{r['card_p95']:>10.2f}{r['card_max']:>10.2f}{peak:>9}")
+    print("=" * 60)
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({'config': vars(args), 'results': results}, f, ensure_ascii=False, indent=2)
+        print(f"📊 Saved: {args.json_path}")
+
+
+if __name__ == '__main__':
+    main()
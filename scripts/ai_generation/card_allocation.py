@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+카드 희귀도 분배 / 컨셉 할당
+
+시즌 크기(70장 ~ 이벤트 5만 장)와 희귀도 스펙(장수 또는 비율)으로
+희귀도별 장수를 한 번에 계산하고, 카드 컨셉을 배열 기반 표로 만듭니다.
+- 희귀도 분배: 최대 나머지 방식 (합계가 시즌 크기와 정확히 일치)
+- 컨셉 표: 카드당 dict 대신 희귀도 / 진화 라인 / 번호 배열 (dict는 필요할 때 생성)
+- 하이브리드: 전체 분배를 먼저 정한 뒤 진화형 / 독립 카드로 나눔 (합계 분배 유지)
+"""
+
+from array import array
+from fractions import Fraction
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+
+
+# 카드 희귀도 정의
+class CardRarity:
+    NORMAL = 'normal'
+    RARE = 'rare'
+    SUPER_RARE = 'superRare'
+    ULTRA_RARE = 'ultraRare'
+    SECRET = 'secret'
+
+
+# 낮은 희귀도부터 (진화 단계 1~5와 같은 순서)
+RARITY_ORDER = (CardRarity.NORMAL, CardRarity.RARE, CardRarity.SUPER_RARE,
+                CardRarity.ULTRA_RARE, CardRarity.SECRET)
+
+# 기본 시즌: 70장 = Normal 20, Rare 20, Super Rare 20, Ultra Rare 9, Secret 1
+DEFAULT_SEASON_SIZE = 70
+DEFAULT_RARITY_WEIGHTS = (20, 20, 20, 9, 1)
+
+# 카드당 기본 발행 수량 (Firestore maxSupply)
+DEFAULT_MAX_SUPPLY = 1000
+
+# 진화 단계 이름 (단계 번호 = 희귀도 순서 + 1)
+EVOLUTION_PREFIXES = ('알', '새끼', '성체', '강화', '궁극')
+
+
+class RarityAllocationError(ValueError):
+    """희귀도 스펙 / 시즌 크기 오류"""
+
+
+def parse_rarity_spec(spec: Union[str, Dict, Sequence]) -> tuple:
+    """희귀도 스펙 → RARITY_ORDER 순서의 가중치
+
+    'normal=20,rare=20,superRare=20,ultraRare=9,secret=1' / {'secret': 0.5, ...} / [20, 20, 20, 9, 1]
+    장수(합계 = 시즌 크기)나 비율 모두 가능, 빠진 희귀도는 0
+    """
+
+    if isinstance(spec, str):
+        pairs = {}
+        for item in spec.split(','):
+            if not item.strip():
+                continue
+            name, sep, value = item.partition('=')
+            if not sep:
+                raise RarityAllocationError(f"invalid rarity spec item: {item.strip()!r} (expected name=weight)")
+            pairs[name.strip()] = value.strip()
+        spec = pairs
+    if isinstance(spec, dict):
+        unknown = set(spec) - set(RARITY_ORDER)
+        if unknown:
+            raise RarityAllocationError(f"unknown rarity: {', '.join(sorted(unknown))} "
+                                        f"(expected {', '.join(RARITY_ORDER)})")
+        spec = [spec.get(rarity, 0) for rarity in RARITY_ORDER]
+    if len(spec) != len(RARITY_ORDER):
+        raise RarityAllocationError(f"rarity spec needs {len(RARITY_ORDER)} weights, got {len(spec)}")
+
+    try:
+        weights = tuple(Fraction(str(weight)) for weight in spec)
+    except ValueError as e:
+        raise RarityAllocationError(f"invalid rarity weight: {e}") from e
+    if any(weight < 0 for weight in weights) or not any(weights):
+        raise RarityAllocationError("rarity weights must be non-negative with a positive total")
+    return tuple(int(w) if w.denominator == 1 else float(w) for w in weights)
+
+
+def _parse_per_rarity(spec: str, default, label: str) -> Dict[str, int]:
+    """'N' (모든 희귀도) / 'rarity=N,...' (빠진 희귀도는 default) → {rarity: N}"""
+
+    pairs = {}
+    for item in spec.split(','):
+        if not item.strip():
+            continue
+        name, sep, value = item.partition('=')
+        if sep:
+            pairs[name.strip()] = value.strip()
+        else:
+            default = name.strip()
+    unknown = set(pairs) - set(RARITY_ORDER)
+    if unknown:
+        raise RarityAllocationError(f"unknown rarity: {', '.join(sorted(unknown))} "
+                                    f"(expected {', '.join(RARITY_ORDER)})")
+
+    try:
+        values = {rarity: int(pairs.get(rarity, default)) for rarity in RARITY_ORDER}
+    except ValueError as e:
+        raise RarityAllocationError(f"invalid {label}: {e}") from e
+    if any(value <= 0 for value in values.values()):
+        raise RarityAllocationError(f"{label} must be positive")
+    return values
+
+
+def parse_supply_spec(spec: str) -> Dict[str, int]:
+    """희귀도별 카드당 발행 수량 스펙 → {rarity: maxSupply}
+
+    '1000' (모든 희귀도) / 'normal=60000,rare=18000,secret=500' (빠진 희귀도는 DEFAULT_MAX_SUPPLY)
+    """
+
+    return _parse_per_rarity(spec, DEFAULT_MAX_SUPPLY, 'max supply')
+
+
+def parse_best_of_spec(spec: str) -> Dict[str, int]:
+    """희귀도별 후보 이미지 수 스펙 → {rarity: N}
+
+    'ultraRare=3,secret=4' (빠진 희귀도는 1, 후보 선택 없음) / '2' (모든 희귀도)
+    """
+
+    return _parse_per_rarity(spec, 1, 'best-of count')
+
+
+def allocate_counts(total: int, weights: Sequence = DEFAULT_RARITY_WEIGHTS,
+                    min_one: bool = True) -> List[int]:
+    """시즌 크기 → 희귀도별 장수 (최대 나머지 방식, 합계 = total)
+
+    min_one=True이면 가중치가 있는 희귀도는 최소 1장 (장수가 충분할 때)
+    """
+
+    if total < 0:
+        raise RarityAllocationError(f"season size must be positive, got {total}")
+    fractions = [Fraction(str(weight)) for weight in weights]
+    weight_sum = sum(fractions)
+    if weight_sum <= 0:
+        raise RarityAllocationError("rarity weights must have a positive total")
+
+    quotas = [total * weight / weight_sum for weight in fractions]
+    counts = [int(quota) for quota in quotas]
+    # 나머지가 큰 순서, 같으면 낮은 희귀도 먼저
+    by_remainder = sorted(range(len(quotas)), key=lambda k: (counts[k] - quotas[k], k))
+    for k in by_remainder[:total - sum(counts)]:
+        counts[k] += 1
+
+    if min_one and total >= sum(1 for weight in fractions if weight):
+        for k, weight in enumerate(fractions):
+            if weight and not counts[k]:
+                counts[max(range(len(counts)), key=counts.__getitem__)] -= 1
+                counts[k] = 1
+    return counts
+
+
+class ConceptTable:
+    """카드 컨셉 표 (카드마다 dict를 만들지 않는 배열 기반 레코드)
+
+    rarities: 희귀도 코드 (RARITY_ORDER 인덱스)
+    lines: 진화 라인 (0부터, 독립 카드는 -1)
+    numbers: 독립 카드 번호 (0부터, 진화 카드는 0)
+    """
+
+    __slots__ = ('theme', 'creature_names', 'rarities', 'lines', 'numbers', '_thematic_count')
+
+    def __init__(self, theme: str, creature_names: Optional[Sequence[str]] = None):
+        self.theme = theme
+        self.creature_names = list(creature_names) if creature_names else None
+        self.rarities = array('B')
+        self.lines = array('i')
+        self.numbers = array('i')
+        self._thematic_count = 0
+
+    def __len__(self) -> int:
+        return len(self.rarities)
+
+    def add_evolution(self, counts: Sequence[int]):
+        """희귀도별 장수 → 진화 카드 (희귀도 k = 진화 단계 k+1, 라인 0부터 채움)"""
+
+        for code, count in enumerate(counts):
+            self.rarities.extend(array('B', [code]) * count)
+            self.lines.extend(range(count))
+            self.numbers.extend(array('i', [0]) * count)
+
+    def add_thematic(self, counts: Sequence[int]):
+        """희귀도별 장수 → 독립 카드 (번호는 이어서 증가)"""
+
+        start = self._thematic_count
+        for code, count in enumerate(counts):
+            self.rarities.extend(array('B', [code]) * count)
+            self.lines.extend(array('i', [-1]) * count)
+        total = sum(counts)
+        self.numbers.extend(range(start, start + total))
+        self._thematic_count += total
+
+    def creature_name(self, line: int) -> str:
+        """진화 라인 → 생명체 이름 (이름 목록보다 라인이 많으면 회차 번호를 붙임)"""
+
+        if not self.creature_names:
+            return f'{self.theme} #{line + 1}'
+        cycle, position = divmod(line, len(self.creature_names))
+        name = self.creature_names[position]
+        return f'{name} {cycle + 1}' if cycle else name
+
+    def concept(self, index: int) -> Dict:
+        """카드 1장 컨셉 dict"""
+
+        rarity = RARITY_ORDER[self.rarities[index]]
+        line = self.lines[index]
+        if line < 0:
+            return {
+                'index': index,
+                'name': f'{self.theme} #{self.numbers[index] + 1}',
+                'description': f'{self.theme} 테마의 유니크한 카드',
+                'rarity': rarity
+            }
+
+        stage = self.rarities[index] + 1
+        name = self.creature_name(line)
+        return {
+            'index': index,
+            'name': f"{EVOLUTION_PREFIXES[stage - 1]} {name}",
+            'description': f"{name}의 {stage}단계 진화형. 진화할수록 강력해집니다!",
+            'rarity': rarity,
+            'evolution_line': line + 1,
+            'evolution_stage': stage
+        }
+
+    def __iter__(self) -> Iterator[Dict]:
+        return (self.concept(index) for index in range(len(self)))
+
+    def rarity_counts(self) -> Dict[str, int]:
+        """희귀도별 장수"""
+        counts = [0] * len(RARITY_ORDER)
+        for code in self.rarities:
+            counts[code] += 1
+        return dict(zip(RARITY_ORDER, counts))
+
+
+def evolution_table(counts: Sequence[int], theme: str,
+                    creature_names: Optional[Sequence[str]] = None) -> ConceptTable:
+    """진화 시스템 컨셉 표"""
+
+    table = ConceptTable(theme, creature_names)
+    table.add_evolution(counts)
+    return table
+
+
+def thematic_table(counts: Sequence[int], theme: str) -> ConceptTable:
+    """테마 기반 독립 카드 컨셉 표"""
+
+    table = ConceptTable(theme)
+    table.add_thematic(counts)
+    return table
+
+
+def hybrid_table(counts: Sequence[int], theme: str,
+                 creature_names: Optional[Sequence[str]] = None) -> ConceptTable:
+    """하이브리드 컨셉 표: 절반은 진화형, 나머지는 독립 카드 (합계 분배는 counts 그대로)"""
+
+    evolution_counts = allocate_counts(-(-sum(counts) // 2), counts, min_one=False)
+    table = ConceptTable(theme, creature_names)
+    table.add_evolution(evolution_counts)
+    table.add_thematic([total - evolution for total, evolution in zip(counts, evolution_counts)])
+    return table
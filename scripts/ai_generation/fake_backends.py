@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+오프라인 벤치마크용 가짜 백엔드
+
+네트워크와 비용 없이 AICardGenerator 실제 코드 경로를 실행하기 위한 대체 구현입니다.
+- FakeGenSparkSDK: 지연 시간 / 오류 분포를 설정할 수 있는 GenSparkSDK 대체
+- FakeImageServer: 로컬 HTTP 서버 (PNG 제공, 요청마다 다른 이미지 / 단색 이미지 옵션)
+- FakeBucket / FakeFirestore: 메모리 기반 Storage / Firestore
+"""
+
+import zlib
+import base64
+import time
+import struct
+import random
+import asyncio
+import hashlib
+import threading
+from datetime import datetime, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, Optional
+
+
+def make_png(width: int, height: int, seed: int = 0, solid: bool = False) -> bytes:
+    """랜덤 노이즈 RGB PNG 생성 (표준 라이브러리만 사용)
+
+    solid=True이면 seed로 고른 단색 이미지 (품질 검사의 빈 이미지 재현용)
+    """
+
+    rng = random.Random(seed)
+    if solid:
+        row = b'\x00' + rng.randbytes(3) * width
+        raw = row * height
+    else:
+        raw = b''.join(b'\x00' + rng.randbytes(width * 3) for _ in range(height))
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        crc = zlib.crc32(tag + data) & 0xffffffff
+        return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', crc)
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) +
+            chunk(b'IDAT', zlib.compress(raw, 1)) + chunk(b'IEND', b''))
+
+
+class FakeImageServer:
+    """서로 다른 PNG 여러 장을 제공하는 로컬 HTTP 서버
+
+    unique=True이면 번호마다 다른 이미지를 요청 시 생성합니다 (품질 검사 중복 판정 회피).
+    /blank/{n}.png는 단색 이미지를 제공합니다.
+    """
+
+    def __init__(self, image_size: int = 256, pool_size: int = 16, unique: bool = False):
+        self.image_size = image_size
+        self.unique = unique
+        self.images = [make_png(image_size, image_size, seed) for seed in range(pool_size)]
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                try:
+                    index = int(self.path.rsplit('/', 1)[-1].split('.')[0])
+                    body = server.image(index, blank=self.path.startswith('/blank/'))
+                except ValueError:
+                    self.send_error(404)
+                    return
+                server.requests += 1
+                self.send_response(200)
+                self.send_header('Content-Type', 'image/png')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f'http://127.0.0.1:{self._httpd.server_port}'
+
+    def image(self, n: int, blank: bool = False) -> bytes:
+        """번호 → PNG 바이트"""
+        if blank:
+            return make_png(self.image_size, self.image_size, n, solid=True)
+        if self.unique:
+            return make_png(self.image_size, self.image_size, n)
+        return self.images[n % len(self.images)]
+
+    def url_for(self, n: int) -> str:
+        if self.unique:
+            return f'{self.base_url}/img/{n}.png'
+        return f'{self.base_url}/img/{n % len(self.images)}.png'
+
+    def blank_url_for(self, n: int) -> str:
+        return f'{self.base_url}/blank/{n}.png'
+
+    def start(self) -> 'FakeImageServer':
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+
+class FakeProviderError(Exception):
+    """가짜 provider 오류 (status_code로 분류됨)"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class FakeGenSparkSDK:
+    """GenSparkSDK 대체 (async with 지원, image_generation만 구현)
+
+    latency: 로그정규 분포 (중앙값 latency_ms, 분산 latency_sigma)
+    error_rates: {'rate_limit': p, 'timeout': p, 'content': p, 'no_image': p,
+                  'blank': p, 'duplicate': p, 'stall': p}
+    (blank: 단색 이미지, duplicate: 첫 번째 호출과 같은 이미지 반환,
+     stall: stall_ms만큼 더 기다린 뒤 정상 응답 → 꼬리 지연 재현)
+    images_per_call: 정상 응답 1회에 포함할 이미지 수 (best-of-N 요청용, 기본값 1)
+    model_latency_ms: 모델별 지연 시간 중앙값 (없는 모델은 latency_ms)
+    """
+
+    def __init__(self, server: FakeImageServer, latency_ms: float = 50.0,
+                 latency_sigma: float = 0.5, error_rates: Optional[Dict[str, float]] = None,
+                 seed: Optional[int] = None, images_per_call: int = 1,
+                 stall_ms: float = 2000.0, model_latency_ms: Optional[Dict[str, float]] = None,
+                 **_):
+        self.server = server
+        self.images_per_call = max(1, images_per_call)
+        self.latency_ms = latency_ms
+        self.model_latency_ms = model_latency_ms or {}
+        self.stall_ms = stall_ms
+        self.latency_sigma = latency_sigma
+        self.error_rates = error_rates or {}
+        self.calls = 0
+        self._rng = random.Random(seed)
+
+    def factory(self, **_):
+        """AICardGenerator(sdk_factory=...)에 전달할 팩토리"""
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def image_generation(self, query: str, model: str, aspect_ratio: str,
+                               image_urls: List[str], task_summary: str = '', **_) -> str:
+        self.calls += 1
+        call = self.calls
+        latency_ms = self.model_latency_ms.get(model, self.latency_ms)
+        delay = latency_ms / 1000 * self._rng.lognormvariate(0, self.latency_sigma)
+        await asyncio.sleep(delay)
+
+        roll = self._rng.random()
+        for kind, rate in self.error_rates.items():
+            if roll < rate:
+                if kind == 'rate_limit':
+                    raise FakeProviderError('Too Many Requests', 429)
+                if kind == 'timeout':
+                    raise asyncio.TimeoutError()
+                if kind == 'content':
+                    raise FakeProviderError('Rejected by content policy', 400)
+                if kind == 'no_image':
+                    return 'Sorry, no image this time.'
+                if kind == 'blank':
+                    return f'![{model}]({self.server.blank_url_for(call)})'
+                if kind == 'duplicate':
+                    return f'![{model}]({self.server.url_for(1)})'
+                if kind == 'stall':
+                    await asyncio.sleep(self.stall_ms / 1000)
+                    break
+            roll -= rate
+
+        first = (call - 1) * self.images_per_call + 1
+        return '\n'.join(f'![{model}]({self.server.url_for(first + i)})'
+                         for i in range(self.images_per_call))
+
+
+class FakeBlob:
+    """메모리 Storage blob (업로드 스트림을 chunk_size 단위로 소비)"""
+
+    def __init__(self, bucket: 'FakeBucket', name: str, chunk_size: Optional[int] = None):
+        self.bucket = bucket
+        self.name = name
+        self.chunk_size = chunk_size or 256 * 1024
+        self.content_type = None
+        self.cache_control = None
+        self.content_encoding = None
+        self.metadata = None
+        self.size = None
+        self.md5_hash = None  # GCS와 같은 base64 digest
+        self.crc32c = None
+
+    def _consume(self, stream) -> bytes:
+        digest = hashlib.md5()
+        size = 0
+        data = bytearray() if self.bucket.keep_data else None
+        while True:
+            chunk = stream.read(self.chunk_size)
+            digest.update(chunk)
+            size += len(chunk)
+            if data is not None:
+                data.extend(chunk)
+            if len(chunk) < self.chunk_size:
+                break
+        self.size = size
+        self.md5_hash = base64.b64encode(digest.digest()).decode('ascii')
+        return bytes(data) if data is not None else b''
+
+    def upload_from_file(self, file_obj, content_type: Optional[str] = None, **kwargs):
+        self.content_type = content_type
+        if self.bucket.upload_latency:
+            time.sleep(self.bucket.upload_latency)
+        data = self._consume(file_obj)
+        self.bucket._store(self, data, kwargs)
+
+    def upload_from_string(self, data, content_type: Optional[str] = None, **kwargs):
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        self.content_type = content_type
+        self.size = len(data)
+        self.md5_hash = base64.b64encode(hashlib.md5(data).digest()).decode('ascii')
+        self.bucket._store(self, data if self.bucket.keep_data else b'', kwargs)
+
+    def upload_from_filename(self, filename: str, content_type: Optional[str] = None, **kwargs):
+        with open(filename, 'rb') as f:
+            self.upload_from_file(f, content_type=content_type, **kwargs)
+
+    def download_to_file(self, file_obj, raw_download: bool = False, **kwargs):
+        # 저장 바이트 그대로 (keep_data=True인 버킷만)
+        if self.name not in self.bucket.data:
+            raise FileNotFoundError(f'No such object: {self.bucket.name}/{self.name}')
+        file_obj.write(self.bucket.data[self.name])
+
+    def make_public(self):
+        self.bucket.public.add(self.name)
+
+    @property
+    def public_url(self) -> str:
+        return f'https://storage.fake/{self.bucket.name}/{self.name}'
+
+
+class FakeBucket:
+    """메모리 Storage bucket"""
+
+    def __init__(self, name: str = 'fake-bucket', keep_data: bool = False,
+                 upload_latency: float = 0.0):
+        self.name = name
+        self.keep_data = keep_data
+        self.upload_latency = upload_latency
+        self.blobs: Dict[str, FakeBlob] = {}
+        self.data: Dict[str, bytes] = {}
+        self.public = set()
+        self._lock = threading.Lock()
+
+    def blob(self, name: str, chunk_size: Optional[int] = None) -> FakeBlob:
+        return FakeBlob(self, name, chunk_size)
+
+    def get_blob(self, name: str) -> Optional[FakeBlob]:
+        return self.blobs.get(name)
+
+    def list_blobs(self, prefix: str = ''):
+        with self._lock:
+            return [blob for name, blob in sorted(self.blobs.items()) if name.startswith(prefix)]
+
+    def _store(self, blob: FakeBlob, data: bytes, kwargs: Dict):
+        with self._lock:
+            self.blobs[blob.name] = blob
+            if self.keep_data:
+                self.data[blob.name] = data
+            if kwargs.get('predefined_acl') == 'publicRead':
+                self.public.add(blob.name)
+
+
+class FakeDocumentSnapshot:
+    def __init__(self, ref: 'FakeDocumentRef', data: Optional[Dict]):
+        self.reference = ref
+        self.id = ref.id
+        self._data = data
+
+    @property
+    def exists(self) -> bool:
+        return self._data is not None
+
+    def to_dict(self) -> Optional[Dict]:
+        return dict(self._data) if self._data is not None else None
+
+
+class FakeDocumentRef:
+    def __init__(self, db: 'FakeFirestore', path: str):
+        self._db = db
+        self.path = path
+        self.id = path.rsplit('/', 1)[-1]
+
+    def collection(self, name: str) -> 'FakeCollectionRef':
+        return FakeCollectionRef(self._db, f'{self.path}/{name}')
+
+    def get(self) -> FakeDocumentSnapshot:
+        return FakeDocumentSnapshot(self, self._db.docs.get(self.path))
+
+    def set(self, data: Dict, merge: bool = False):
+        self._db._apply([(self, data, merge)])
+
+    def delete(self):
+        self._db._apply([(self, None, False)])
+
+
+class FakeCollectionRef:
+    def __init__(self, db: 'FakeFirestore', path: str):
+        self._db = db
+        self.path = path
+        self.id = path.rsplit('/', 1)[-1]
+
+    def document(self, name: str) -> FakeDocumentRef:
+        return FakeDocumentRef(self._db, f'{self.path}/{name}')
+
+    def stream(self):
+        prefix = self.path + '/'
+        with self._db._lock:
+            items = sorted(self._db.docs.items())
+        for path, data in items:
+            if path.startswith(prefix) and '/' not in path[len(prefix):]:
+                yield FakeDocumentSnapshot(FakeDocumentRef(self._db, path), data)
+
+    def list_documents(self):
+        # 하위 컬렉션만 있는 문서도 포함 (Firestore의 missing document와 동일)
+        prefix = self.path + '/'
+        with self._db._lock:
+            paths = list(self._db.docs)
+        ids = sorted({p[len(prefix):].split('/', 1)[0] for p in paths if p.startswith(prefix)})
+        return [self.document(doc_id) for doc_id in ids]
+
+
+class FakeWriteBatch:
+    def __init__(self, db: 'FakeFirestore'):
+        self._db = db
+        self._ops = []
+
+    def set(self, ref: FakeDocumentRef, data: Dict, merge: bool = False):
+        self._ops.append((ref, data, merge))
+
+    def delete(self, ref: FakeDocumentRef):
+        self._ops.append((ref, None, False))
+
+    def commit(self):
+        if len(self._ops) > 500:
+            raise ValueError('maximum 500 writes allowed per request')
+        if self._db.commit_latency:
+            time.sleep(self._db.commit_latency)
+        self._db._apply(self._ops)
+
+
+def _server_value(value, previous, now: datetime):
+    """Increment / SERVER_TIMESTAMP sentinel → 저장 값 (중첩 map 포함)"""
+    kind = type(value).__name__
+    if kind == 'Increment':
+        return (previous if isinstance(previous, (int, float)) else 0) + value.value
+    if kind == 'Sentinel':
+        return now
+    if isinstance(value, dict):
+        previous = previous if isinstance(previous, dict) else {}
+        return {key: _server_value(item, previous.get(key), now) for key, item in value.items()}
+    return value
+
+
+class FakeFirestore:
+    """메모리 Firestore (문서 경로 → dict)"""
+
+    def __init__(self, commit_latency: float = 0.0):
+        self.commit_latency = commit_latency
+        self.docs: Dict[str, Dict] = {}
+        self.commits = 0
+        self.writes = 0
+        self._lock = threading.Lock()
+
+    def collection(self, name: str) -> FakeCollectionRef:
+        return FakeCollectionRef(self, name)
+
+    def batch(self) -> FakeWriteBatch:
+        return FakeWriteBatch(self)
+
+    def get_all(self, refs):
+        for ref in refs:
+            yield ref.get()
+
+    def _apply(self, ops):
+        with self._lock:
+            for ref, data, merge in ops:
+                if data is None:
+                    self.docs.pop(ref.path, None)
+                    continue
+                previous = self.docs.get(ref.path, {})
+                # Increment: 기존 값(없으면 0)에 더하기, SERVER_TIMESTAMP: 커밋 시각
+                data = _server_value(data, previous, datetime.now(timezone.utc))
+                if merge and ref.path in self.docs:
+                    self.docs[ref.path] = dict(self.docs[ref.path], **data)
+                else:
+                    self.docs[ref.path] = dict(data)
+            self.commits += 1
+            self.writes += len(ops)
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+증분 Firestore 배치 writer
+
+생성이 끝난 카드부터 일정 개수 단위로 Firestore에 커밋합니다.
+- 배치당 최대 500개 쓰기 제한 준수 (초과 시 자동 분할)
+- 백그라운드 스레드 풀에서 병렬 커밋 (생성 루프를 막지 않음)
+- 경합/일시 오류는 지수 백오프 + 지터로 재시도
+"""
+
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, List, Tuple
+
+from run_metrics import Stage
+
+# Firestore WriteBatch 최대 쓰기 수
+FIRESTORE_BATCH_LIMIT = 500
+
+# 기본 설정
+DEFAULT_FLUSH_SIZE = 20
+DEFAULT_MAX_PARALLEL_COMMITS = 4
+DEFAULT_COMMIT_RETRIES = 5
+COMMIT_BACKOFF_BASE = 0.5
+COMMIT_BACKOFF_MAX = 16.0
+
+
+def _retryable_errors() -> Tuple[type, ...]:
+    """재시도 대상 예외 (경합, 타임아웃, 일시적 서버 오류)"""
+
+    try:
+        from google.api_core import exceptions
+    except ImportError:
+        return (ConnectionError, TimeoutError)
+
+    return (
+        exceptions.Aborted,
+        exceptions.Conflict,
+        exceptions.DeadlineExceeded,
+        exceptions.ServiceUnavailable,
+        exceptions.InternalServerError,
+        exceptions.ResourceExhausted,
+        ConnectionError,
+        TimeoutError,
+    )
+
+
+def _is_too_large(error: Exception) -> bool:
+    """요청 크기 초과 오류 여부 (배치를 반으로 나눠 재시도)"""
+
+    message = str(error).lower()
+    return 'too large' in message or 'too big' in message or ('maximum' in message and 'size' in message)
+
+
+class FirestoreBatchWriter:
+    """백그라운드 증분 Firestore writer"""
+
+    def __init__(self, db, flush_size: int = DEFAULT_FLUSH_SIZE,
+                 max_parallel: int = DEFAULT_MAX_PARALLEL_COMMITS,
+                 max_retries: int = DEFAULT_COMMIT_RETRIES,
+                 metrics=None):
+        self.db = db
+        self.metrics = metrics
+        self.flush_size = max(1, min(flush_size, FIRESTORE_BATCH_LIMIT))
+        self.max_retries = max_retries
+        self.committed = 0
+        self.failed = 0
+        self.errors: List[str] = []
+
+        self._pending: List[Tuple[object, Dict, bool]] = []
+        self._futures: List[Future] = []
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_parallel),
+                                            thread_name_prefix='firestore-writer')
+        self._retryable = _retryable_errors()
+
+    def set(self, doc_ref, data: Dict, merge: bool = False):
+        """쓰기 작업 추가 (flush_size가 차면 백그라운드 커밋)"""
+
+        with self._lock:
+            self._pending.append((doc_ref, data, merge))
+            if len(self._pending) >= self.flush_size:
+                self._submit_pending()
+
+    def delete(self, doc_ref):
+        """삭제 작업 추가 (set과 같은 배치로 커밋)"""
+        self.set(doc_ref, None)
+
+    def _submit_pending(self):
+        """대기 중인 작업을 커밋 스레드로 전달 (lock 보유 상태에서 호출)"""
+
+        ops, self._pending = self._pending, []
+        for start in range(0, len(ops), FIRESTORE_BATCH_LIMIT):
+            chunk = ops[start:start + FIRESTORE_BATCH_LIMIT]
+            self._futures.append(self._executor.submit(self._commit_chunk, chunk))
+
+    def _commit_chunk(self, ops: List[Tuple[object, Dict, bool]]):
+        """배치 1개 커밋 (재시도 + 크기 초과 시 분할)"""
+
+        attempt = 0
+        while True:
+            try:
+                batch = self.db.batch()
+                for doc_ref, data, merge in ops:
+                    if data is None:
+                        batch.delete(doc_ref)
+                    else:
+                        batch.set(doc_ref, data, merge=merge)
+                if self.metrics:
+                    with self.metrics.span(Stage.FIRESTORE_COMMIT, writes=len(ops), attempt=attempt + 1):
+                        batch.commit()
+                else:
+                    batch.commit()
+                with self._lock:
+                    self.committed += len(ops)
+                return
+
+            except self._retryable as e:
+                attempt += 1
+                if attempt > self.max_retries:
+                    self._record_failure(ops, e)
+                    return
+                delay = min(COMMIT_BACKOFF_MAX, COMMIT_BACKOFF_BASE * (2 ** (attempt - 1)))
+                time.sleep(random.uniform(0, delay))
+
+            except Exception as e:
+                if len(ops) > 1 and _is_too_large(e):
+                    middle = len(ops) // 2
+                    self._commit_chunk(ops[:middle])
+                    self._commit_chunk(ops[middle:])
+                    return
+                self._record_failure(ops, e)
+                return
+
+    def _record_failure(self, ops: List[Tuple[object, Dict, bool]], error: Exception):
+        """커밋 실패 기록"""
+
+        print(f"   ❌ Firestore commit failed ({len(ops)} writes): {error}")
+        with self._lock:
+            self.failed += len(ops)
+            self.errors.append(str(error))
+
+    def flush(self):
+        """대기 중인 작업을 모두 커밋하고 완료까지 대기"""
+
+        with self._lock:
+            if self._pending:
+                self._submit_pending()
+            futures, self._futures = self._futures, []
+
+        for future in futures:
+            future.result()
+
+    def close(self) -> Dict:
+        """flush 후 스레드 풀 종료, 결과 통계 반환"""
+
+        self.flush()
+        self._executor.shutdown(wait=True)
+        return {'committed': self.committed, 'failed': self.failed}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
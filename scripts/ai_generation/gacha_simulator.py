@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+가챠 경제 시뮬레이터 (시즌 공개 전 품절 시점 예측)
+
+앱의 뽑기 규칙(lib/services/gacha_service.dart)을 그대로 따릅니다.
+1. 드롭 확률로 희귀도 결정 (재고와 무관)
+2. 그 희귀도에서 재고가 남은 카드 중 균등하게 1장
+3. 해당 희귀도가 모두 품절이면 빈 뽑기
+
+NumPy로 뽑기를 구간 단위로 묶어서 샘플링합니다 (1천만 회 ≈ 1초, 카드 5만 장도 가능).
+- 일일 뽑기 수: 플레이어 수 × 1인당 일일 뽑기 수 (포아송)
+- 구간 안에서 품절된 카드에 배정된 초과분은 같은 희귀도의 남은 카드로 다시 배정
+"""
+
+import math
+from typing import Dict, List, Optional, Sequence
+
+from card_allocation import RARITY_ORDER
+
+# 앱 드롭 확률 (lib/models/card_model.dart pullChance)
+DEFAULT_DROP_RATES = (0.70, 0.20, 0.07, 0.025, 0.005)
+
+DEFAULT_TOTAL_PULLS = 10_000_000
+DEFAULT_PLAYERS = 50_000
+DEFAULT_PULLS_PER_PLAYER = 5.0  # 1인당 일일 뽑기 수
+DEFAULT_TARGET_DAYS = 7.0  # 추천 재고: 이 기간 동안 품절되지 않는 수량
+
+DEFAULT_STEPS_PER_DAY = 96  # 시뮬레이션 구간 (15분)
+
+
+class SimulationError(ValueError):
+    """시뮬레이션 입력 오류 (NumPy 미설치 포함)"""
+
+
+def require_numpy():
+    """NumPy 설치 확인 (없으면 SimulationError)"""
+
+    try:
+        import numpy  # noqa: F401
+    except ImportError as e:
+        raise SimulationError("NumPy is required for the simulator (pip install numpy)") from e
+
+
+def _sell(remaining, cards, pulls: int, rng):
+    """희귀도 1개의 한 구간 뽑기 (remaining 갱신) → (남은 카드, 빈 뽑기 수, 품절 카드, 구간 내 품절 비율)
+
+    cards: 재고가 남은 카드 번호, 뽑힌 카드만 계산 (카드 수와 무관하게 뽑기 수에 비례)
+    품절 카드에 배정된 초과분은 남은 카드로 다시 배정
+    """
+
+    import numpy as np
+
+    sold_out, fractions = [], []
+    while pulls and cards.size:
+        picked, count = np.unique(rng.integers(cards.size, size=pulls), return_counts=True)
+        stock = remaining[cards[picked]]
+        taken = np.minimum(count, stock)
+        remaining[cards[picked]] -= taken
+        pulls = int((count - taken).sum())
+
+        finished = taken == stock
+        if not finished.any():
+            break
+        sold_out.append(cards[picked[finished]])
+        # 첫 배정에서 품절되면 재고 / 배정 수 지점, 재배정에서 품절되면 구간 끝
+        fractions.append(stock[finished] / count[finished] if not fractions
+                         else np.ones(int(finished.sum())))
+        cards = np.delete(cards, picked[finished])
+
+    if not sold_out:
+        return cards, pulls, None, None
+    return cards, pulls, np.concatenate(sold_out), np.concatenate(fractions)
+
+
+def simulate_pulls(rarities: Sequence[str], supplies: Sequence[int],
+                   drop_rates: Sequence[float] = DEFAULT_DROP_RATES,
+                   total_pulls: int = DEFAULT_TOTAL_PULLS,
+                   players: int = DEFAULT_PLAYERS,
+                   pulls_per_player: float = DEFAULT_PULLS_PER_PLAYER,
+                   seed: Optional[int] = None,
+                   steps_per_day: int = DEFAULT_STEPS_PER_DAY) -> Dict:
+    """시즌 카드 (희귀도, 재고) 목록으로 뽑기 시뮬레이션
+
+    하루를 steps_per_day 구간으로 나누고, 구간마다 뽑기 수(포아송) → 희귀도별 수(다항) →
+    카드별 뽑기(균등)를 한 번에 샘플링합니다. 구간 내 품절 시점은 선형 보간.
+
+    반환값:
+        days: 시뮬레이션 기간 (일), daily_pulls: 평균 일일 뽑기 수
+        sellout_day: 카드별 품절 시점 (일, 품절 안 되면 None)
+        sold: 카드별 판매 수, empty_pulls: 희귀도별 빈 뽑기 수
+        curve: 일자별 {'day', 'remaining': 희귀도별 남은 재고, 'sold_out': 희귀도별 품절 카드 수}
+    """
+
+    require_numpy()
+    import numpy as np
+
+    if len(rarities) != len(supplies):
+        raise SimulationError("rarities and supplies must have the same length")
+    if total_pulls <= 0 or players <= 0 or pulls_per_player <= 0 or steps_per_day <= 0:
+        raise SimulationError("pulls, players, pulls per player and steps must be positive")
+    try:
+        codes = np.array([RARITY_ORDER.index(rarity) for rarity in rarities], dtype=np.int64)
+    except ValueError as e:
+        raise SimulationError(f"unknown rarity in season cards: {e}") from e
+
+    rates = np.asarray(drop_rates, dtype=np.float64)
+    rates = rates / rates.sum()
+    tiers = range(len(RARITY_ORDER))
+
+    rng = np.random.default_rng(seed)
+    remaining = np.asarray(supplies, dtype=np.int64).copy()
+    sellout_day = np.where(remaining > 0, np.nan, 0.0)
+    empty_pulls = np.zeros(len(RARITY_ORDER), dtype=np.int64)
+    available = [np.flatnonzero((codes == code) & (remaining > 0)) for code in tiers]
+
+    daily_pulls = players * pulls_per_player
+    step_pulls = daily_pulls / steps_per_day
+    curve = []
+    pull, step = 0, 0
+    while pull < total_pulls:
+        pulls = min(int(rng.poisson(step_pulls)), total_pulls - pull)
+        for code, count in zip(tiers, rng.multinomial(pulls, rates)):
+            cards = available[code]
+            if not cards.size:
+                empty_pulls[code] += count
+                continue
+            available[code], empty, sold_out, fraction = _sell(remaining, cards, int(count), rng)
+            empty_pulls[code] += empty
+            if sold_out is not None:
+                sellout_day[sold_out] = (step + fraction) / steps_per_day
+        pull += pulls
+        step += 1
+
+        if step % steps_per_day == 0 or pull >= total_pulls:
+            curve.append({
+                'day': round(step / steps_per_day, 3),
+                'remaining': dict(zip(RARITY_ORDER, np.bincount(
+                    codes, weights=remaining, minlength=len(RARITY_ORDER)).astype(int).tolist())),
+                'sold_out': dict(zip(RARITY_ORDER, np.bincount(
+                    codes, weights=~np.isnan(sellout_day), minlength=len(RARITY_ORDER)).astype(int).tolist())),
+            })
+
+    supply = np.bincount(codes, weights=np.asarray(supplies, dtype=np.float64),
+                         minlength=len(RARITY_ORDER))
+    return {
+        'pulls': pull,
+        'days': round(step / steps_per_day, 3),
+        'daily_pulls': daily_pulls,
+        'supply': dict(zip(RARITY_ORDER, supply.astype(int).tolist())),
+        'sold': (np.asarray(supplies, dtype=np.int64) - remaining).tolist(),
+        'sellout_day': [None if np.isnan(day) else round(float(day), 3) for day in sellout_day],
+        'empty_pulls': dict(zip(RARITY_ORDER, empty_pulls.tolist())),
+        'curve': curve,
+    }
+
+
+def _round_up(value: float) -> int:
+    """유효숫자 2자리로 올림 (예: 1234 → 1300)"""
+
+    if value <= 0:
+        return 0
+    scale = 10 ** max(0, int(math.log10(value)) - 1)
+    return int(math.ceil(value / scale) * scale)
+
+
+def suggest_supply(card_counts: Dict[str, int], drop_rates: Sequence[float],
+                   daily_pulls: float, target_days: float = DEFAULT_TARGET_DAYS) -> Dict[str, int]:
+    """target_days 동안 수요를 감당하는 희귀도별 카드당 재고 (기대 수요 + 3σ 여유분)"""
+
+    total_rate = sum(drop_rates)
+    suggestion = {}
+    for rarity, rate in zip(RARITY_ORDER, drop_rates):
+        count = card_counts.get(rarity, 0)
+        if count:
+            demand = daily_pulls * target_days * rate / total_rate / count
+            suggestion[rarity] = _round_up(demand + 3 * math.sqrt(demand))
+    return suggestion
+
+
+def summarize(result: Dict, rarities: Sequence[str], supplies: Sequence[int]) -> List[Dict]:
+    """희귀도별 요약: 카드 수, 재고, 첫 품절 / 전체 품절 시점, 빈 뽑기 수"""
+
+    rows = []
+    for rarity in RARITY_ORDER:
+        members = [i for i, r in enumerate(rarities) if r == rarity]
+        if not members:
+            continue
+        days = [result['sellout_day'][i] for i in members]
+        sold_out = [day for day in days if day is not None]
+        rows.append({
+            'rarity': rarity,
+            'cards': len(members),
+            'supply_per_card': sorted({supplies[i] for i in members}),
+            'total_supply': result['supply'][rarity],
+            'sold': sum(result['sold'][i] for i in members),
+            'first_sellout_day': min(sold_out) if sold_out else None,
+            'all_sold_out_day': max(sold_out) if len(sold_out) == len(members) else None,
+            'empty_pulls': result['empty_pulls'][rarity],
+        })
+    return rows
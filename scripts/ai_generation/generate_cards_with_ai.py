@@ -13,28 +13,113 @@ import os
 import sys
 import json
 import time
-from typing import List, Dict, Optional
+import asyncio
+import hashlib
+import argparse
+import contextlib
+import copy
+import shutil
+import signal
+import socket
+import tempfile
+import multiprocessing
+from typing import TYPE_CHECKING, Callable, List, Dict, Optional, Sequence, Tuple
+from collections import Counter
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
-# Firebase Admin SDK
-try:
-    import firebase_admin
-    from firebase_admin import credentials, firestore, storage
-    print("✅ Firebase Admin SDK imported successfully")
-except ImportError:
-    print("❌ Firebase Admin SDK not found!")
-    print("📦 Installing firebase-admin...")
-    os.system("pip install firebase-admin==7.1.0")
-    import firebase_admin
-    from firebase_admin import credentials, firestore, storage
-
-# 카드 희귀도 정의
-class CardRarity:
-    NORMAL = 'normal'
-    RARE = 'rare'
-    SUPER_RARE = 'superRare'
-    ULTRA_RARE = 'ultraRare'
-    SECRET = 'secret'
+# firebase_admin / genspark_sdk / requests는 실제로 필요한 시점에 import
+# (컨셉/프롬프트 미리보기는 Firebase 없이 즉시 실행)
+
+from season_manifest import SeasonManifest, DEFAULT_MANIFEST_DIR
+from season_plan import SeasonPlanError, load_season_plan, season_id_for_week
+from card_allocation import (
+    CardRarity, ConceptTable, RarityAllocationError, allocate_counts, parse_rarity_spec,
+    parse_supply_spec, parse_best_of_spec, evolution_table, thematic_table, hybrid_table,
+    DEFAULT_SEASON_SIZE, DEFAULT_RARITY_WEIGHTS, DEFAULT_MAX_SUPPLY, RARITY_ORDER
+)
+from image_cache import ImageCache, DEFAULT_CACHE_DIR, DEFAULT_CACHE_MAX_BYTES
+from retry_policy import (
+    RetryPolicy, TokenBucket, ErrorKind, NoImageInResultError,
+    classify_error, classify_transfer_error, DEFAULT_RATE_LIMIT
+)
+from run_metrics import RunMetrics, Stage, MODEL_COSTS, DEFAULT_REPORT_DIR
+from firestore_writer import FirestoreBatchWriter, DEFAULT_FLUSH_SIZE
+from streaming_upload import (
+    ChunkedStreamReader, SpoolWriter, create_http_session, iter_file_chunks,
+    sniff_image_type, SNIFF_SIZE, STREAM_CHUNK_SIZE, UPLOAD_CHUNK_SIZE
+)
+from image_variants import (
+    ImageVariantError, render_variants, require_pillow,
+    parse_variant_sizes, parse_variant_formats,
+    DEFAULT_VARIANT_SIZES, DEFAULT_VARIANT_FORMATS
+)
+from season_bundle import (
+    BUNDLE_VERSION, ATLAS_FORMAT, DEFAULT_THUMB_SIZE,
+    build_atlas, build_manifest, pack_manifest, unpack_manifest, render_thumbnail, thumbnail_path
+)
+from image_quality import (
+    QualityGate, QualityReject, ImageQualityError, analyze_image, rank_candidates, require_numpy,
+    DEFAULT_HASH_DIR, DEFAULT_MAX_DISTANCE, DEFAULT_MIN_CONTRAST, DEFAULT_MIN_DETAIL,
+    DEFAULT_MAX_REGENERATIONS
+)
+from season_publish import ContentDigests, PublishPlan, RemoteSeason, file_digests
+from model_router import (
+    ModelRouter, ModelRoutingError, parse_model_spec, DEFAULT_MODEL, MIN_HEDGE_DELAY
+)
+# 명령 전용 모듈(아카이브 / 카탈로그 / 발행 shard / 실행 계획 / 작업 큐 / daemon / 시뮬레이터)은
+# 옵션 기본값과 main()이 처리하는 예외만 여기서 import, 나머지는 쓰는 명령 / 메서드 안에서 import
+from season_archive import SeasonArchiveError, DEFAULT_ARCHIVE_DIR
+from season_catalog import CatalogError, COLUMNS, GROUP_COLUMNS, DEFAULT_CATALOG_DIR, DEFAULT_QUERY_COLUMNS
+from supply_shards import DEFAULT_PEAK_PULLS_PER_SECOND
+from run_planner import DEFAULT_HISTORY_RUNS, DEFAULT_TRIALS
+from job_queue import DEFAULT_QUEUE_PATH, DEFAULT_LEASE_SECONDS, DEFAULT_MAX_ATTEMPTS
+from gacha_simulator import (
+    SimulationError, DEFAULT_TOTAL_PULLS, DEFAULT_PLAYERS, DEFAULT_PULLS_PER_PLAYER,
+    DEFAULT_TARGET_DAYS, DEFAULT_STEPS_PER_DAY
+)
+
+if TYPE_CHECKING:  # 명령 전용 모듈은 핸들러에서 import (주석용)
+    from job_queue import JobQueue
+    from generation_daemon import JobBoard
+    from season_archive import SeasonArchiveReader
+
+# Firebase Admin SDK 키 파일 기본 위치
+FIREBASE_KEY_PATH = '/opt/flutter/firebase-admin-sdk.json'
+
+# Storage 버킷 기본값: 키 파일 프로젝트의 기본 버킷 ({project_id}.firebasestorage.app)
+DEFAULT_BUCKET_SUFFIX = '.firebasestorage.app'
+
+# 이미지 생성 설정
+IMAGE_MODEL = DEFAULT_MODEL  # recraft-v3: 빠르고 경제적 (512x512, $0.02), --model로 희귀도별 변경
+IMAGE_ASPECT_RATIO = '1:1'
+GENSPARK_TIMEOUT = 120.0
+
+# 동시 이미지 생성 요청 수 (provider rate limit 이내로 유지)
+DEFAULT_CONCURRENCY = 8
+
+# 업로드 요청에 함께 보내는 공개 ACL (make_public() 별도 호출 없음)
+PUBLIC_ACL = 'publicRead'
+
+# serve 명령 (generation_daemon)
+DEFAULT_DAEMON_HOST = '127.0.0.1'
+DEFAULT_DAEMON_PORT = 8765
+DEFAULT_MAX_JOBS = 1  # 동시에 실행하는 시즌 작업 수 (생성 요청 동시성은 --concurrency로 전체 공유)
+DAEMON_TOKEN_ENV = 'GACHA_DAEMON_TOKEN'
+
+# 내용 해시 이름 객체용 캐시 헤더 (같은 이름 = 같은 내용 → 1년 + 재검증 없음)
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+CONTENT_HASH_LENGTH = 16
+
+# 품질 검사에서 거부된 카드 재생성 시 프롬프트에 추가
+REGENERATION_HINT = 'distinct composition, different pose and color palette, variation'
+
+# 다시 시도해도 결과가 같은 실패 (최종 재시도 / 작업 큐 재시도 제외)
+FINAL_FAILURE_KINDS = frozenset({ErrorKind.CONTENT_REJECTED, ErrorKind.QUOTA_EXHAUSTED,
+                                 QualityReject.DUPLICATE, QualityReject.LOW_DETAIL})
+
+# best-of-N: 한 번의 요청으로 여러 후보를 받을 때 프롬프트에 추가 ({count}장)
+BEST_OF_HINT = '{count} distinct variations as separate images'
 
 # 카드 스타일 정의
 class CardStyle:
@@ -51,18 +136,133 @@ class GenerationMode:
     THEMATIC = 'thematic'
     HYBRID = 'hybrid'
 
+GENERATION_MODES = (GenerationMode.EVOLUTION, GenerationMode.THEMATIC, GenerationMode.HYBRID)
+CARD_STYLES = (CardStyle.CUTE, CardStyle.CYBERPUNK, CardStyle.CARTOON,
+               CardStyle.FANTASY, CardStyle.PIXEL_ART, CardStyle.REALISTIC)
+
+def _firestore():
+    """firebase_admin.firestore 모듈 (지연 import)"""
+    from firebase_admin import firestore
+    return firestore
+
+class FirebaseInitError(RuntimeError):
+    """Firebase Admin SDK 초기화 실패 (키 파일 없음, 패키지 미설치 등)"""
+
+class GenerationFailedError(Exception):
+    """재시도 후에도 카드 이미지 생성/업로드 실패"""
+    
+    def __init__(self, kind: str, message: str, attempts: int = 1):
+        super().__init__(message)
+        self.kind = kind
+        self.attempts = attempts
+
 class AICardGenerator:
     """AI 카드 생성 엔진"""
     
-    def __init__(self, firebase_key_path: str = '/opt/flutter/firebase-admin-sdk.json'):
-        """초기화"""
-        self.firebase_key_path = firebase_key_path
-        self.db = None
-        self.bucket = None
-        self.season_id = f"2025_S{self._get_current_season()}_v1"
+    def __init__(self, firebase_key_path: str = FIREBASE_KEY_PATH,
+                 season_id: Optional[str] = None,
+                 season_size: int = DEFAULT_SEASON_SIZE,
+                 rarity_weights: Sequence = DEFAULT_RARITY_WEIGHTS,
+                 max_supply: Optional[Dict[str, int]] = None,
+                 manifest_dir: str = DEFAULT_MANIFEST_DIR,
+                 image_cache: Optional[ImageCache] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 rate_limit: float = DEFAULT_RATE_LIMIT,
+                 report_dir: Optional[str] = DEFAULT_REPORT_DIR,
+                 prometheus_file: Optional[str] = None,
+                 variant_sizes: Optional[List[str]] = None,
+                 variant_formats: List[str] = DEFAULT_VARIANT_FORMATS,
+                 variant_workers: Optional[int] = None,
+                 quality_gate: Optional[QualityGate] = None,
+                 bundle_thumb_size: Optional[int] = None,
+                 differential: bool = False,
+                 immutable_assets: bool = False,
+                 best_of: Optional[Dict[str, int]] = None,
+                 router: Optional[ModelRouter] = None,
+                 supply_shards: bool = True,
+                 peak_pulls_per_second: float = DEFAULT_PEAK_PULLS_PER_SECOND,
+                 migrate_supply: bool = False,
+                 project_id: Optional[str] = None,
+                 storage_bucket: Optional[str] = None,
+                 catalog_dir: Optional[str] = DEFAULT_CATALOG_DIR,
+                 progress_callback: Optional[Callable[[Dict], None]] = None,
+                 db=None, bucket=None, sdk_factory=None):
+        """초기화
         
-        # Firebase 초기화
-        self._init_firebase()
+        Firebase는 db/bucket에 처음 접근할 때 초기화됩니다.
+        season_size / rarity_weights: 시즌 카드 수와 희귀도 분배 (card_allocation 참고)
+        max_supply: 희귀도별 카드당 발행 수량 (없으면 DEFAULT_MAX_SUPPLY, simulate 명령으로 추천값 확인)
+        variant_sizes를 지정하면 업로드 후 크기/포맷별 변형을 프로세스 풀에서 생성합니다.
+        quality_gate를 지정하면 업로드 전에 중복 / 빈 이미지를 검사하고 재생성합니다.
+        bundle_thumb_size를 지정하면 시즌 업로드 후 썸네일 아틀라스 + 매니페스트 번들을 올립니다.
+        differential=True이면 원격 blob 해시 / 카드 문서와 비교해서 바뀐 것만 씁니다 (season_publish 참고).
+        immutable_assets=True이면 이미지 / 변형을 내용 해시 이름 + immutable 캐시 헤더로 올립니다.
+        best_of: 희귀도별 후보 수 (예: {'secret': 4}) → 한 요청에 후보 N장을 받아 로컬 점수로 1장 선택.
+        router: 희귀도별 모델 + 백업 모델 hedge (없으면 모든 카드 IMAGE_MODEL, hedge 없음).
+        supply_shards=True이면 카드 저장 후 발행 수량 shard 문서를 씁니다 (peak_pulls_per_second 기준 개수).
+        시즌 요약 문서(seasons/{id}/meta/summary)는 항상 씁니다 (supply_shards 참고).
+        migrate_supply=True이면 이미 뽑힌 카드도 shard 구성 변경을 허용합니다 (발행된 시리얼은 건너뜀).
+        project_id / storage_bucket: 없으면 키 파일의 프로젝트와 그 기본 버킷을 씁니다.
+        catalog_dir: 시즌 완료 시 카드를 기록할 로컬 카탈로그 (None이면 기록 안 함, season_catalog 참고).
+        progress_callback: 시즌 진행 이벤트 dict를 받는 함수 (이벤트 루프 스레드에서 호출, serve 명령의 SSE).
+        db/bucket/sdk_factory를 주입하면 Firebase 초기화와 GenSparkSDK를 대체합니다
+        (벤치마크, 로컬 테스트용).
+        """
+        from season_catalog import SeasonCatalog
+        self.firebase_key_path = firebase_key_path
+        self.project_id = project_id
+        self.storage_bucket = storage_bucket
+        self._db = db
+        self._bucket = bucket
+        self.sdk_factory = sdk_factory
+        self.season_id = season_id or season_id_for_week(self._get_current_season())
+        self.season_size = season_size
+        self.rarity_weights = rarity_weights
+        self.max_supply = max_supply or {}
+        self.manifest_dir = manifest_dir
+        self.image_cache = image_cache
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limit = rate_limit
+        self.rate_limiter: Optional[TokenBucket] = None  # 실행 중인 이벤트 루프마다 생성
+        self.report_dir = report_dir
+        self.prometheus_file = prometheus_file
+        self.catalog = SeasonCatalog(catalog_dir) if catalog_dir else None
+        self.progress_callback = progress_callback
+        self.router = router or ModelRouter()
+        self.supply_shards = supply_shards
+        self.peak_pulls_per_second = peak_pulls_per_second
+        self.migrate_supply = migrate_supply
+        self.metrics = RunMetrics(self.season_id, self.router.label)  # 실행마다 새로 생성
+        self.variant_sizes = variant_sizes
+        self.variant_formats = variant_formats
+        self.variant_workers = variant_workers
+        self.quality_gate = quality_gate
+        self.bundle_thumb_size = bundle_thumb_size
+        self.differential = differential
+        self.immutable_assets = immutable_assets
+        self.best_of = best_of or {}
+        self.remote_season: Optional[RemoteSeason] = None  # 차등 게시: 실행 시작 시 조회
+        self._http_session = None
+        self._image_pool = None
+    
+    @property
+    def db(self):
+        """Firestore 클라이언트 (첫 접근 시 Firebase 초기화)"""
+        if self._db is None:
+            self._init_firebase()
+        return self._db
+    
+    @property
+    def _selects_best_of(self) -> bool:
+        """후보 여러 장 중 선택하는 희귀도가 있는지"""
+        return any(count > 1 for count in self.best_of.values())
+    
+    @property
+    def bucket(self):
+        """Storage 버킷 (첫 접근 시 Firebase 초기화)"""
+        if self._bucket is None:
+            self._init_firebase()
+        return self._bucket
     
     def _get_current_season(self) -> int:
         """현재 시즌 번호 계산 (주차 기반)"""
@@ -74,29 +274,46 @@ class AICardGenerator:
         return week_number
     
     def _init_firebase(self):
-        """Firebase Admin SDK 초기화"""
+        """Firebase Admin SDK 초기화 (실패 시 FirebaseInitError)"""
+        
+        # Firebase Admin SDK 키 파일 확인
+        if not os.path.exists(self.firebase_key_path):
+            raise FirebaseInitError(
+                f"Firebase key not found: {self.firebase_key_path} "
+                f"(upload firebase-admin-sdk.json to /opt/flutter/)"
+            )
+        
         try:
-            # Firebase Admin SDK 키 파일 확인
-            if not os.path.exists(self.firebase_key_path):
-                print(f"❌ Firebase key not found: {self.firebase_key_path}")
-                print("📝 Please upload firebase-admin-sdk.json to /opt/flutter/")
-                sys.exit(1)
-            
-            # Firebase 앱 초기화 (이미 초기화된 경우 건너뛰기)
-            if not firebase_admin._apps:
-                cred = credentials.Certificate(self.firebase_key_path)
-                firebase_admin.initialize_app(cred, {
-                    'storageBucket': 'weeklygacha-24683.firebasestorage.app'
-                })
-                print("✅ Firebase initialized")
+            import firebase_admin
+            from firebase_admin import credentials, firestore, storage
+        except ImportError as e:
+            raise FirebaseInitError(
+                "firebase-admin is not installed (pip install firebase-admin==7.1.0)"
+            ) from e
+        
+        try:
+            # 프로젝트 / 버킷마다 Firebase 앱 1개 (이미 초기화된 경우 재사용)
+            cred = credentials.Certificate(self.firebase_key_path)
+            self.project_id = self.project_id or cred.project_id
+            self.storage_bucket = self.storage_bucket or f'{self.project_id}{DEFAULT_BUCKET_SUFFIX}'
+            app_name = f'{self.project_id}/{self.storage_bucket}'
+            try:
+                app = firebase_admin.get_app(app_name)
+            except ValueError:
+                app = firebase_admin.initialize_app(cred, {
+                    'projectId': self.project_id,
+                    'storageBucket': self.storage_bucket
+                }, name=app_name)
+                print(f"✅ Firebase initialized: {self.project_id}")
             
-            self.db = firestore.client()
-            self.bucket = storage.bucket()
-            print(f"✅ Connected to Firebase Storage: {self.bucket.name}")
+            if self._db is None:
+                self._db = firestore.client(app)
+            if self._bucket is None:
+                self._bucket = storage.bucket(app=app)
+            print(f"✅ Connected to Firebase Storage: {self._bucket.name}")
             
         except Exception as e:
-            print(f"❌ Firebase initialization failed: {e}")
-            sys.exit(1)
+            raise FirebaseInitError(f"Firebase initialization failed: {e}") from e
     
     def build_image_prompt(self, card_name: str, description: str, 
                           rarity: str, style: str) -> str:
@@ -138,317 +355,3277 @@ class AICardGenerator:
     
     def generate_card_concepts(self, mode: str, theme: str, 
                                style: str, custom_names: List[str] = None) -> List[Dict]:
-        """카드 컨셉 생성"""
+        """카드 컨셉 생성 (season_size장, rarity_weights 분배)"""
+        
+        return list(self.concept_table(mode, theme, custom_names))
+    
+    def concept_table(self, mode: str, theme: str,
+                      custom_names: List[str] = None) -> ConceptTable:
+        """카드 컨셉 표 (배열 기반, dict는 순회할 때 생성)"""
         
+        counts = allocate_counts(self.season_size, self.rarity_weights)
         if mode == GenerationMode.EVOLUTION:
-            return self._generate_evolution_concepts(theme, style, custom_names)
+            return evolution_table(counts, theme, self._creature_names(theme, custom_names))
         elif mode == GenerationMode.THEMATIC:
-            return self._generate_thematic_concepts(theme, style)
+            return thematic_table(counts, theme)
         else:  # HYBRID
-            return self._generate_hybrid_concepts(theme, style)
+            return hybrid_table(counts, theme, self._creature_names(theme, custom_names))
     
-    def _generate_evolution_concepts(self, theme: str, style: str, 
-                                    custom_names: List[str] = None) -> List[Dict]:
-        """진화 시스템 카드 컨셉 (20 creatures × 5 stages = 100 → filter to 70)"""
+    def _creature_names(self, theme: str, custom_names: List[str] = None) -> Optional[List[str]]:
+        """진화 모드 생명체 이름 (None이면 '{theme} #n')"""
         
-        # 기본 생명체 이름 (20마리)
-        if custom_names and len(custom_names) == 20:
-            creature_names = custom_names
-        else:
-            # 테마별 기본 생명체
-            if '몬스터' in theme or '포켓몬' in theme:
-                creature_names = [
-                    '파이리', '꼬부기', '이상해씨', '피카츄', '잠만보',
-                    '뮤츠', '루기아', '레쿠쟈', '가디안', '리자몽',
-                    '갸라도스', '망나뇽', '메타그로스', '보만다', '루카리오',
-                    '가브리아스', '메가니움', '블레이범', '샤로다', '염무왕'
-                ]
-            elif '공룡' in theme:
-                creature_names = [
-                    '티라노', '트리케라', '브라키오', '스테고', '벨로시',
-                    '프테라노', '디플로도쿠스', '스피노', '알로', '파키케팔로',
-                    '이구아노돈', '안킬로', '갈리미무스', '카르노', '기가노토',
-                    '테리지노', '케찰코아틀루스', '모사사우루스', '타르보', '바리오닉스'
-                ]
-            elif '해괴한' in theme or '퉁퉁퉁' in theme:
-                creature_names = [
-                    '퉁퉁퉁사우르스', '몽글몽글이', '삐뚤빼뚤', '우걱우걱',
-                    '꾸물꾸물이', '덜컹덜컹', '꿀렁꿀렁이', '쿨럭쿨럭',
-                    '흔들흔들이', '뒤뚱뒤뚱', '빙글빙글이', '펄럭펄럭',
-                    '흐물흐물이', '철컥철컥', '둥둥둥이', '쿵쿵쿵',
-                    '찡긋찡긋이', '포슬포슬', '탱글탱글이', '쫀득쫀득'
-                ]
-            else:
-                creature_names = [f'{theme} #{i+1}' for i in range(20)]
-        
-        # 5단계 진화 컨셉
-        all_cards = []
-        for i, name in enumerate(creature_names):
-            stages = [
-                {'stage': 1, 'rarity': CardRarity.NORMAL, 'prefix': '알'},
-                {'stage': 2, 'rarity': CardRarity.RARE, 'prefix': '새끼'},
-                {'stage': 3, 'rarity': CardRarity.SUPER_RARE, 'prefix': '성체'},
-                {'stage': 4, 'rarity': CardRarity.ULTRA_RARE, 'prefix': '강화'},
-                {'stage': 5, 'rarity': CardRarity.SECRET, 'prefix': '궁극'}
+        # 직접 지정한 이름 (진화 라인보다 적으면 회차 번호를 붙여 반복)
+        if custom_names:
+            return custom_names
+        
+        # 테마별 기본 생명체 (20마리)
+        if '몬스터' in theme or '포켓몬' in theme:
+            return [
+                '파이리', '꼬부기', '이상해씨', '피카츄', '잠만보',
+                '뮤츠', '루기아', '레쿠쟈', '가디안', '리자몽',
+                '갸라도스', '망나뇽', '메타그로스', '보만다', '루카리오',
+                '가브리아스', '메가니움', '블레이범', '샤로다', '염무왕'
             ]
-            
-            for stage in stages:
-                card = {
-                    'index': len(all_cards),
-                    'name': f"{stage['prefix']} {name}",
-                    'description': f"{name}의 {stage['stage']}단계 진화형. 진화할수록 강력해집니다!",
-                    'rarity': stage['rarity'],
-                    'evolution_line': i + 1,
-                    'evolution_stage': stage['stage']
-                }
-                all_cards.append(card)
-        
-        # 100장 → 70장 필터링 (희귀도별 분배)
-        # Normal: 20, Rare: 20, Super Rare: 20, Ultra Rare: 9, Secret: 1
-        filtered = []
-        filtered.extend([c for c in all_cards if c['rarity'] == CardRarity.NORMAL][:20])
-        filtered.extend([c for c in all_cards if c['rarity'] == CardRarity.RARE][:20])
-        filtered.extend([c for c in all_cards if c['rarity'] == CardRarity.SUPER_RARE][:20])
-        filtered.extend([c for c in all_cards if c['rarity'] == CardRarity.ULTRA_RARE][:9])
-        filtered.extend([c for c in all_cards if c['rarity'] == CardRarity.SECRET][:1])
-        
-        # 인덱스 재조정
-        for i, card in enumerate(filtered):
-            card['index'] = i
-        
-        return filtered
-    
-    def _generate_thematic_concepts(self, theme: str, style: str) -> List[Dict]:
-        """테마 기반 독립 카드 (70장)"""
-        
-        # 희귀도 분배: Normal 20, Rare 20, Super Rare 20, Ultra Rare 9, Secret 1
-        rarity_distribution = (
-            [CardRarity.NORMAL] * 20 +
-            [CardRarity.RARE] * 20 +
-            [CardRarity.SUPER_RARE] * 20 +
-            [CardRarity.ULTRA_RARE] * 9 +
-            [CardRarity.SECRET] * 1
+        elif '공룡' in theme:
+            return [
+                '티라노', '트리케라', '브라키오', '스테고', '벨로시',
+                '프테라노', '디플로도쿠스', '스피노', '알로', '파키케팔로',
+                '이구아노돈', '안킬로', '갈리미무스', '카르노', '기가노토',
+                '테리지노', '케찰코아틀루스', '모사사우루스', '타르보', '바리오닉스'
+            ]
+        elif '해괴한' in theme or '퉁퉁퉁' in theme:
+            return [
+                '퉁퉁퉁사우르스', '몽글몽글이', '삐뚤빼뚤', '우걱우걱',
+                '꾸물꾸물이', '덜컹덜컹', '꿀렁꿀렁이', '쿨럭쿨럭',
+                '흔들흔들이', '뒤뚱뒤뚱', '빙글빙글이', '펄럭펄럭',
+                '흐물흐물이', '철컥철컥', '둥둥둥이', '쿵쿵쿵',
+                '찡긋찡긋이', '포슬포슬', '탱글탱글이', '쫀득쫀득'
+            ]
+        return None  # '{theme} #n'
+    
+    def _build_card_prompt(self, card_concept: Dict, style: str) -> str:
+        """카드 컨셉으로 프롬프트 빌드"""
+        return self.build_image_prompt(
+            card_name=card_concept['name'],
+            description=card_concept['description'],
+            rarity=card_concept['rarity'],
+            style=style
+        )
+    
+    def _extract_image_urls(self, result: str) -> List[str]:
+        """생성 결과에서 이미지 URL 전체 추출 (순서 유지, 중복 제거)
+
+        Genspark SDK는 마크다운 형식으로 반환하므로 URL 파싱
+        """
+        import re
+        return list(dict.fromkeys(re.findall(r'https?://[^\s\)]+', result or '')))
+    
+    async def _request_image_urls(self, client, card_concept: Dict, prompt: str,
+                                  count: int = 1, model: str = IMAGE_MODEL) -> List[str]:
+        """provider 호출 1회 → 이미지 URL 목록 (실패 시 예외 전달)
+        
+        count > 1이면 프롬프트로 후보 count장을 요청합니다 (provider가 덜 주면 받은 만큼).
+        """
+        
+        query = f"{prompt}, {BEST_OF_HINT.format(count=count)}" if count > 1 else prompt
+        result = await client.image_generation(
+            query=query,
+            model=model,
+            aspect_ratio=IMAGE_ASPECT_RATIO,
+            image_urls=[],
+            task_summary=f'Generate Weekly Gacha card: {card_concept["name"]}'
         )
         
-        cards = []
-        for i, rarity in enumerate(rarity_distribution):
-            card = {
-                'index': i,
-                'name': f'{theme} #{i+1}',
-                'description': f'{theme} 테마의 유니크한 카드',
-                'rarity': rarity
-            }
-            cards.append(card)
+        image_urls = self._extract_image_urls(result)
+        if not image_urls:
+            raise NoImageInResultError('Could not extract URL from result')
+        return image_urls[:count]
+    
+    async def _timed_request(self, client, card_concept: Dict, prompt: str, count: int,
+                             model: str, attempt: int, hedge: bool = False) -> Tuple[str, List[str]]:
+        """모델 1개로 요청 → (모델, URL 목록), 지연 시간 / 성공 여부를 라우터와 계측에 기록"""
+        
+        start = time.perf_counter()
+        attrs = {'hedge': True} if hedge else {}
+        try:
+            with self.metrics.span(Stage.GENERATE, card_concept['index'],
+                                   model=model, attempt=attempt, **attrs):
+                image_urls = await self._request_image_urls(client, card_concept, prompt,
+                                                            count, model)
+        except asyncio.CancelledError:
+            self.metrics.count_provider_call(model, billed=False)
+            self.router.record_cancelled(model, time.perf_counter() - start)
+            raise
+        except Exception:
+            self.metrics.count_provider_call(model, billed=False)
+            self.router.record(model, time.perf_counter() - start, ok=False)
+            raise
+        self.router.record(model, time.perf_counter() - start, ok=True)
+        self.metrics.count_provider_call(model, billed=True, images=len(image_urls))
+        return model, image_urls
+    
+    async def _request_routed(self, client, card_concept: Dict, prompt: str, count: int,
+                              attempt: int) -> Tuple[str, List[str]]:
+        """라우터가 고른 모델로 요청 → (모델, URL 목록)
+        
+        요청이 관측된 p95를 넘기면 백업 모델로 같은 요청을 보내고 먼저 성공한 결과를 씁니다.
+        둘 다 실패하면 첫 모델의 예외를 전달합니다 (재시도는 호출한 쪽).
+        """
+        
+        models = self.router.candidates(card_concept['rarity'])
+        tasks = [asyncio.create_task(self._timed_request(
+            client, card_concept, prompt, count, models[0], attempt
+        ))]
+        try:
+            delay = self.router.hedge_delay(models[0]) if len(models) > 1 else None
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done:
+                return tasks[0].result()
+            
+            if self.rate_limiter:
+                await self.rate_limiter.acquire()
+            if tasks[0].done():
+                return tasks[0].result()
+            print(f"   🏁 Hedging {card_concept['name']}: {models[0]} over {delay:.1f}s, "
+                  f"also trying {models[1]}")
+            self.metrics.count_hedge('sent')
+            tasks.append(asyncio.create_task(self._timed_request(
+                client, card_concept, prompt, count, models[1], attempt, hedge=True
+            )))
+            
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is tasks[1]:
+                            self.metrics.count_hedge('won')
+                        return task.result()
+            return tasks[0].result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    async def _generate_image_url(self, client, card_concept: Dict, style: str,
+                                  variation: int = 0) -> str:
+        """이미지 1장 생성 + 오류 종류별 재시도 (실패 시 GenerationFailedError)"""
+        urls = await self._generate_image_urls(client, card_concept, style, variation)
+        return urls[0]
+    
+    async def _generate_image_urls(self, client, card_concept: Dict, style: str,
+                                   variation: int = 0, count: int = 1) -> List[str]:
+        """이미지 후보 생성 + 오류 종류별 재시도 (실패 시 GenerationFailedError)
+        
+        variation > 0이면 품질 검사 재생성용으로 프롬프트에 변형 힌트를 붙입니다.
+        count > 1이면 한 번의 요청으로 후보 최대 count장을 받습니다 (best-of-N).
+        """
+        
+        prompt = self._build_card_prompt(card_concept, style)
+        if variation:
+            prompt = f"{prompt}, {REGENERATION_HINT} #{variation}"
+        
+        print(f"   🎨 Generating: {card_concept['name']}")
+        print(f"   📝 Prompt: {prompt[:80]}...")
         
-        return cards
+        attempt = 0
+        kind_attempts = Counter()  # 오류 종류별 시도 횟수 (429 여러 번 뒤의 timeout도 3회)
+        while True:
+            attempt += 1
+            if self.rate_limiter:
+                await self.rate_limiter.acquire()
+            
+            try:
+                _, image_urls = await self._request_routed(client, card_concept, prompt,
+                                                           count, attempt)
+                if self.rate_limiter:
+                    self.rate_limiter.reward()
+                if len(image_urls) > 1:
+                    print(f"   ✅ {len(image_urls)} candidates generated: {card_concept['name']}")
+                else:
+                    print(f"   ✅ Image generated: {image_urls[0][:60]}...")
+                return image_urls
+            
+            except Exception as e:
+                kind = classify_error(e)
+                kind_attempts[kind] += 1
+                delay = self.retry_policy.delay(kind, kind_attempts[kind], e)
+                
+                # 429: 모든 작업자가 함께 대기하고 요청 속도를 낮춤
+                if kind == ErrorKind.RATE_LIMIT and self.rate_limiter:
+                    self.rate_limiter.penalize(delay)
+                    delay = 0
+                
+                if not self.retry_policy.should_retry(kind, kind_attempts[kind]):
+                    print(f"   ❌ Generation failed ({kind}, {attempt} attempts): {e}")
+                    raise GenerationFailedError(kind, str(e), attempt) from e
+                
+                self.metrics.count_retry(kind, card_concept['index'])
+                print(f"   🔁 Retry #{attempt} ({kind}) in {delay:.1f}s: {card_concept['name']}")
+                await asyncio.sleep(delay)
     
-    def _generate_hybrid_concepts(self, theme: str, style: str) -> List[Dict]:
-        """하이브리드: 진화 + 독립 카드"""
+    async def generate_card_image_async(self, client, card_concept: Dict,
+                                        style: str) -> Optional[str]:
+        """
+        단일 카드 이미지 생성 (비동기)
         
-        # 50% 진화형, 50% 독립 카드
-        evolution_cards = self._generate_evolution_concepts(theme, style)[:35]
-        thematic_cards = self._generate_thematic_concepts(theme, style)[:35]
+        이미 열려 있는 GenSparkSDK 클라이언트를 재사용합니다.
+        재시도 후에도 실패하면 None을 반환합니다.
+        """
         
-        all_cards = evolution_cards + thematic_cards
+        try:
+            return await self._generate_image_url(client, card_concept, style)
+        except GenerationFailedError:
+            return None
+    
+    def _open_sdk_client(self):
+        """GenSparkSDK 클라이언트 생성 (async with로 사용)"""
         
-        # 인덱스 재조정
-        for i, card in enumerate(all_cards):
-            card['index'] = i
+        if self.sdk_factory is not None:
+            return self.sdk_factory(timeout=GENSPARK_TIMEOUT, verbose=False)
         
-        return all_cards
+        from genspark_sdk import GenSparkSDK
+        return GenSparkSDK(timeout=GENSPARK_TIMEOUT, verbose=False)
     
     def generate_single_card_image(self, card_concept: Dict, style: str) -> Optional[str]:
         """
         단일 카드 이미지 생성 (Genspark AI 활용)
         
         실제 Genspark SDK를 사용하여 이미지 생성
+        시즌 전체 생성은 generate_full_season_async()를 사용하세요.
         """
         
-        prompt = self.build_image_prompt(
-            card_name=card_concept['name'],
-            description=card_concept['description'],
-            rarity=card_concept['rarity'],
-            style=style
-        )
+        async def generate_async():
+            self.rate_limiter = TokenBucket(self.rate_limit)
+            async with self._open_sdk_client() as client:
+                return await self.generate_card_image_async(client, card_concept, style)
         
-        print(f"   🎨 Generating: {card_concept['name']}")
-        print(f"   📝 Prompt: {prompt[:80]}...")
+        # 동기 함수에서 async 함수 실행
+        return asyncio.run(generate_async())
+    
+    def _http(self, pool_size: int = DEFAULT_CONCURRENCY):
+        """카드 전체에서 재사용하는 커넥션 풀 HTTP 세션"""
+        if self._http_session is None:
+            self._http_session = create_http_session(pool_size)
+        return self._http_session
+    
+    @staticmethod
+    def _hashed(name: str, content_hash: Optional[str]) -> str:
+        """내용 해시 이름 (content_hash가 없으면 그대로)"""
+        return f'{name}.{content_hash[:CONTENT_HASH_LENGTH]}' if content_hash else name
+    
+    def _card_image_path(self, card_index: int, extension: str,
+                         content_hash: Optional[str] = None) -> str:
+        """카드 원본 이미지 Storage 경로 (content_hash: immutable 모드의 sha256)"""
+        name = self._hashed(f'card_{card_index}', content_hash)
+        return f'seasons/{self.season_id}/cards/{name}.{extension}'
+    
+    def _variant_path(self, card_index: int, variant: Dict,
+                      content_hash: Optional[str] = None) -> str:
+        """변형 이미지 Storage 경로"""
+        name = self._hashed(variant['size'], content_hash)
+        return f"seasons/{self.season_id}/cards/card_{card_index}/{name}.{variant['format']}"
+    
+    def _asset_cache_control(self) -> Optional[str]:
+        """카드 이미지 / 변형 Cache-Control (immutable 모드에서만, 고정 이름은 기본값)"""
+        return IMMUTABLE_CACHE_CONTROL if self.immutable_assets else None
+    
+    def load_remote_season(self) -> RemoteSeason:
+        """차등 게시용 원격 시즌 상태 조회 (blob 해시 / 카드 문서 / 시즌 문서, blocking)"""
+        
+        with self.metrics.span(Stage.DIFF) as span:
+            self.remote_season = RemoteSeason.fetch(self.bucket, self.db, self.season_id)
+            span.update(blobs=len(self.remote_season.blobs), docs=len(self.remote_season.docs))
+        print(f"🔎 Remote season: {len(self.remote_season.blobs)} blobs, "
+              f"{len(self.remote_season.docs)} card documents")
+        return self.remote_season
+    
+    def _remote_unchanged(self, storage_path: str, path: str,
+                          card_index: Optional[int] = None,
+                          digests: Optional[Dict] = None) -> Optional[Dict]:
+        """차등 게시: 원격 blob과 내용이 같으면 로컬 해시 반환 (업로드 생략), 아니면 None"""
+        
+        if self.remote_season is None:
+            return None
+        if digests is None:
+            with self.metrics.span(Stage.DIFF, card_index):
+                digests = file_digests(path)
+        if not self.remote_season.blob_unchanged(storage_path, digests):
+            return None
+        self.metrics.count_skipped('upload')
+        return digests
+    
+    def _upload_file(self, storage_path: str, path: str, content_type: str,
+                     card_index: Optional[int] = None, stage: str = Stage.UPLOAD) -> str:
+        """로컬 파일 1개 업로드 (공개 ACL / 캐시 헤더 포함, 요청 1번) → 공개 URL"""
+        
+        blob = self.bucket.blob(storage_path)
+        blob.cache_control = self._asset_cache_control()
+        with self.metrics.span(stage, card_index, path=storage_path):
+            blob.upload_from_filename(path, content_type=content_type, predefined_acl=PUBLIC_ACL)
+        self.metrics.add_bytes(os.path.getsize(path), card_index)
+        return blob.public_url
+    
+    def _upload_stream(self, reader: ChunkedStreamReader, card_index: int,
+                       content_hash: Optional[str] = None) -> Dict:
+        """스트림 → Firebase Storage resumable 업로드
+        
+        공개 ACL은 업로드 요청에 포함합니다 (make_public() 별도 호출 없음).
+        content_hash가 주어지면 내용 해시 이름 + immutable 캐시 헤더로 올립니다.
+        실패 시 예외를 그대로 전달합니다.
+        반환값: storage_url, checksum (sha256), size
+        """
+        
+        # provider가 반환한 실제 포맷으로 Content-Type / 확장자 결정
+        content_type, extension = sniff_image_type(reader.peek(SNIFF_SIZE))
+        
+        # Firebase Storage 경로
+        storage_path = self._card_image_path(card_index, extension, content_hash)
+        blob = self.bucket.blob(storage_path, chunk_size=UPLOAD_CHUNK_SIZE)
+        blob.cache_control = self._asset_cache_control()
+        
+        # 업로드 (UPLOAD_CHUNK_SIZE 단위로 읽으며 전송)
+        with self.metrics.span(Stage.UPLOAD, card_index):
+            blob.upload_from_file(reader, content_type=content_type, predefined_acl=PUBLIC_ACL)
+        self.metrics.add_bytes(reader.bytes_read, card_index)
+        
+        print(f"   ✅ Uploaded to: {storage_path}")
+        
+        return {
+            'storage_url': blob.public_url,
+            'checksum': reader.checksum,
+            'size': reader.bytes_read
+        }
+    
+    def _transfer_image(self, image_url: str, card_index: int,
+                        cache_key: Optional[str] = None, keep_local: bool = False) -> Dict:
+        """provider URL → Firebase Storage 스트리밍 전송 (실패 시 예외 전달)
+        
+        cache_key가 주어지면 전송하면서 이미지 캐시에도 기록합니다.
+        keep_local=True이면 원본 사본 경로를 local_path로 반환합니다
+        (캐시가 없으면 임시 파일, temporary=True).
+        immutable 모드는 이름에 내용 해시가 필요하므로 로컬에 받은 뒤 업로드합니다.
+        """
+        
+        if self.immutable_assets:
+            local_path, temporary = self._download_image(image_url, card_index, cache_key)
+            try:
+                result = self._upload_cached_image(local_path, card_index)
+            except Exception:
+                if temporary:
+                    os.remove(local_path)
+                raise
+            if not keep_local:
+                if temporary:
+                    os.remove(local_path)
+                return result
+            return dict(result, local_path=local_path, temporary=temporary)
+        
+        writer = None
+        if self.image_cache and cache_key:
+            writer = self.image_cache.open_writer(cache_key)
+        elif keep_local:
+            writer = SpoolWriter()
         
         try:
-            # ✅ 실제 Genspark SDK 사용
-            import asyncio
-            from genspark_sdk import GenSparkSDK
-            
-            async def generate_async():
-                async with GenSparkSDK(timeout=120.0, verbose=False) as client:
-                    result = await client.image_generation(
-                        query=prompt,
-                        model='recraft-v3',  # 빠르고 경제적 (512x512, $0.02)
-                        aspect_ratio='1:1',
-                        image_urls=[],
-                        task_summary=f'Generate Weekly Gacha card: {card_concept["name"]}'
-                    )
-                    return result
-            
-            # 동기 함수에서 async 함수 실행
-            result = asyncio.run(generate_async())
-            
-            # 결과에서 이미지 URL 추출
-            # Genspark SDK는 마크다운 형식으로 반환하므로 URL 파싱
-            import re
-            url_match = re.search(r'https?://[^\s\)]+', result)
-            if url_match:
-                image_url = url_match.group(0)
-                print(f"   ✅ Image generated: {image_url[:60]}...")
-                return image_url
+            with self.metrics.span(Stage.DOWNLOAD, card_index):
+                response = self._http().get(image_url, stream=True, timeout=30)
+            with response:
+                response.raise_for_status()
+                reader = ChunkedStreamReader(
+                    response.iter_content(STREAM_CHUNK_SIZE), sink=writer
+                )
+                result = self._upload_stream(reader, card_index)
+        except Exception:
+            if writer:
+                writer.abort()
+            raise
+        
+        if writer:
+            local_path = writer.commit()
+            if keep_local:
+                result['local_path'] = local_path
+                result['temporary'] = isinstance(writer, SpoolWriter)
+        return result
+    
+    def _download_image(self, image_url: str, card_index: int,
+                        cache_key: Optional[str] = None):
+        """provider URL → 로컬 파일 (캐시 또는 임시 파일) → (경로, 임시 파일 여부)"""
+        
+        if self.image_cache and cache_key:
+            writer = self.image_cache.open_writer(cache_key)
+        else:
+            writer = SpoolWriter()
+        
+        try:
+            with self.metrics.span(Stage.DOWNLOAD, card_index) as span:
+                with self._http().get(image_url, stream=True, timeout=30) as response:
+                    response.raise_for_status()
+                    size = 0
+                    for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                        writer.write(chunk)
+                        size += len(chunk)
+                span['bytes'] = size
+        except Exception:
+            writer.abort()
+            raise
+        
+        return writer.commit(), isinstance(writer, SpoolWriter)
+    
+    def _upload_cached_image(self, path: str, card_index: int) -> Dict:
+        """캐시된 이미지 파일 → Firebase Storage 업로드 (차등 게시면 같은 내용은 생략)"""
+        
+        content_hash = None
+        with open(path, 'rb') as f:
+            if self.remote_season is not None or self.immutable_assets:
+                _, extension = sniff_image_type(f.read(SNIFF_SIZE))
+                f.seek(0)
+                with self.metrics.span(Stage.DIFF, card_index):
+                    digests = file_digests(path)
+                if self.immutable_assets:
+                    content_hash = digests['sha256']
+                storage_path = self._card_image_path(card_index, extension, content_hash)
+                if self._remote_unchanged(storage_path, path, card_index, digests):
+                    print(f"   ⏭️  Unchanged: {storage_path}")
+                    return {
+                        'storage_url': self.bucket.blob(storage_path).public_url,
+                        'checksum': digests['sha256'],
+                        'size': digests['size']
+                    }
+            return self._upload_stream(ChunkedStreamReader(iter_file_chunks(f)), card_index,
+                                       content_hash)
+    
+    def _image_executor(self) -> ProcessPoolExecutor:
+        """이미지 처리(변형 생성, 품질 검사)용 프로세스 풀
+        
+        spawn 방식: 업로드/커밋 스레드가 있는 상태에서 fork하지 않음
+        """
+        if self._image_pool is None:
+            self._image_pool = ProcessPoolExecutor(
+                max_workers=self.variant_workers or os.cpu_count(),
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return self._image_pool
+    
+    def _upload_variant(self, variant: Dict, card_index: int) -> str:
+        """변형 파일 1개 업로드 → 공개 URL (차등 게시면 같은 내용은 생략)"""
+        
+        digests = file_digests(variant['path']) if self.immutable_assets else None
+        storage_path = self._variant_path(card_index, variant, digests and digests['sha256'])
+        if self._remote_unchanged(storage_path, variant['path'], card_index, digests):
+            return self.bucket.blob(storage_path).public_url
+        return self._upload_file(storage_path, variant['path'], variant['content_type'],
+                                 card_index, Stage.VARIANT_UPLOAD)
+    
+    def _render_variants(self, source_path: str, card_index: int, out_dir: str) -> List[Dict]:
+        """원본 → 크기/포맷별 변형 파일 (프로세스 풀, blocking)"""
+        
+        with self.metrics.span(Stage.VARIANTS, card_index) as span:
+            variants = self._image_executor().submit(
+                render_variants, source_path, out_dir,
+                self.variant_sizes, self.variant_formats
+            ).result()
+            span['count'] = len(variants)
+        return variants
+    
+    @staticmethod
+    def _variant_map(variants: List[Dict], original_url: str, place) -> Dict:
+        """변형 목록 → {format: {size: url}} (place(variant) → URL, 원본과 같은 변형은 원본 URL)"""
+        
+        variant_map = {}
+        for variant in variants:
+            urls = variant_map.setdefault(variant['format'], {})
+            if variant['path']:
+                urls[variant['size']] = place(variant)
             else:
-                print(f"   ⚠️ Could not extract URL from result")
-                return None
+                urls[variant['size']] = urls.get(variant['same_as'], original_url)
+        return variant_map
+    
+    def _publish_variants(self, source_path: str, card_index: int, original_url: str) -> Dict:
+        """원본 → 크기/포맷별 변형 생성 + 업로드 (blocking, 실패 시 예외 전달)
+        
+        반환값: {format: {size: url}} (원본과 같은 포맷의 original은 원본 URL)
+        """
+        
+        out_dir = tempfile.mkdtemp(prefix='gacha_variants_')
+        try:
+            variants = self._render_variants(source_path, card_index, out_dir)
+            return self._variant_map(variants, original_url,
+                                     lambda variant: self._upload_variant(variant, card_index))
+        finally:
+            shutil.rmtree(out_dir, ignore_errors=True)
+    
+    def _bundle_stage_dir(self) -> str:
+        """시즌 번들 썸네일 준비 디렉토리 (매니페스트와 함께 보관 → 재개 시 재사용)"""
+        return os.path.join(self.manifest_dir, 'bundles', self.season_id)
+    
+    def _stage_thumbnail(self, source_path: str, card_index: int):
+        """로컬 원본 → 번들 썸네일 (blocking, 실패해도 카드는 그대로 완료)"""
+        
+        try:
+            with self.metrics.span(Stage.THUMBNAIL, card_index):
+                self._image_executor().submit(
+                    render_thumbnail, source_path,
+                    thumbnail_path(self._bundle_stage_dir(), card_index),
+                    self.bundle_thumb_size
+                ).result()
+        except Exception as e:
+            print(f"   ⚠️ Bundle thumbnail failed (card_{card_index}): {e}")
+    
+    def _restage_thumbnail(self, card: Dict):
+        """썸네일이 없는 카드 (이전 실행에서 완료) → 업로드된 원본에서 다시 만들기"""
+        
+        try:
+            path, _ = self._download_image(card['imagePath'], card['index'])
+        except Exception as e:
+            print(f"   ⚠️ Bundle thumbnail skipped (card_{card['index']}): {e}")
+            return
+        try:
+            self._stage_thumbnail(path, card['index'])
+        finally:
+            os.remove(path)
+    
+    def _bundle_card(self, card: Dict) -> Dict:
+        """카드 → 번들 매니페스트 항목 (Firestore 문서와 같은 필드, 서버 타임스탬프 제외)"""
+        
+        document = self._card_document(card)
+        del document['createdAt'], document['seasonId']
+        # 차등 게시: 문서의 기존 generatedAt 유지 (내용이 같으면 매니페스트 체크섬도 같음)
+        remote = self.remote_season.docs.get(document['id']) if self.remote_season else None
+        if remote and 'generatedAt' in remote:
+            document['generatedAt'] = remote['generatedAt']
+        return document
+    
+    def publish_bundle(self, cards: List[Dict]) -> Optional[Dict]:
+        """시즌 번들 (썸네일 아틀라스 + 매니페스트) 업로드 → 시즌 문서에 참조 기록 (blocking)
+        
+        앱은 시즌 문서의 bundle.manifestUrl + 아틀라스만 받아서 시즌 전체를 표시합니다.
+        실패해도 카드는 이미 저장된 상태이므로 경고만 출력하고 None을 반환합니다.
+        """
+        
+        stage_dir = self._bundle_stage_dir()
+        out_dir = tempfile.mkdtemp(prefix='gacha_bundle_')
+        prefix = f"seasons/{self.season_id}/bundle"
+        try:
+            with self.metrics.span(Stage.BUNDLE) as span:
+                thumbnails = []
+                for card in sorted(cards, key=lambda c: c['index']):
+                    path = thumbnail_path(stage_dir, card['index'])
+                    if not os.path.exists(path) and card.get('imagePath'):
+                        self._restage_thumbnail(card)
+                    if os.path.exists(path):
+                        thumbnails.append((card['index'], path))
+                
+                atlas = self._image_executor().submit(
+                    build_atlas, thumbnails, out_dir, self.bundle_thumb_size
+                ).result()
+                
+                # 아틀라스 이름에 내용 해시 포함 (CDN 캐시에 이전 아틀라스가 남아도 좌표 불일치 없음)
+                atlas_urls = []
+                total_bytes = 0
+                for page_number, page in enumerate(atlas['pages']):
+                    with open(page['path'], 'rb') as f:
+                        digest = hashlib.sha256(f.read()).hexdigest()[:12]
+                    blob = self.bucket.blob(f"{prefix}/atlas_{page_number}_{digest}.{ATLAS_FORMAT}")
+                    if not self._remote_unchanged(blob.name, page['path']):
+                        blob.cache_control = IMMUTABLE_CACHE_CONTROL
+                        blob.upload_from_filename(page['path'], content_type=page['content_type'],
+                                                  predefined_acl=PUBLIC_ACL)
+                        total_bytes += page['bytes']
+                    atlas_urls.append(blob.public_url)
+                
+                entries = [
+                    dict(self._bundle_card(card), sprite=atlas['frames'].get(card['index']))
+                    for card in sorted(cards, key=lambda c: c['index'])
+                ]
+                manifest = build_manifest(self.season_id, entries, atlas_urls,
+                                          self.bundle_thumb_size)
+                data, checksum = pack_manifest(manifest)
+                blob = self.bucket.blob(f"{prefix}/manifest.json")
+                
+                # 차등 게시: 매니페스트 내용이 같으면 업로드 / 시즌 문서 쓰기 생략
+                remote_bundle = (self.remote_season.season_doc.get('bundle') or {}
+                                 if self.remote_season else {})
+                if (remote_bundle.get('checksum') == checksum
+                        and blob.name in self.remote_season.blobs):
+                    self.metrics.count_skipped('bundle')
+                    bundle = remote_bundle
+                else:
+                    # gzip 저장 + Content-Encoding: 클라이언트는 압축 해제된 JSON을 받음
+                    blob.content_encoding = 'gzip'
+                    blob.cache_control = 'no-cache'
+                    blob.upload_from_string(data, content_type='application/json',
+                                            predefined_acl=PUBLIC_ACL)
+                    total_bytes += len(data)
+                    
+                    bundle = {
+                        'manifestUrl': blob.public_url,
+                        'atlasUrls': atlas_urls,
+                        'cardCount': len(entries),
+                        'thumbSize': self.bundle_thumb_size,
+                        'checksum': checksum,
+                        'version': BUNDLE_VERSION,
+                        'updatedAt': _firestore().SERVER_TIMESTAMP
+                    }
+                    self.db.collection('seasons').document(self.season_id).set(
+                        {'bundle': bundle}, merge=True
+                    )
+                span.update(cards=len(entries), sprites=len(atlas['frames']), bytes=total_bytes)
+            self.metrics.add_bytes(total_bytes)
+        except Exception as e:
+            print(f"⚠️ Season bundle failed: {e}")
+            return None
+        finally:
+            shutil.rmtree(out_dir, ignore_errors=True)
+        
+        return {
+            'manifest_url': bundle['manifestUrl'],
+            'atlas_urls': atlas_urls,
+            'cards': len(entries),
+            'sprites': len(atlas['frames']),
+            'bytes': total_bytes,
+            'checksum': checksum
+        }
+    
+    def _supply_shards(self, supply_ref, previous: Optional[Dict],
+                       supply: Dict) -> Optional[Tuple[List[Dict], List[str]]]:
+        """supply 문서 → (쓸 shard 문서, 삭제할 shard ID), 구성 변경을 거부하면 None (blocking)
+        
+        구성(shard 수 / 발행 수량)이 같거나 처음이면 count Increment(0) (이미 뽑힌 수량 유지).
+        구성이 바뀌면 기존 shard를 읽어서 이미 뽑힌 shard가 없으면 새 구성 + 남는 shard 삭제,
+        뽑힌 shard가 있으면 migrate_supply일 때만 발행된 시리얼을 건너뛰는 count로 옮깁니다
+        (그대로 다시 쓰면 시리얼 구간이 바뀌어 번호가 겹치고, 줄어든 shard의 수량만큼 초과 발행됨).
+        """
+        
+        from supply_shards import layout_changed, migrate_shards, shard_documents
+        firestore = _firestore()
+        layout = [dict(shard, count=firestore.Increment(0))
+                  for shard in shard_documents(supply['maxSupply'], supply['shards'])]
+        if not previous or not layout_changed(previous, supply):
+            return layout, []
+        
+        existing = {int(snapshot.id): snapshot.to_dict() or {}
+                    for snapshot in supply_ref.collection('shards').stream() if snapshot.id.isdigit()}
+        orphans = [str(number) for number in sorted(existing) if number >= supply['shards']]
+        issued = sum(shard.get('count', 0) for shard in existing.values())
+        change = (f"{previous.get('shards')} → {supply['shards']} shards, "
+                  f"maxSupply {previous.get('maxSupply')} → {supply['maxSupply']}")
+        if not issued:
+            print(f"   ⚠️ Supply layout changed: {supply['cardId']} ({change}, "
+                  f"{len(orphans)} unused shards removed)")
+            return layout, orphans
+        if not self.migrate_supply:
+            print(f"   ❌ Supply layout change refused: {supply['cardId']} ({change}) "
+                  f"already has {issued} pulls (rerun with --migrate-supply while pulls are paused)")
+            return None
+        
+        migrated = migrate_shards(supply['maxSupply'], supply['shards'], existing)
+        print(f"   🔀 Supply migrated: {supply['cardId']} ({change}, {issued} pulls, "
+              f"{sum(shard['capacity'] - shard['count'] for shard in migrated)} serials left)")
+        if issued > supply['maxSupply']:
+            print(f"   ⚠️ {supply['cardId']}: {issued} already pulled > new maxSupply {supply['maxSupply']}")
+        return migrated, orphans
+    
+    def publish_supply(self, cards: List[Dict], flush_size: int = DEFAULT_FLUSH_SIZE) -> Optional[Dict]:
+        """발행 수량 shard + 시즌 요약 문서 쓰기 (blocking)
+        
+        shard는 merge + count Increment(0)으로 써서 이미 뽑힌 수량은 유지합니다.
+        이미 뽑힌 카드의 shard 구성은 바꾸지 않습니다 (migrate_supply, _supply_shards 참고).
+        차등 게시면 원격과 같은 카드 / 요약은 생략합니다.
+        실패해도 카드는 이미 저장된 상태이므로 경고만 출력하고 None을 반환합니다.
+        """
+        
+        from supply_shards import build_summary, shard_counts, summary_size, SUMMARY_MAX_BYTES
+        firestore = _firestore()
+        season_ref = self.db.collection('seasons').document(self.season_id)
+        remote = self.remote_season
+        documents = [self._card_document(card) for card in sorted(cards, key=lambda c: c['index'])]
+        stats = {'cards': 0, 'shards': 0, 'unchanged': 0, 'failed': 0, 'refused': [], 'summary': None}
+        try:
+            with self.metrics.span(Stage.SUPPLY) as span:
+                shards = shard_counts(documents, self.peak_pulls_per_second) if self.supply_shards else {}
+                if shards:
+                    # 기존 supply 문서 (차등 게시가 아니면 한 번에 조회, 새 시즌은 비어 있음)
+                    existing = remote.supply if remote else {
+                        snapshot.id: snapshot.to_dict()
+                        for snapshot in season_ref.collection('supply').stream()
+                    }
+                    with self.create_firestore_writer(flush_size=flush_size) as writer:
+                        for document in documents:
+                            card_id = document['id']
+                            supply = {'cardId': card_id, 'rarity': document['rarity'],
+                                      'maxSupply': document['maxSupply'], 'shards': shards[card_id]}
+                            previous = existing.get(card_id)
+                            if previous == supply:
+                                self.metrics.count_skipped('supply')
+                                stats['unchanged'] += 1
+                                continue
+                            
+                            supply_ref = season_ref.collection('supply').document(card_id)
+                            planned = self._supply_shards(supply_ref, previous, supply)
+                            if planned is None:
+                                # 요약에는 원격의 기존 구성을 그대로 표시
+                                shards[card_id] = previous['shards']
+                                stats['refused'].append(card_id)
+                                continue
+                            layout, orphans = planned
+                            writer.set(supply_ref, supply, merge=True)
+                            for number, shard in enumerate(layout):
+                                writer.set(supply_ref.collection('shards').document(str(number)),
+                                           shard, merge=True)
+                            for number in orphans:
+                                writer.delete(supply_ref.collection('shards').document(number))
+                            stats['cards'] += 1
+                            stats['shards'] += supply['shards']
+                    stats['failed'] = writer.failed
                 
+                summary = build_summary(self.season_id, documents, shards)
+                if remote is not None and remote.summary.get('checksum') == summary['checksum']:
+                    self.metrics.count_skipped('summary')
+                    stats['summary'] = 'unchanged'
+                elif summary_size(summary) > SUMMARY_MAX_BYTES:
+                    print(f"⚠️ Season summary too large ({summary_size(summary) / 1024:.0f} KB), "
+                          f"skipped (use the season bundle manifest)")
+                    stats['summary'] = 'too_large'
+                else:
+                    season_ref.collection('meta').document('summary').set(
+                        dict(summary, updatedAt=firestore.SERVER_TIMESTAMP)
+                    )
+                    stats['summary'] = 'written'
+                span.update(cards=stats['cards'], shards=stats['shards'])
         except Exception as e:
-            print(f"   ❌ Generation failed: {e}")
-            # 에러 발생 시 None 반환 (재시도 로직에서 처리)
+            print(f"⚠️ Supply shards / season summary failed: {e}")
             return None
+        
+        print(f"🧩 Supply shards: {stats['shards']} for {stats['cards']} cards "
+              f"({stats['unchanged']} unchanged, {stats['failed']} failed, "
+              f"{len(stats['refused'])} refused), summary {stats['summary']}")
+        return stats
     
     def upload_to_firebase_storage(self, image_url: str, card_index: int) -> str:
         """Firebase Storage에 이미지 업로드"""
         
-        import requests
-        from io import BytesIO
-        
         try:
-            # 이미지 다운로드
-            response = requests.get(image_url, timeout=30)
-            response.raise_for_status()
-            
-            image_data = BytesIO(response.content)
-            
-            # Firebase Storage 경로
-            storage_path = f'seasons/{self.season_id}/cards/card_{card_index}.png'
-            blob = self.bucket.blob(storage_path)
-            
-            # 업로드
-            blob.upload_from_file(image_data, content_type='image/png')
-            blob.make_public()
-            
-            download_url = blob.public_url
-            print(f"   ✅ Uploaded to: {storage_path}")
-            
-            return download_url
+            return self._transfer_image(image_url, card_index)['storage_url']
             
         except Exception as e:
             print(f"   ❌ Upload failed: {e}")
             return image_url  # 실패 시 원본 URL 반환
     
-    def save_to_firestore(self, cards_data: List[Dict]):
-        """Firestore에 카드 데이터 저장 (배치 처리)"""
+    def _card_document(self, card: Dict) -> Dict:
+        """카드 → Firestore 문서 데이터"""
+        
+        document = {
+            'id': f"card_{card['index']}",
+            'name': card['name'],
+            'rarity': card['rarity'],
+            'imagePath': card.get('imagePath', ''),
+            'description': card['description'],
+            'maxSupply': self.max_supply.get(card['rarity'], DEFAULT_MAX_SUPPLY),
+            'createdAt': _firestore().SERVER_TIMESTAMP,
+            'generatedAt': card.get('generatedAt') or datetime.now().isoformat(),
+            'seasonId': self.season_id
+        }
+        if card.get('variants'):
+            document['variants'] = card['variants']
+        return document
+    
+    def _card_ref(self, card: Dict):
+        """카드 Firestore 문서 참조"""
+        card_id = f"card_{card['index']}"
+        return self.db.collection('seasons').document(self.season_id).collection('cards').document(card_id)
+    
+    def _write_card(self, writer: FirestoreBatchWriter, card: Dict):
+        """카드 문서 쓰기 (차등 게시면 바뀐 필드만, 같으면 생략)"""
         
-        batch = self.db.batch()
+        document = self._card_document(card)
+        if self.remote_season is None:
+            writer.set(self._card_ref(card), document)
+            return
+        write = self.remote_season.document_write(document['id'], document)
+        if write is None:
+            self.metrics.count_skipped('document')
+            return
+        data, merge, _ = write
+        writer.set(self._card_ref(card), data, merge=merge)
+    
+    def create_firestore_writer(self, flush_size: int = DEFAULT_FLUSH_SIZE) -> FirestoreBatchWriter:
+        """증분 Firestore writer 생성"""
+        _firestore()  # 카드 문서 생성 중 이벤트 루프에서 import되지 않도록 미리 로드
+        return FirestoreBatchWriter(self.db, flush_size=flush_size, metrics=self.metrics)
+    
+    def save_to_firestore(self, cards_data: List[Dict]):
+        """Firestore에 카드 데이터 저장 (배치 처리, 500개 단위 자동 분할)"""
         
+        writer = self.create_firestore_writer(flush_size=len(cards_data) or 1)
         for card in cards_data:
-            card_id = f"card_{card['index']}"
-            doc_ref = self.db.collection('seasons').document(self.season_id).collection('cards').document(card_id)
-            
-            batch.set(doc_ref, {
-                'id': card_id,
-                'name': card['name'],
-                'rarity': card['rarity'],
-                'imagePath': card.get('imagePath', ''),
-                'description': card['description'],
-                'maxSupply': 1000,
-                'createdAt': firestore.SERVER_TIMESTAMP,
-                'generatedAt': datetime.now().isoformat(),
-                'seasonId': self.season_id
-            })
+            self._write_card(writer, card)
+        stats = writer.close()
         
-        batch.commit()
-        print(f"✅ Saved {len(cards_data)} cards to Firestore")
+        print(f"✅ Saved {stats['committed']} cards to Firestore")
+        if stats['failed']:
+            print(f"❌ Failed to save {stats['failed']} cards")
     
-    def generate_full_season(self, mode: str, theme: str, style: str, 
-                            custom_names: List[str] = None) -> Dict:
-        """전체 시즌 카드 생성 (70장)"""
-        
-        print("=" * 60)
-        print("🎴 Weekly Gacha AI Card Generation")
-        print("=" * 60)
-        print(f"📅 Season: {self.season_id}")
-        print(f"🎯 Mode: {mode}")
-        print(f"🎨 Theme: {theme}")
-        print(f"✨ Style: {style}")
-        print(f"📦 Total Cards: 70")
-        print("=" * 60)
+    def upload_local_images(self, card_concepts: List[Dict], style: str, image_dir: str,
+                            concurrency: int = DEFAULT_CONCURRENCY,
+                            resume: bool = False) -> Dict:
+        """로컬 이미지 파일(card_{index}.png) → Firebase Storage 업로드
         
-        start_time = time.time()
+        AI 생성 없이 준비된 이미지를 업로드하고 매니페스트에 완료로 기록합니다.
+        Firestore 저장은 commit_from_manifest()로 따로 실행합니다.
+        """
         
-        # 1단계: 카드 컨셉 생성
-        print("\n[1/3] 📝 Generating card concepts...")
-        card_concepts = self.generate_card_concepts(mode, theme, style, custom_names)
-        print(f"✅ Generated {len(card_concepts)} card concepts")
+        if self.variant_sizes or self.bundle_thumb_size:
+            require_pillow()
         
-        # 2단계: AI 이미지 생성
-        print("\n[2/3] 🎨 Generating AI images (70 cards)...")
-        print("⏱️  Estimated time: 30-40 minutes")
-        print("-" * 60)
+        manifest = SeasonManifest(self.season_id, self.manifest_dir)
+        completed = manifest.completed() if resume else {}
+        if self.differential:
+            self.load_remote_season()
         
-        generated_cards = []
-        failed_cards = []
+        jobs, missing = [], []
+        for concept in card_concepts:
+            if concept['index'] in completed:
+                continue
+            path = os.path.join(image_dir, f"card_{concept['index']}.png")
+            if os.path.exists(path):
+                jobs.append((concept, path))
+            else:
+                missing.append(concept)
         
-        for i, concept in enumerate(card_concepts):
-            print(f"\n[{i+1}/70] Processing: {concept['name']}")
-            
+        def upload(job):
+            concept, path = job
+            prompt = self._build_card_prompt(concept, style)
             try:
-                # AI 이미지 생성
-                image_url = self.generate_single_card_image(concept, style)
-                
-                if image_url:
-                    # Firebase Storage 업로드
-                    storage_url = self.upload_to_firebase_storage(image_url, i)
-                    concept['imagePath'] = storage_url
-                    generated_cards.append(concept)
-                else:
-                    failed_cards.append(concept)
-                    print(f"   ⚠️  Generation failed")
-                
+                transfer = self._upload_cached_image(path, concept['index'])
+                if self.variant_sizes:
+                    concept['variants'] = self._publish_variants(
+                        path, concept['index'], transfer['storage_url']
+                    )
+                if self.bundle_thumb_size:
+                    self._stage_thumbnail(path, concept['index'])
             except Exception as e:
-                print(f"   ❌ Error: {e}")
-                failed_cards.append(concept)
-            
-            # 진행률 표시
-            progress = (i + 1) / len(card_concepts) * 100
-            print(f"   📊 Progress: {progress:.1f}% ({i+1}/70)")
+                print(f"   ❌ Upload failed ({concept['name']}): {e}")
+                manifest.record_failed(concept, prompt, f'upload failed: {e}')
+                return False
+            concept['imagePath'] = transfer['storage_url']
+            concept['generatedAt'] = datetime.now().isoformat()
+            manifest.record_done(concept, prompt, f'file://{os.path.abspath(path)}',
+                                 transfer['storage_url'], transfer['checksum'])
+            return True
         
-        # 3단계: Firestore 저장
-        print("\n[3/3] 💾 Saving to Firestore...")
-        self.save_to_firestore(generated_cards)
-        
-        elapsed_time = time.time() - start_time
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            uploaded = sum(executor.map(upload, jobs))
         
-        # 결과 요약
-        print("\n" + "=" * 60)
-        print("✅ Generation Complete!")
-        print("=" * 60)
-        print(f"✅ Successful: {len(generated_cards)}/70")
-        print(f"❌ Failed: {len(failed_cards)}/70")
-        print(f"⏱️  Time: {elapsed_time/60:.1f} minutes")
-        print(f"🔗 Season ID: {self.season_id}")
-        print("=" * 60)
+        for concept in missing:
+            print(f"   ⚠️ Missing image: card_{concept['index']}.png ({concept['name']})")
         
         return {
-            'success': len(failed_cards) == 0,
-            'generated': len(generated_cards),
-            'failed': len(failed_cards),
-            'season_id': self.season_id,
-            'elapsed_time': elapsed_time
+            'uploaded': uploaded,
+            'failed': len(jobs) - uploaded,
+            'missing': len(missing),
+            'skipped': len(completed)
         }
-
-
-def main():
-    """메인 실행 함수"""
     
-    print("\n🎴 Weekly Gacha AI Card Generator")
-    print("=" * 60)
+    def commit_from_manifest(self, flush_size: int = DEFAULT_FLUSH_SIZE) -> Dict:
+        """매니페스트에 완료로 기록된 카드 → Firestore 저장 (재실행해도 같은 결과)
+        
+        bundle_thumb_size가 설정되어 있으면 시즌 번들도 다시 올립니다.
+        """
+        
+        if self.bundle_thumb_size:
+            require_pillow()
+        
+        completed = SeasonManifest(self.season_id, self.manifest_dir).completed()
+        cards = [dict(entry['concept'], imagePath=entry['storage_url'])
+                 for _, entry in sorted(completed.items())]
+        return self._commit_cards(cards, flush_size)
     
-    # 사용자 입력
+    def commit_from_queue(self, queue: 'JobQueue', flush_size: int = DEFAULT_FLUSH_SIZE) -> Dict:
+        """작업 큐의 완료 카드 → Firestore 저장 + 시즌 번들 (시즌 작업이 모두 끝난 뒤 1회)
+        
+        품질 검사가 있으면 worker들이 기록한 카드 해시로 시즌 해시 파일도 저장합니다.
+        """
+        
+        if self.bundle_thumb_size:
+            require_pillow()
+        
+        cards = queue.results(self.season_id)
+        if self.quality_gate:
+            for card in cards:
+                if card.get('phash'):
+                    self.quality_gate.remember(int(card['phash'], 16), self.season_id, card['index'])
+            print(f"🔍 Saved perceptual hashes: {self.quality_gate.save_season(self.season_id)}")
+        return self._commit_cards(cards, flush_size)
+    
+    def _commit_cards(self, cards: List[Dict], flush_size: int) -> Dict:
+        """완료 카드 목록 → Firestore 저장 (+ 시즌 번들)"""
+        
+        if self.differential:
+            self.load_remote_season()
+        with self.create_firestore_writer(flush_size=flush_size) as writer:
+            for card in cards:
+                self._write_card(writer, card)
+        
+        bundle = None
+        if self.bundle_thumb_size and cards:
+            bundle = self.publish_bundle(cards)
+        supply = self.publish_supply(cards, flush_size) if cards else None
+        return {'committed': writer.committed, 'failed': writer.failed, 'bundle': bundle,
+                'supply': supply}
+    
+    def _local_image(self, concept: Dict, prompt: str, cache_slot: int,
+                     image_dir: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+        """게시할 로컬 이미지 → (경로, 매니페스트용 image_url), 없으면 (None, None)
+        
+        image_dir의 card_{index}.png 우선, 없으면 이미지 캐시 (같은 프롬프트 / 슬롯)
+        """
+        
+        if image_dir:
+            path = os.path.join(image_dir, f"card_{concept['index']}.png")
+            if os.path.exists(path):
+                return path, f'file://{os.path.abspath(path)}'
+        if self.image_cache:
+            cache_key = self._cache_key(concept, prompt, cache_slot)
+            path = self.image_cache.get(cache_key)
+            if path:
+                return path, f'cache:{cache_key}'
+        return None, None
+    
+    def plan_publish(self, card_concepts: List[Dict], style: str, image_dir: Optional[str],
+                     work_dir: str) -> Tuple[PublishPlan, List[Dict], List[Dict]]:
+        """로컬 결과 ↔ 원격 시즌 비교 → (게시 계획, 카드 목록, 매니페스트 기록 목록)
+        
+        로컬 이미지가 없는 카드는 매니페스트의 완료 기록(업로드된 URL)으로 문서만 비교합니다.
+        변형은 work_dir에 만들어 두고 적용 단계에서 업로드합니다.
+        """
+        
+        remote = self.load_remote_season()
+        plan = PublishPlan(self.season_id)
+        completed = SeasonManifest(self.season_id, self.manifest_dir).completed()
+        
+        prompt_counts = {}
+        cards, records = [], []
+        for concept in card_concepts:
+            prompt = self._build_card_prompt(concept, style)
+            cache_slot = prompt_counts.get(prompt, 0)
+            prompt_counts[prompt] = cache_slot + 1
+            index = concept['index']
+            
+            path, image_url = self._local_image(concept, prompt, cache_slot, image_dir)
+            card = dict(concept)
+            remote_doc = remote.docs.get(f'card_{index}') or {}
+            card['generatedAt'] = remote_doc.get('generatedAt') or datetime.now().isoformat()
+            if path is None:
+                entry = completed.get(index)
+                if not entry:
+                    print(f"   ⚠️ No local image or uploaded copy: card_{index} ({concept['name']})")
+                    continue
+                card['imagePath'] = entry['storage_url']
+                if entry['concept'].get('variants'):
+                    card['variants'] = entry['concept']['variants']
+                cards.append(card)
+                plan.add_write(f'card_{index}', remote.document_write(
+                    f'card_{index}', self._card_document(card)))
+                continue
+            
+            with open(path, 'rb') as f:
+                content_type, extension = sniff_image_type(f.read(SNIFF_SIZE))
+            digests = file_digests(path)
+            storage_path = self._card_image_path(
+                index, extension, digests['sha256'] if self.immutable_assets else None)
+            if remote.blob_unchanged(storage_path, digests):
+                plan.unchanged_blobs += 1
+            else:
+                plan.add_upload(storage_path, path, content_type, index, remote)
+            card['imagePath'] = self.bucket.blob(storage_path).public_url
+            
+            if self.variant_sizes:
+                out_dir = os.path.join(work_dir, str(index))
+                os.makedirs(out_dir)
+                variants = self._render_variants(path, index, out_dir)
+                
+                def place(variant, index=index):
+                    variant_digests = file_digests(variant['path'])
+                    variant_path = self._variant_path(
+                        index, variant, variant_digests['sha256'] if self.immutable_assets else None)
+                    if remote.blob_unchanged(variant_path, variant_digests):
+                        plan.unchanged_blobs += 1
+                    else:
+                        plan.add_upload(variant_path, variant['path'], variant['content_type'],
+                                        index, remote)
+                    return self.bucket.blob(variant_path).public_url
+                
+                card['variants'] = self._variant_map(variants, card['imagePath'], place)
+            if self.bundle_thumb_size:
+                self._stage_thumbnail(path, index)
+            
+            cards.append(card)
+            records.append((card, prompt, image_url, digests['sha256']))
+            plan.add_write(f'card_{index}', remote.document_write(
+                f'card_{index}', self._card_document(card)))
+        
+        return plan, cards, records
+    
+    def publish_season(self, card_concepts: List[Dict], style: str,
+                       image_dir: Optional[str] = None,
+                       concurrency: int = DEFAULT_CONCURRENCY,
+                       flush_size: int = DEFAULT_FLUSH_SIZE,
+                       dry_run: bool = False) -> Dict:
+        """차등 게시: 계획 출력 → 바뀐 blob만 병렬 업로드 → 바뀐 문서 필드만 커밋 → 번들
+        
+        업로드에 실패한 카드의 문서는 쓰지 않습니다 (재실행하면 남은 것만 다시 시도).
+        """
+        
+        if self.variant_sizes or self.bundle_thumb_size:
+            require_pillow()
+        
+        work_dir = tempfile.mkdtemp(prefix='gacha_publish_')
+        try:
+            plan, cards, records = self.plan_publish(card_concepts, style, image_dir, work_dir)
+            plan.print_plan()
+            stats = {'uploaded': 0, 'upload_failed': 0, 'written': 0, 'write_failed': 0,
+                     'unchanged_blobs': plan.unchanged_blobs,
+                     'unchanged_docs': plan.unchanged_docs, 'bundle': None, 'supply': None}
+            if dry_run:
+                return stats
+            
+            def upload(item):
+                try:
+                    self._upload_file(item['name'], item['path'], item['content_type'],
+                                      item['card_index'])
+                    return None
+                except Exception as e:
+                    print(f"   ❌ Upload failed ({item['name']}): {e}")
+                    return item['card_index']
+            
+            with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+                failed_cards = {index for index in executor.map(upload, plan.uploads)
+                                if index is not None}
+            stats['upload_failed'] = len(failed_cards)
+            stats['uploaded'] = sum(1 for item in plan.uploads
+                                    if item['card_index'] not in failed_cards)
+            
+            cards_ref = self.db.collection('seasons').document(self.season_id).collection('cards')
+            with self.create_firestore_writer(flush_size=flush_size) as writer:
+                for write in plan.writes:
+                    if int(write['doc_id'].split('_', 1)[1]) not in failed_cards:
+                        writer.set(cards_ref.document(write['doc_id']), write['data'],
+                                   merge=write['merge'])
+            stats['written'], stats['write_failed'] = writer.committed, writer.failed
+            
+            manifest = SeasonManifest(self.season_id, self.manifest_dir)
+            for card, prompt, image_url, checksum in records:
+                if card['index'] not in failed_cards:
+                    manifest.record_done(card, prompt, image_url, card['imagePath'], checksum)
+            
+            if self.bundle_thumb_size and cards:
+                stats['bundle'] = self.publish_bundle(
+                    [card for card in cards if card['index'] not in failed_cards]
+                )
+            published = [card for card in cards if card['index'] not in failed_cards]
+            if published:
+                stats['supply'] = self.publish_supply(published, flush_size)
+            return stats
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    
+    def _season_documents(self, concurrency: int = DEFAULT_CONCURRENCY) -> List[Tuple[str, Dict]]:
+        """seasons/{season_id} 아래 문서 전체 → [(상대 경로, 데이터)] (시즌 문서는 '')"""
+        
+        from season_archive import SEASON_COLLECTIONS, SUBCOLLECTIONS
+        season_ref = self.db.collection('seasons').document(self.season_id)
+        documents = []
+        snapshot = season_ref.get()
+        if snapshot.exists:
+            documents.append(('', snapshot.to_dict()))
+        for name in SEASON_COLLECTIONS:
+            snapshots = list(season_ref.collection(name).stream())
+            documents.extend((f'{name}/{snapshot.id}', snapshot.to_dict()) for snapshot in snapshots)
+            child = SUBCOLLECTIONS.get(name)
+            if not child or not snapshots:
+                continue
+            
+            def read_children(parent, name=name, child=child):
+                return [(f'{name}/{parent.id}/{child}/{snapshot.id}', snapshot.to_dict())
+                        for snapshot in parent.reference.collection(child).stream()]
+            
+            with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+                for children in executor.map(read_children, snapshots):
+                    documents.extend(children)
+        return documents
+    
+    def export_season(self, path: str, concurrency: int = DEFAULT_CONCURRENCY) -> Dict:
+        """게시된 시즌 (blob + Firestore 문서) → 로컬 아카이브 1개 (blocking)
+        
+        blob은 저장 바이트 그대로(gzip 매니페스트 포함) 병렬로 받아 순서대로 아카이브에 쓰고,
+        원본 MD5 / CRC32C와 다르면 SeasonArchiveError로 중단합니다 (아카이브는 남지 않음).
+        """
+        
+        from season_archive import SeasonArchiveWriter, public_url_prefix, SPOOL_MAX_BYTES
+        blobs = list(self.bucket.list_blobs(prefix=f'seasons/{self.season_id}/'))
+        documents = self._season_documents(concurrency)
+        if not blobs and not documents:
+            raise SeasonArchiveError(f"season not found: {self.season_id} ({self.bucket.name})")
+        print(f"📦 Exporting {self.season_id}: {len(blobs)} blobs, {len(documents)} documents")
+        
+        def download(blob):
+            spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+            with self.metrics.span(Stage.DOWNLOAD, path=blob.name):
+                blob.download_to_file(spool, raw_download=True)
+            spool.seek(0)
+            return blob, spool
+        
+        # 받아 둔 blob 수 상한 (동시성 × 2) → 시즌 크기와 관계없이 메모리 / 임시 파일 일정
+        window = max(1, concurrency) * 2
+        with SeasonArchiveWriter(path, self.season_id, public_url_prefix(self.bucket),
+                                 self.bucket.name) as writer, \
+                ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            for start in range(0, len(blobs), window):
+                for blob, spool in executor.map(download, blobs[start:start + window]):
+                    with spool:
+                        writer.add_blob(blob, spool)
+            for doc_path, data in documents:
+                writer.add_document(doc_path, data)
+        self.metrics.add_bytes(writer.bytes)
+        
+        size = os.path.getsize(path)
+        print(f"✅ Exported {self.season_id}: {path} ({size / 1024 / 1024:.1f} MB)")
+        return {'path': path, 'blobs': len(blobs), 'documents': len(documents),
+                'blob_bytes': writer.bytes, 'bytes': size}
+    
+    def _archive_documents(self, archive: 'SeasonArchiveReader',
+                           bundle_checksum: Optional[str]) -> List[Tuple[str, Dict]]:
+        """아카이브 문서 → 대상 버킷 URL로 바꾼 문서 (요약 / 번들 체크섬 갱신)"""
+        
+        from season_archive import public_url_prefix, rewrite_urls
+        from supply_shards import summary_checksum
+        source, target = archive.source_prefix, public_url_prefix(self.bucket)
+        documents = []
+        for doc_path, data in archive.documents():
+            data = rewrite_urls(data, source, target)
+            if doc_path == 'meta/summary' and 'checksum' in data:
+                data['checksum'] = summary_checksum(data)
+            if doc_path == '' and bundle_checksum and data.get('bundle'):
+                data['bundle'] = dict(data['bundle'], checksum=bundle_checksum)
+            documents.append((doc_path, data))
+        return documents
+    
+    def import_season(self, archive: 'SeasonArchiveReader',
+                      concurrency: int = DEFAULT_CONCURRENCY,
+                      flush_size: int = DEFAULT_FLUSH_SIZE,
+                      dry_run: bool = False) -> Dict:
+        """아카이브 → 이 생성기의 프로젝트 / 버킷에 복원 (blocking, 생성 비용 없음)
+        
+        대상과 해시 / 내용이 같은 blob / 문서는 생략합니다 (중단 후 재실행하면 남은 것만 씀).
+        blob 업로드가 하나라도 실패하면 문서는 쓰지 않습니다 (깨진 카드가 앱에 보이지 않도록).
+        shard는 merge + count Increment(0)으로 써서 대상에서 이미 뽑힌 수량을 유지하고,
+        대상에서 이미 뽑힌 카드의 shard 구성은 바꾸지 않습니다 (_supply_shards 참고).
+        마지막에 대상 blob / 문서를 다시 읽어 아카이브 해시 / 내용과 비교합니다.
+        """
+        
+        from season_archive import document_ref, public_url_prefix, rewrite_urls
+        from supply_shards import layout_changed
+        if archive.season_id != self.season_id:
+            raise SeasonArchiveError(f"archive is for {archive.season_id}, not {self.season_id}")
+        firestore = _firestore()
+        source, target = archive.source_prefix, public_url_prefix(self.bucket)
+        remote = self.load_remote_season()
+        
+        # 번들 매니페스트(gzip JSON) 안의 URL도 대상 버킷으로 → 다시 압축, 해시 / 체크섬 갱신
+        blobs = {entry['name']: dict(entry) for entry in archive.blobs}
+        payloads, bundle_checksum = {}, None
+        manifest_name = f'seasons/{self.season_id}/bundle/manifest.json'
+        if manifest_name in blobs and source != target:
+            manifest = rewrite_urls(unpack_manifest(archive.read_blob(manifest_name)), source, target)
+            payloads[manifest_name], bundle_checksum = pack_manifest(manifest)
+            digests = ContentDigests()
+            digests.update(payloads[manifest_name])
+            blobs[manifest_name].update(digests.result())
+        
+        uploads = [entry for name, entry in blobs.items() if not remote.blob_unchanged(name, entry)]
+        documents = self._archive_documents(archive, bundle_checksum)
+        supply = {doc_path.split('/')[1]: data for doc_path, data in documents
+                  if doc_path.startswith('supply/') and doc_path.count('/') == 1}
+        
+        def unchanged(doc_path: str, data: Dict) -> bool:
+            parts = doc_path.split('/')
+            if not doc_path:
+                return remote.season_doc == data
+            if parts[0] == 'cards':
+                return remote.docs.get(parts[1]) == data
+            if parts[0] == 'supply':
+                # shard는 같은 구성의 supply 문서가 이미 있으면 생략
+                return remote.supply.get(parts[1]) == supply.get(parts[1])
+            if doc_path == 'meta/summary':
+                return remote.summary.get('checksum') == data.get('checksum')
+            return False
+        
+        writes = [(doc_path, data) for doc_path, data in documents if not unchanged(doc_path, data)]
+        stats = {'uploaded': 0, 'upload_failed': 0, 'unchanged_blobs': len(blobs) - len(uploads),
+                 'written': 0, 'write_failed': 0, 'unchanged_docs': len(documents) - len(writes),
+                 'verified_blobs': 0, 'verified_docs': 0, 'refused': [], 'mismatched': []}
+        
+        # 대상에 다른 구성의 supply 문서가 있는 카드: 기존 shard 확인 후 새 구성 / 이전 / 거부
+        season_ref = self.db.collection('seasons').document(self.season_id)
+        shard_writes, deletes = {}, []
+        for card_id, data in supply.items():
+            previous = remote.supply.get(card_id)
+            if not previous or previous == data or not layout_changed(previous, data):
+                continue
+            supply_ref = season_ref.collection('supply').document(card_id)
+            planned = self._supply_shards(supply_ref, previous, data)
+            if planned is None:
+                stats['refused'].append(card_id)
+                continue
+            layout, orphans = planned
+            for number, shard in enumerate(layout):
+                shard_writes[f'supply/{card_id}/shards/{number}'] = shard
+            deletes += [f'supply/{card_id}/shards/{number}' for number in orphans]
+        if stats['refused']:
+            refused = set(stats['refused'])
+            writes = [(doc_path, data) for doc_path, data in writes
+                      if not (doc_path.startswith('supply/') and doc_path.split('/')[1] in refused)]
+        print(f"📝 Import plan for {self.season_id}: "
+              f"{len(uploads)} uploads ({stats['unchanged_blobs']} unchanged), "
+              f"{len(writes)} document writes ({stats['unchanged_docs']} unchanged)")
+        if dry_run:
+            return stats
+        
+        def upload(entry: Dict) -> bool:
+            # 시즌 asset은 모두 공개 ACL로 올림 (업로드 요청에 포함)
+            blob = self.bucket.blob(entry['name'], chunk_size=UPLOAD_CHUNK_SIZE)
+            blob.cache_control = entry.get('cacheControl')
+            blob.content_encoding = entry.get('contentEncoding')
+            try:
+                with self.metrics.span(Stage.UPLOAD, path=entry['name']):
+                    if entry['name'] in payloads:
+                        blob.upload_from_string(payloads[entry['name']], content_type=entry['contentType'],
+                                                predefined_acl=PUBLIC_ACL)
+                    else:
+                        with archive.open_blob(entry['name']) as stream:
+                            blob.upload_from_file(stream, size=entry['size'],
+                                                  content_type=entry['contentType'],
+                                                  predefined_acl=PUBLIC_ACL)
+                self.metrics.add_bytes(entry['size'])
+                return True
+            except Exception as e:
+                print(f"   ❌ Upload failed ({entry['name']}): {e}")
+                return False
+        
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            results = list(executor.map(upload, uploads))
+        stats['uploaded'] = sum(results)
+        stats['upload_failed'] = len(results) - stats['uploaded']
+        if stats['upload_failed']:
+            print(f"⚠️ {stats['upload_failed']} uploads failed, documents not written (rerun import to resume)")
+            return stats
+        
+        # 카드 + shard → 발행 수량 → 요약 → 시즌 문서 순서
+        # (supply 문서는 shard 커밋 후에 씀 → 재개 시 같은 supply 문서가 있으면 shard 생략 가능,
+        #  시즌 문서의 번들 참조는 마지막)
+        phases = [
+            [(doc_path, data) for doc_path, data in writes
+             if doc_path.startswith('cards/') or doc_path.count('/') == 3],
+            [(doc_path, data) for doc_path, data in writes
+             if doc_path.startswith('supply/') and doc_path.count('/') == 1],
+            [(doc_path, data) for doc_path, data in writes
+             if not doc_path.startswith(('cards/', 'supply/'))],
+        ]
+        phases[2].sort(key=lambda item: item[0] == '')
+        for phase in phases:
+            with self.create_firestore_writer(flush_size=flush_size) as writer:
+                if phase is phases[0]:
+                    for doc_path in deletes:
+                        writer.delete(document_ref(season_ref, doc_path))
+                for doc_path, data in phase:
+                    if doc_path in shard_writes:
+                        data = shard_writes[doc_path]
+                    elif doc_path.count('/') == 3:
+                        data = dict(data, count=firestore.Increment(0))
+                    # supply / shard / 시즌 문서는 merge (대상의 뽑기 수량 / 다른 필드 유지)
+                    merge = not doc_path.startswith(('cards/', 'meta/'))
+                    writer.set(document_ref(season_ref, doc_path), data, merge=merge)
+            stats['written'] += writer.committed
+            stats['write_failed'] += writer.failed
+            if writer.failed:
+                print(f"⚠️ {writer.failed} document writes failed (rerun import to resume)")
+                break
+        
+        # 검증: 대상 blob 해시 / 카드 / 발행 수량 문서 ↔ 아카이브
+        after = RemoteSeason.fetch(self.bucket, self.db, self.season_id)
+        for name, entry in blobs.items():
+            if after.blob_unchanged(name, entry):
+                stats['verified_blobs'] += 1
+            else:
+                stats['mismatched'].append(name)
+        for doc_path, data in documents:
+            kind, _, doc_id = doc_path.partition('/')
+            if kind in ('cards', 'supply') and '/' not in doc_id:
+                target_docs = after.docs if kind == 'cards' else after.supply
+                if target_docs.get(doc_id) == data:
+                    stats['verified_docs'] += 1
+                else:
+                    stats['mismatched'].append(doc_path)
+        return stats
+    
+    def catalog_rows(self, cards: List[Dict], mode: str, theme: str, style: str) -> List[Dict]:
+        """완료된 카드 → 카탈로그 행 (프롬프트 / 해시는 매니페스트, 소요 시간은 이번 실행 계측)"""
+        
+        completed = SeasonManifest(self.season_id, self.manifest_dir).completed()
+        rows = []
+        for card in sorted(cards, key=lambda c: c['index']):
+            entry = completed.get(card['index'], {})
+            stats = self.metrics.cards.get(card['index'], {})
+            stages = stats.get('stages', {})
+            model = self.router.primary(card['rarity'])
+            rows.append({
+                'mode': mode,
+                'theme': theme,
+                'style': style,
+                'rarity': card['rarity'],
+                'model': model,
+                'index': card['index'],
+                'max_supply': self.max_supply.get(card['rarity'], DEFAULT_MAX_SUPPLY),
+                'bytes': stats.get('bytes'),
+                'generated_at': card.get('generatedAt'),
+                'generate_seconds': stages.get(Stage.GENERATE),
+                'card_seconds': stages.get(Stage.CARD),
+                # 이번 실행에서 생성한 카드만 (캐시 적중 / 재개 카드는 0)
+                'cost': (MODEL_COSTS.get(model, 0.0) * self.best_of.get(card['rarity'], 1)
+                         if Stage.GENERATE in stages else 0.0),
+                'name': card['name'],
+                'description': card['description'],
+                'prompt': entry.get('prompt') or self._build_card_prompt(card, style),
+                'image_url': card.get('imagePath'),
+                'checksum': entry.get('checksum'),
+                'phash': card.get('phash'),
+                'variants': card.get('variants'),
+            })
+        return rows
+    
+    def record_catalog(self, cards: List[Dict], mode: str, theme: str, style: str) -> Optional[str]:
+        """시즌 카드를 로컬 카탈로그에 기록 (실패해도 경고만) → 세그먼트 경로"""
+        
+        from season_catalog import CatalogSource
+        if self.catalog is None or not cards:
+            return None
+        try:
+            return self.catalog.append_season(self.season_id,
+                                              self.catalog_rows(cards, mode, theme, style),
+                                              source=CatalogSource.RUN)
+        except (OSError, CatalogError) as e:
+            print(f"⚠️ Catalog update failed: {e}")
+            return None
+    
+    def _remote_catalog_rows(self, season_id: str) -> List[Dict]:
+        """Firestore 시즌 1개 → 카탈로그 행 (요약 문서 읽기 1번, 없으면 카드 문서 전체)
+        
+        테마 / 스타일 / 모드는 Firestore에 없으므로 비워 둡니다.
+        이 호스트의 매니페스트가 있으면 프롬프트 / 해시를 채웁니다.
+        """
+        
+        season_ref = self.db.collection('seasons').document(season_id)
+        summary = season_ref.collection('meta').document('summary').get()
+        if summary.exists and (summary.to_dict() or {}).get('cards'):
+            documents = [dict(entry, id=card_id)
+                         for card_id, entry in summary.to_dict()['cards'].items()]
+        else:
+            documents = [snapshot.to_dict() for snapshot in season_ref.collection('cards').stream()]
+        
+        completed = SeasonManifest(season_id, self.manifest_dir).completed()
+        rows = []
+        for document in documents:
+            card_id = str(document.get('id', ''))
+            index = int(card_id.split('_', 1)[1]) if card_id.startswith('card_') else -1
+            entry = completed.get(index, {})
+            rows.append({
+                'rarity': document.get('rarity'),
+                'index': index,
+                'max_supply': document.get('maxSupply'),
+                'generated_at': document.get('generatedAt'),
+                'name': document.get('name'),
+                'description': document.get('description'),
+                'prompt': entry.get('prompt'),
+                'image_url': document.get('imagePath'),
+                'checksum': entry.get('checksum'),
+                'phash': (entry.get('concept') or {}).get('phash'),
+                'variants': document.get('variants'),
+            })
+        return sorted(rows, key=lambda row: row['index'])
+    
+    def sync_catalog(self, season_ids: Optional[Sequence[str]] = None, refresh: bool = False,
+                     concurrency: int = DEFAULT_CONCURRENCY) -> Dict:
+        """Firestore 시즌 → 로컬 카탈로그 (색인되지 않은 시즌만 읽음, blocking)
+        
+        season_ids가 없으면 seasons 컬렉션 전체를 나열합니다 (목록 요청 1번).
+        refresh=True이면 이미 색인된 시즌도 다시 읽습니다.
+        """
+        
+        from season_catalog import CatalogSource
+        if self.catalog is None:
+            raise CatalogError("catalog is disabled (--no-catalog)")
+        if season_ids is None:
+            season_ids = [ref.id for ref in self.db.collection('seasons').list_documents()]
+        indexed = self.catalog.seasons()
+        missing = [season_id for season_id in season_ids if refresh or season_id not in indexed]
+        print(f"🗂️  Catalog sync: {len(season_ids)} remote seasons, "
+              f"{len(season_ids) - len(missing)} already indexed, {len(missing)} to fetch")
+        
+        stats = {'seasons': len(season_ids), 'fetched': 0, 'cards': 0, 'empty': 0, 'failed': 0}
+        
+        def fetch(season_id: str):
+            try:
+                return season_id, self._remote_catalog_rows(season_id)
+            except Exception as e:
+                print(f"   ❌ Catalog sync failed ({season_id}): {e}")
+                return season_id, None
+        
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            for season_id, rows in executor.map(fetch, missing):
+                if rows is None:
+                    stats['failed'] += 1
+                elif not rows:
+                    stats['empty'] += 1
+                else:
+                    self.catalog.append_season(season_id, rows, source=CatalogSource.FIRESTORE)
+                    stats['fetched'] += 1
+                    stats['cards'] += len(rows)
+        return stats
+    
+    def _emit(self, event: str, **data):
+        """진행 이벤트 → progress_callback (콜백 오류는 경고만, 생성은 계속)"""
+        
+        if self.progress_callback is None:
+            return
+        try:
+            self.progress_callback(dict(data, event=event, season_id=self.season_id,
+                                        time=time.time()))
+        except Exception as e:
+            print(f"⚠️  Progress callback failed ({event}): {e}")
+    
+    def _cache_key(self, concept: Dict, prompt: str, cache_slot: int) -> str:
+        """이미지 캐시 키 (희귀도의 기본 모델 기준, hedge로 백업 모델 결과를 받아도 같은 키)"""
+        return ImageCache.make_key(prompt, self.router.primary(concept['rarity']),
+                                   IMAGE_ASPECT_RATIO, cache_slot)
+    
+    def _cache_slots(self, card_concepts: List[Dict], style: str) -> Dict[int, int]:
+        """동일 프롬프트 반복 순번 (캐시 키 구분용) → {카드 인덱스: 순번}"""
+        
+        cache_slots, prompt_counts = {}, {}
+        for concept in card_concepts:
+            prompt = self._build_card_prompt(concept, style)
+            cache_slots[concept['index']] = prompt_counts.get(prompt, 0)
+            prompt_counts[prompt] = cache_slots[concept['index']] + 1
+        return cache_slots
+    
+    async def _process_card_async(self, client, semaphore: asyncio.Semaphore,
+                                  concept: Dict, style: str,
+                                  manifest: SeasonManifest,
+                                  cache_slot: int = 0) -> Dict:
+        """카드 1장 파이프라인 (카드 전체 소요 시간 / 결과 계측)"""
+        
+        with self.metrics.span(Stage.CARD, concept['index']):
+            try:
+                card = await self._process_card_stages(
+                    client, semaphore, concept, style, manifest, cache_slot
+                )
+            except GenerationFailedError as e:
+                self.metrics.set_card_status(concept['index'], f'failed:{e.kind}')
+                raise
+        
+        self.metrics.set_card_status(concept['index'], 'done')
+        return card
+    
+    async def _generate_with_slot(self, client, semaphore: asyncio.Semaphore,
+                                  concept: Dict, style: str, manifest: SeasonManifest,
+                                  prompt: str, variation: int = 0, count: int = 1) -> List[str]:
+        """동시성 슬롯을 잡고 이미지 후보 생성 (실패 시 매니페스트 기록 후 GenerationFailedError)"""
+        
+        with self.metrics.span(Stage.QUEUE_WAIT, concept['index']):
+            await semaphore.acquire()
+        try:
+            return await self._generate_image_urls(client, concept, style, variation, count)
+        except GenerationFailedError as e:
+            manifest.record_failed(concept, prompt, f'{e.kind}: {e}')
+            raise
+        finally:
+            semaphore.release()
+    
+    async def _pass_quality_gate(self, client, semaphore: asyncio.Semaphore,
+                                 concept: Dict, style: str, manifest: SeasonManifest,
+                                 prompt: str, cache_key: str, image_url: str,
+                                 cached_path: Optional[str]):
+        """중복 / 빈 이미지 검사, 거부되면 변형 프롬프트로 재생성
+        
+        반환값: (image_url, 로컬 경로, 임시 파일 여부)
+        재생성 횟수를 넘기면 GenerationFailedError (kind: duplicate / low_detail).
+        """
+        
+        local_path, temporary = cached_path, False
+        loop = asyncio.get_running_loop()
+        
+        for regeneration in range(self.quality_gate.max_regenerations + 1):
+            if regeneration:
+                image_url, = await self._generate_with_slot(client, semaphore, concept, style,
+                                                            manifest, prompt, regeneration)
+            stage = 'download'
+            try:
+                if local_path is None:
+                    local_path, temporary = await asyncio.to_thread(
+                        self._download_image, image_url, concept['index'], cache_key
+                    )
+                stage = 'quality check'
+                with self.metrics.span(Stage.QUALITY_CHECK, concept['index']) as span:
+                    analysis = await loop.run_in_executor(
+                        self._image_executor(), analyze_image, local_path
+                    )
+                    rejection = self.quality_gate.check(analysis, self.season_id, concept['index'])
+                    span['rejected'] = rejection[0] if rejection else None
+            except Exception as e:
+                if temporary and local_path:
+                    os.remove(local_path)
+                print(f"   ❌ {stage.capitalize()} failed: {e}")
+                manifest.record_failed(concept, prompt, f'{stage} failed: {e}')
+                raise GenerationFailedError(classify_transfer_error(e), f'{stage} failed: {e}') from e
+            
+            if rejection is None:
+                concept['phash'] = f"{analysis['phash']:016x}"
+                return image_url, local_path, temporary
+            
+            kind, detail = rejection
+            print(f"   🔍 Quality gate rejected ({kind}: {detail}): {concept['name']}")
+            self.metrics.count_retry(kind, concept['index'])
+            if temporary:
+                os.remove(local_path)
+            elif self.image_cache:
+                self.image_cache.discard(cache_key)
+            local_path, temporary = None, False
+        
+        manifest.record_failed(concept, prompt, f'{kind}: {detail}')
+        raise GenerationFailedError(kind, detail, self.quality_gate.max_regenerations + 1)
+    
+    async def _generate_best_of(self, client, semaphore: asyncio.Semaphore,
+                                concept: Dict, style: str, manifest: SeasonManifest,
+                                prompt: str, cache_key: str, count: int):
+        """best-of-N: 후보 count장 생성 → 다운로드 → 로컬 점수 순으로 1장 선택
+        
+        점수는 선명도 + 배경 정리도 (rank_candidates), 품질 검사가 있으면 점수 순으로
+        중복 / 빈 이미지를 거르고, 후보가 모두 탈락하면 변형 프롬프트로 다시 요청합니다.
+        반환값: (image_url, 로컬 경로, 임시 파일 여부)
+        """
+        
+        loop = asyncio.get_running_loop()
+        rounds = self.quality_gate.max_regenerations + 1 if self.quality_gate else 1
+        
+        for regeneration in range(rounds):
+            image_urls = await self._generate_with_slot(client, semaphore, concept, style,
+                                                        manifest, prompt, regeneration, count)
+            candidates, chosen, rejection = [], None, None
+            stage = 'download'
+            try:
+                with self.metrics.span(Stage.SELECT, concept['index'],
+                                       candidates=len(image_urls)) as span:
+                    downloads = await asyncio.gather(*(
+                        asyncio.to_thread(self._download_image, url, concept['index'])
+                        for url in image_urls
+                    ), return_exceptions=True)
+                    candidates = [(url, result[0]) for url, result in zip(image_urls, downloads)
+                                  if not isinstance(result, BaseException)]
+                    if not candidates:
+                        raise downloads[0]
+                    
+                    stage = 'quality check'
+                    analyses = await asyncio.gather(*(
+                        loop.run_in_executor(self._image_executor(), analyze_image, path)
+                        for _, path in candidates
+                    ))
+                    for position in rank_candidates(analyses):
+                        if self.quality_gate:
+                            rejection = self.quality_gate.check(analyses[position], self.season_id,
+                                                                concept['index'])
+                            if rejection:
+                                continue
+                        chosen = position
+                        break
+                    span['chosen'] = chosen
+            except Exception as e:
+                for _, path in candidates:
+                    os.remove(path)
+                print(f"   ❌ Candidate {stage} failed: {e}")
+                manifest.record_failed(concept, prompt, f'{stage} failed: {e}')
+                raise GenerationFailedError(classify_transfer_error(e), f'{stage} failed: {e}') from e
+            
+            for position, (_, path) in enumerate(candidates):
+                if position != chosen:
+                    os.remove(path)
+            if chosen is not None:
+                analysis = analyses[chosen]
+                image_url, path = candidates[chosen]
+                if self.quality_gate:
+                    concept['phash'] = f"{analysis['phash']:016x}"
+                print(f"   🏅 Picked candidate {chosen + 1}/{len(candidates)} "
+                      f"(sharpness {analysis['sharpness']:.3f}, "
+                      f"background {analysis['background']:.2f}): {concept['name']}")
+                local_path, temporary = await asyncio.to_thread(self._keep_candidate, path, cache_key)
+                return image_url, local_path, temporary
+            
+            kind, detail = rejection
+            print(f"   🔍 Quality gate rejected all {len(candidates)} candidates "
+                  f"({kind}: {detail}): {concept['name']}")
+            self.metrics.count_retry(kind, concept['index'])
+        
+        manifest.record_failed(concept, prompt, f'{kind}: {detail}')
+        raise GenerationFailedError(kind, detail, rounds)
+    
+    def _keep_candidate(self, path: str, cache_key: str) -> Tuple[str, bool]:
+        """선택한 후보 임시 파일 → 이미지 캐시로 옮기기 → (경로, 임시 파일 여부)"""
+        
+        if not self.image_cache:
+            return path, True
+        writer = self.image_cache.open_writer(cache_key)
+        try:
+            with open(path, 'rb') as f:
+                for chunk in iter_file_chunks(f):
+                    writer.write(chunk)
+        except Exception:
+            writer.abort()
+            raise
+        finally:
+            os.remove(path)
+        return writer.commit(), False
+    
+    async def _process_card_stages(self, client, semaphore: asyncio.Semaphore,
+                                   concept: Dict, style: str,
+                                   manifest: SeasonManifest,
+                                   cache_slot: int = 0) -> Dict:
+        """카드 1장 파이프라인: 생성 → 다운로드 → 업로드
+        
+        세마포어는 provider 호출만 제한하므로, 업로드가 진행되는 동안
+        다음 카드의 생성 요청이 겹쳐서 실행됩니다.
+        완료/실패 결과는 즉시 매니페스트에 기록되며, 실패 시 GenerationFailedError.
+        """
+        
+        with self.metrics.span(Stage.PROMPT, concept['index']):
+            prompt = self._build_card_prompt(concept, style)
+            cache_key = self._cache_key(concept, prompt, cache_slot)
+        
+        # 카드가 끝날 때까지 캐시 항목 pin (다른 카드의 기록이 사용 중인 경로를 LRU로 지우지 않도록)
+        with (self.image_cache.pinned(cache_key) if self.image_cache else contextlib.nullcontext()):
+            # 캐시 히트: 생성과 다운로드 모두 건너뜀
+            cached_path = None
+            if self.image_cache:
+                with self.metrics.span(Stage.CACHE_LOOKUP, concept['index']) as span:
+                    cached_path = await asyncio.to_thread(self.image_cache.get, cache_key)
+                    span['hit'] = bool(cached_path)
+            
+            local_path, temporary = cached_path, False
+            best_of = 1 if cached_path else self.best_of.get(concept['rarity'], 1)
+            if cached_path:
+                image_url = f'cache:{cache_key}'
+                print(f"   💾 Cache hit: {concept['name']}")
+            elif best_of > 1:
+                # best-of-N: 후보 여러 장 중 로컬 점수로 선택 (품질 검사 포함)
+                image_url, local_path, temporary = await self._generate_best_of(
+                    client, semaphore, concept, style, manifest, prompt, cache_key, best_of
+                )
+            else:
+                image_url, = await self._generate_with_slot(client, semaphore, concept, style,
+                                                            manifest, prompt)
+            
+            # 품질 검사: 업로드 전에 로컬 사본으로 중복 / 빈 이미지 확인 (거부 시 재생성)
+            if self.quality_gate and best_of == 1:
+                image_url, local_path, temporary = await self._pass_quality_gate(
+                    client, semaphore, concept, style, manifest, prompt,
+                    cache_key, image_url, cached_path
+                )
+            
+            # Firebase Storage 스트리밍 업로드 (blocking I/O → 스레드에서 실행)
+            keep_local = bool(self.variant_sizes or self.bundle_thumb_size)
+            transfer = {'local_path': local_path, 'temporary': temporary}
+            try:
+                if local_path:
+                    transfer = dict(transfer, **await asyncio.to_thread(
+                        self._upload_cached_image, local_path, concept['index']
+                    ))
+                else:
+                    transfer = await asyncio.to_thread(
+                        self._transfer_image, image_url, concept['index'], cache_key, keep_local
+                    )
+            
+                # 해상도 / 포맷 변형 (디코딩·인코딩은 프로세스 풀)
+                if self.variant_sizes:
+                    concept['variants'] = await asyncio.to_thread(
+                        self._publish_variants, transfer['local_path'], concept['index'],
+                        transfer['storage_url']
+                    )
+                # 시즌 번들용 썸네일 (번들은 시즌 완료 후 한 번에 업로드)
+                if self.bundle_thumb_size:
+                    await asyncio.to_thread(
+                        self._stage_thumbnail, transfer['local_path'], concept['index']
+                    )
+            except Exception as e:
+                print(f"   ❌ Upload failed: {e}")
+                manifest.record_failed(concept, prompt, f'upload failed: {e}')
+                raise GenerationFailedError(classify_transfer_error(e), f'upload failed: {e}') from e
+            finally:
+                if transfer.get('temporary'):
+                    os.remove(transfer['local_path'])
+            
+            concept['imagePath'] = transfer['storage_url']
+            concept['generatedAt'] = datetime.now().isoformat()
+            manifest.record_done(concept, prompt, image_url,
+                                 transfer['storage_url'], transfer['checksum'])
+            return concept
+    
+    async def generate_full_season_async(self, mode: str, theme: str, style: str,
+                                         custom_names: List[str] = None,
+                                         concurrency: int = DEFAULT_CONCURRENCY,
+                                         resume: bool = False,
+                                         firestore_batch_size: int = DEFAULT_FLUSH_SIZE,
+                                         card_concepts: Optional[List[Dict]] = None,
+                                         client=None,
+                                         semaphore: Optional[asyncio.Semaphore] = None,
+                                         rate_limiter: Optional[TokenBucket] = None) -> Dict:
+        """전체 시즌 카드 생성 (비동기, 동시성 제한)
+        
+        resume=True이면 매니페스트에 완료로 기록된 카드는 건너뜁니다.
+        완료된 카드는 firestore_batch_size개 단위로 바로 Firestore에 커밋됩니다.
+        client/semaphore/rate_limiter를 넘기면 여러 시즌이 같은 SDK 클라이언트와
+        전역 동시성 제한을 공유합니다 (generate_seasons_async).
+        """
+        
+        # 변형 / 번들은 Pillow, 품질 검사 / best-of-N은 NumPy + Pillow 필요 (이미지 생성 전에 확인)
+        if self.variant_sizes or self.bundle_thumb_size:
+            require_pillow()
+        if self.quality_gate or self._selects_best_of:
+            require_numpy()
+        
+        # 1단계: 카드 컨셉 생성 (미리 만든 컨셉 목록이 주어지면 그대로 사용)
+        if card_concepts is None:
+            card_concepts = self.generate_card_concepts(mode, theme, style, custom_names)
+        total = len(card_concepts)
+        manifest = SeasonManifest(self.season_id, self.manifest_dir)
+        self.metrics = RunMetrics(self.season_id, self.router.label, concurrency)
+        
+        print("=" * 60)
+        print("🎴 Weekly Gacha AI Card Generation")
+        print("=" * 60)
+        print(f"📅 Season: {self.season_id}")
+        print(f"🎯 Mode: {mode}")
+        print(f"🎨 Theme: {theme}")
+        print(f"✨ Style: {style}")
+        print(f"📦 Total Cards: {total}")
+        print(f"⚡ Concurrency: {concurrency}")
+        print("=" * 60)
+        
+        # 이전 시즌 해시 로드 (일괄 실행에서는 generate_seasons_async가 미리 로드)
+        if self.quality_gate:
+            loaded = await asyncio.to_thread(self.quality_gate.load_history, {self.season_id})
+            if loaded:
+                print(f"🔍 Quality gate: {loaded} hashes from previous seasons")
+        
+        start_time = time.time()
+        
+        # 차등 게시: 같은 내용의 blob / 문서 필드는 다시 쓰지 않음
+        if self.differential:
+            await asyncio.to_thread(self.load_remote_season)
+        
+        print(f"\n[1/3] 📝 Generated {total} card concepts")
+        self._emit('season_started', mode=mode, theme=theme, style=style, total=total)
+        
+        # 2단계: AI 이미지 생성 (생성/다운로드/업로드 단계 중첩 실행)
+        print(f"\n[2/3] 🎨 Generating AI images ({total} cards)...")
+        print("-" * 60)
+        
+        generated_cards = []
+        failed_cards = []
+        
+        # 완료된 카드를 생성 도중 바로 커밋 (앱에서 즉시 표시)
+        writer = self.create_firestore_writer(flush_size=firestore_batch_size)
+        
+        # 재개 모드: 매니페스트에서 완료된 카드 복원
+        pending_concepts = card_concepts
+        if resume:
+            completed = manifest.completed()
+            pending_concepts = []
+            for concept in card_concepts:
+                entry = completed.get(concept['index'])
+                if entry and entry['concept'].get('name') == concept['name']:
+                    concept['imagePath'] = entry['storage_url']
+                    for field in ('variants', 'generatedAt'):
+                        if entry['concept'].get(field):
+                            concept[field] = entry['concept'][field]
+                    if self.quality_gate and entry['concept'].get('phash'):
+                        concept['phash'] = entry['concept']['phash']
+                        self.quality_gate.remember(int(concept['phash'], 16),
+                                                   self.season_id, concept['index'])
+                    generated_cards.append(concept)
+                    self._write_card(writer, concept)
+                else:
+                    pending_concepts.append(concept)
+            print(f"♻️  Resuming: {len(generated_cards)} cards already done, "
+                  f"{len(pending_concepts)} remaining")
+            self._emit('resumed', done=len(generated_cards), total=total)
+        
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(max(1, concurrency))
+        self.rate_limiter = rate_limiter or TokenBucket(self.rate_limit, capacity=max(1, concurrency))
+        
+        # 다운로드 커넥션 풀 (업로드 스레드 수만큼)
+        self._http(pool_size=max(1, concurrency))
+        
+        cache_slots = self._cache_slots(card_concepts, style)
+        
+        sdk_client = self._open_sdk_client() if client is None else contextlib.nullcontext(client)
+        try:
+            async with sdk_client as client:
+                
+                async def run_card(concept: Dict):
+                    try:
+                        return concept, await self._process_card_async(
+                            client, semaphore, concept, style, manifest,
+                            cache_slots[concept['index']]
+                        ), None
+                    except GenerationFailedError as e:
+                        return concept, None, e.kind
+                    except Exception as e:
+                        print(f"   ❌ Error ({concept['name']}): {e}")
+                        manifest.record_failed(concept, None, str(e))
+                        return concept, None, ErrorKind.TRANSIENT
+                
+                async def run_cards(concepts: List[Dict]) -> List[Dict]:
+                    """카드 묶음 실행 → 실패 카드 목록 반환 (concept, kind)"""
+                    failures = []
+                    tasks = [asyncio.create_task(run_card(concept)) for concept in concepts]
+                    
+                    try:
+                        for task in asyncio.as_completed(tasks):
+                            concept, card, kind = await task
+                            if card:
+                                generated_cards.append(card)
+                                self._write_card(writer, card)
+                                status = '✅'
+                            else:
+                                failures.append((concept, kind))
+                                status = f'⚠️  ({kind})'
+                            
+                            # 진행률 표시
+                            done = len(generated_cards)
+                            progress = done / total * 100
+                            print(f"[{done}/{total}] {status} {concept['name']} - Progress: {progress:.1f}%")
+                            self._emit('card', index=concept['index'], name=concept['name'],
+                                       rarity=concept['rarity'], status='done' if card else 'failed',
+                                       kind=kind, image_url=card.get('imagePath') if card else None,
+                                       done=done, total=total, progress=round(progress, 2))
+                    finally:
+                        # 취소 시 아직 실행 중인 카드도 중단
+                        for task in tasks:
+                            task.cancel()
+                    
+                    return failures
+                
+                failures = await run_cards(pending_concepts)
+                
+                # 최종 재시도: 콘텐츠 거부 / 품질 검사 탈락을 제외한 실패 카드를 커밋 전에 한 번 더 시도
+                sweep = [concept for concept, kind in failures if kind not in FINAL_FAILURE_KINDS]
+                if sweep:
+                    print(f"\n🔁 Retry sweep: {len(sweep)} failed cards")
+                    self._emit('retry_sweep', cards=len(sweep))
+                    failures = [
+                        (concept, kind) for concept, kind in failures if kind in FINAL_FAILURE_KINDS
+                    ] + await run_cards(sweep)
+                
+                failed_cards = [concept for concept, _ in failures]
+        except asyncio.CancelledError:
+            # 취소 (serve 명령의 cancel / 종료): 완료된 카드까지 커밋하고 중단 → resume으로 이어서 생성
+            stats = await asyncio.to_thread(writer.close)
+            print(f"\n🛑 Cancelled: {len(generated_cards)}/{total} cards done, "
+                  f"{stats['committed']} saved to Firestore (rerun with --resume)")
+            self._emit('season_cancelled', done=len(generated_cards), total=total,
+                       saved=stats['committed'])
+            raise
+        
+        # 인덱스 순서로 정렬 (완료 순서 ≠ 카드 순서)
+        generated_cards.sort(key=lambda c: c['index'])
+        
+        # 3단계: 남은 Firestore 쓰기 flush
+        print("\n[3/3] 💾 Flushing remaining Firestore writes...")
+        stats = await asyncio.to_thread(writer.close)
+        print(f"✅ Saved {stats['committed']} cards to Firestore")
+        if stats['failed']:
+            print(f"❌ Failed to save {stats['failed']} cards (rerun with --resume)")
+        
+        # 이번 시즌 해시 저장 (다음 시즌의 중복 비교 대상)
+        if self.quality_gate:
+            hash_path = await asyncio.to_thread(self.quality_gate.save_season, self.season_id)
+            print(f"🔍 Saved perceptual hashes: {hash_path}")
+        
+        # 시즌 번들: 앱이 요청 1~2번으로 시즌 전체 로드
+        bundle = None
+        if self.bundle_thumb_size and generated_cards:
+            bundle = await asyncio.to_thread(self.publish_bundle, generated_cards)
+            if bundle:
+                print(f"📦 Season bundle: {bundle['sprites']}/{bundle['cards']} sprites, "
+                      f"{len(bundle['atlas_urls'])} atlas page(s), {bundle['bytes'] / 1024:.0f} KB")
+        
+        # 발행 수량 shard + 시즌 요약 문서 (앱: 요약 읽기 1번, 뽑기는 shard 1개만 경합)
+        supply = None
+        if generated_cards:
+            supply = await asyncio.to_thread(self.publish_supply, generated_cards,
+                                             firestore_batch_size)
+        
+        elapsed_time = time.time() - start_time
+        self.metrics.finish(len(generated_cards), len(failed_cards))
+        
+        # 로컬 카탈로그 (시즌 간 조회: query 명령)
+        await asyncio.to_thread(self.record_catalog, generated_cards, mode, theme, style)
+        
+        # 결과 요약
+        print("\n" + "=" * 60)
+        print("✅ Generation Complete!")
+        print("=" * 60)
+        print(f"✅ Successful: {len(generated_cards)}/{total}")
+        print(f"❌ Failed: {len(failed_cards)}/{total}")
+        print(f"⏱️  Time: {elapsed_time/60:.1f} minutes")
+        if self.image_cache:
+            print(f"💾 Cache: {self.image_cache.hits} hits, {self.image_cache.misses} misses")
+        if self.quality_gate:
+            rejected = self.quality_gate.rejected
+            print(f"🔍 Quality gate rejections: {rejected[QualityReject.DUPLICATE]} duplicate, "
+                  f"{rejected[QualityReject.LOW_DETAIL]} low detail")
+        print(f"🔗 Season ID: {self.season_id}")
+        print("=" * 60)
+        
+        # 단계별 계측 리포트
+        self.metrics.model_stats = self.router.snapshot()
+        self.metrics.print_summary()
+        report_path = None
+        if self.report_dir:
+            report_path = self.metrics.write_report(self.report_dir)
+            print(f"📊 Run report: {report_path}")
+        if self.prometheus_file:
+            self.metrics.write_prometheus(self.prometheus_file)
+            print(f"📈 Prometheus metrics: {self.prometheus_file}")
+        
+        result = {
+            'success': len(failed_cards) == 0 and stats['failed'] == 0,
+            'generated': len(generated_cards),
+            'saved': stats['committed'],
+            'failed': len(failed_cards),
+            'season_id': self.season_id,
+            'elapsed_time': elapsed_time,
+            'estimated_cost': self.metrics.estimated_cost,
+            'report_path': report_path,
+            'bundle_url': bundle['manifest_url'] if bundle else None,
+            'supply': supply
+        }
+        self._emit('season_finished', result=result)
+        return result
+    
+    def generate_full_season(self, mode: str, theme: str, style: str, 
+                            custom_names: List[str] = None,
+                            concurrency: int = DEFAULT_CONCURRENCY,
+                            resume: bool = False,
+                            firestore_batch_size: int = DEFAULT_FLUSH_SIZE,
+                            card_concepts: Optional[List[Dict]] = None) -> Dict:
+        """전체 시즌 카드 생성 (동기 래퍼)"""
+        
+        return asyncio.run(self.generate_full_season_async(
+            mode, theme, style, custom_names, concurrency, resume,
+            firestore_batch_size, card_concepts
+        ))
+    
+    def for_season(self, season_id: str) -> 'AICardGenerator':
+        """같은 Firebase / 캐시 / HTTP 세션을 공유하는 다른 시즌용 생성기"""
+        
+        generator = copy.copy(self)
+        generator.season_id = season_id
+        generator.metrics = RunMetrics(season_id, self.router.label)
+        return generator
+    
+    async def generate_seasons_async(self, plan: List[Dict],
+                                     concurrency: int = DEFAULT_CONCURRENCY,
+                                     resume: bool = False,
+                                     firestore_batch_size: int = DEFAULT_FLUSH_SIZE) -> List[Dict]:
+        """여러 시즌 일괄 생성 (한 프로세스, 공유 클라이언트)
+        
+        plan: season_plan.load_season_plan() 결과
+        모든 시즌이 SDK 클라이언트, HTTP 커넥션 풀, rate limiter를 공유하고
+        concurrency는 시즌 전체에 걸친 동시 생성 요청 상한입니다.
+        """
+        
+        # Firebase 연결은 시즌 간 공유 (시즌별 생성기 복사 전에 초기화)
+        if self._db is None or self._bucket is None:
+            self._init_firebase()
+        
+        concurrency = max(1, concurrency)
+        semaphore = asyncio.Semaphore(concurrency)
+        rate_limiter = TokenBucket(self.rate_limit, capacity=concurrency)
+        self._http(pool_size=concurrency)
+        if self.variant_sizes or self.quality_gate or self.bundle_thumb_size or self._selects_best_of:
+            self._image_executor()
+        if self._selects_best_of:
+            require_numpy()
+        if self.quality_gate:
+            # 이번 배치 시즌끼리는 생성 중 인덱스로 비교 (저장된 이전 결과는 제외)
+            require_numpy()
+            loaded = self.quality_gate.load_history(exclude=[entry['season_id'] for entry in plan])
+            print(f"🔍 Quality gate: {loaded} hashes from previous seasons")
+        
+        generators = [self.for_season(entry['season_id']) for entry in plan]
+        for generator, entry in zip(generators, plan):
+            if entry.get('cards'):
+                generator.season_size = entry['cards']
+            if entry.get('rarity_weights'):
+                generator.rarity_weights = entry['rarity_weights']
+        if self.prometheus_file and len(plan) > 1:
+            # textfile collector는 디렉토리의 *.prom을 모두 읽으므로 시즌별 파일로 분리
+            root, ext = os.path.splitext(self.prometheus_file)
+            for generator in generators:
+                generator.prometheus_file = f"{root}_{generator.season_id}{ext or '.prom'}"
+        
+        print(f"🗓️  Batch: {len(plan)} seasons, global concurrency {concurrency}")
+        
+        async with self._open_sdk_client() as client:
+            results = await asyncio.gather(*(
+                generator.generate_full_season_async(
+                    entry['mode'], entry['theme'], entry['style'], entry['custom_names'],
+                    concurrency=concurrency, resume=resume,
+                    firestore_batch_size=firestore_batch_size,
+                    client=client, semaphore=semaphore, rate_limiter=rate_limiter
+                )
+                for generator, entry in zip(generators, plan)
+            ), return_exceptions=True)
+        
+        summary = []
+        for entry, result in zip(plan, results):
+            if isinstance(result, Exception):
+                print(f"❌ Season {entry['season_id']} aborted: {result}")
+                result = {'success': False, 'generated': 0, 'saved': 0, 'failed': None,
+                          'season_id': entry['season_id'], 'error': str(result)}
+            summary.append(result)
+        
+        print("\n" + "=" * 60)
+        print("🗓️  Batch Summary")
+        print("=" * 60)
+        for result in summary:
+            status = '✅' if result['success'] else '⚠️ '
+            failed = result['failed'] if result['failed'] is not None else 'aborted'
+            print(f"{status} {result['season_id']}: {result['generated']} generated, "
+                  f"{result['saved']} saved, failed: {failed}")
+        total_cost = sum(result.get('estimated_cost', 0.0) for result in summary)
+        print(f"💰 Est. Cost: ${total_cost:.2f}")
+        print("=" * 60)
+        
+        return summary
+    
+    def generate_seasons(self, plan: List[Dict], concurrency: int = DEFAULT_CONCURRENCY,
+                         resume: bool = False,
+                         firestore_batch_size: int = DEFAULT_FLUSH_SIZE) -> List[Dict]:
+        """여러 시즌 일괄 생성 (동기 래퍼)"""
+        
+        return asyncio.run(self.generate_seasons_async(
+            plan, concurrency, resume, firestore_batch_size
+        ))
+    
+    async def serve_jobs_async(self, board: 'JobBoard', concurrency: int = DEFAULT_CONCURRENCY,
+                               max_jobs: int = DEFAULT_MAX_JOBS,
+                               firestore_batch_size: int = DEFAULT_FLUSH_SIZE,
+                               poll_interval: float = 1.0) -> Dict:
+        """serve 명령: board의 작업을 꺼내 시즌 생성 (board.close() 전까지)
+        
+        Firebase, SDK 클라이언트, HTTP 커넥션 풀, 이미지 프로세스 풀은 한 번만 초기화하고
+        모든 작업이 공유합니다 (작업마다 콜드 스타트 없음).
+        max_jobs개 시즌까지 동시에 실행하고, concurrency는 실행 중인 작업 전체의 생성 요청 상한입니다.
+        진행 이벤트는 progress_callback → board.publish (SSE).
+        """
+        
+        from generation_daemon import JobState
+        if self.variant_sizes or self.bundle_thumb_size:
+            require_pillow()
+        if self.quality_gate or self._selects_best_of:
+            require_numpy()
+        if self._db is None or self._bucket is None:
+            self._init_firebase()
+        
+        concurrency = max(1, concurrency)
+        semaphore = asyncio.Semaphore(concurrency)
+        rate_limiter = TokenBucket(self.rate_limit, capacity=concurrency)
+        self._http(pool_size=concurrency)
+        if self.variant_sizes or self.quality_gate or self.bundle_thumb_size or self._selects_best_of:
+            self._image_executor()
+        
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(max(1, max_jobs))
+        running = set()
+        stats = {JobState.SUCCEEDED: 0, JobState.FAILED: 0, JobState.CANCELLED: 0}
+        
+        def job_generator(job: Dict) -> 'AICardGenerator':
+            generator = self.for_season(job['season_id'])
+            if job.get('cards'):
+                generator.season_size = job['cards']
+            if job.get('rarity_weights'):
+                generator.rarity_weights = job['rarity_weights']
+            if self.prometheus_file and max_jobs > 1:
+                # 동시에 실행되는 시즌끼리 덮어쓰지 않도록 시즌별 파일
+                root, ext = os.path.splitext(self.prometheus_file)
+                generator.prometheus_file = f"{root}_{job['season_id']}{ext or '.prom'}"
+            generator.progress_callback = lambda event: board.publish(job['id'], event)
+            return generator
+        
+        async def run_job(job: Dict, client):
+            try:
+                result = await job_generator(job).generate_full_season_async(
+                    job['mode'], job['theme'], job['style'], job['custom_names'],
+                    concurrency=concurrency, resume=job['resume'],
+                    firestore_batch_size=firestore_batch_size,
+                    client=client, semaphore=semaphore, rate_limiter=rate_limiter
+                )
+                status = JobState.SUCCEEDED if result['success'] else JobState.FAILED
+                board.finished(job['id'], status, result=result)
+            except asyncio.CancelledError:
+                status = JobState.CANCELLED
+                board.finished(job['id'], status)
+            except Exception as e:
+                print(f"❌ Season {job['season_id']} aborted: {e}")
+                status = JobState.FAILED
+                board.finished(job['id'], status, error=str(e))
+            finally:
+                slots.release()
+            stats[status] += 1
+        
+        print(f"🛰️  Daemon ready: concurrency {concurrency}, {max(1, max_jobs)} parallel job(s)")
+        async with self._open_sdk_client() as client:
+            while True:
+                await slots.acquire()
+                job = await asyncio.to_thread(board.next_job, poll_interval)
+                if job is None:
+                    slots.release()
+                    if board.closed:
+                        break
+                    continue
+                task = asyncio.create_task(run_job(job, client))
+                running.add(task)
+                task.add_done_callback(running.discard)
+                board.started(job['id'], lambda task=task: loop.call_soon_threadsafe(task.cancel))
+            
+            # 종료: 실행 중인 작업은 완료된 카드까지 커밋하고 끝남
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+        
+        print(f"🛰️  Daemon stopped: {stats[JobState.SUCCEEDED]} succeeded, "
+              f"{stats[JobState.FAILED]} failed, {stats[JobState.CANCELLED]} cancelled")
+        return stats
+    
+    def serve_jobs(self, board: 'JobBoard', concurrency: int = DEFAULT_CONCURRENCY,
+                   max_jobs: int = DEFAULT_MAX_JOBS,
+                   firestore_batch_size: int = DEFAULT_FLUSH_SIZE) -> Dict:
+        """serve 명령 (동기 래퍼)"""
+        
+        return asyncio.run(self.serve_jobs_async(board, concurrency, max_jobs, firestore_batch_size))
+    
+    def enqueue_season(self, queue: 'JobQueue', card_concepts: List[Dict], style: str) -> int:
+        """시즌 카드 → 작업 큐 (worker가 생성하고, 시즌이 끝나면 한 worker가 커밋) → 추가된 작업 수"""
+        return queue.enqueue(self.season_id, style, card_concepts,
+                             self._cache_slots(card_concepts, style))
+    
+    async def run_worker_async(self, queue: 'JobQueue', worker_id: Optional[str] = None,
+                               concurrency: int = DEFAULT_CONCURRENCY,
+                               lease_seconds: float = DEFAULT_LEASE_SECONDS,
+                               poll_interval: float = 2.0,
+                               firestore_batch_size: int = DEFAULT_FLUSH_SIZE) -> Dict:
+        """작업 큐 worker: lease → 카드 파이프라인 → 완료 기록, 큐가 비면 종료
+        
+        여러 프로세스 / 호스트에서 같은 큐로 실행할 수 있습니다.
+        실행 중인 작업은 lease_seconds / 3마다 heartbeat로 lease를 연장하고,
+        죽은 worker의 작업은 lease가 만료되면 다른 worker가 가져갑니다.
+        Firestore 쓰기는 생성 중에 하지 않고, 시즌 작업이 모두 끝났을 때
+        커밋 권한을 얻은 worker 1개가 큐의 결과로 한 번에 커밋합니다 (번들 포함).
+        """
+        
+        from job_queue import JobStatus
+        worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        if self.variant_sizes or self.bundle_thumb_size:
+            require_pillow()
+        if self.quality_gate or self._selects_best_of:
+            require_numpy()
+        if self._db is None or self._bucket is None:
+            self._init_firebase()
+        
+        concurrency = max(1, concurrency)
+        semaphore = asyncio.Semaphore(concurrency)
+        self.rate_limiter = TokenBucket(self.rate_limit, capacity=concurrency)
+        self._http(pool_size=concurrency)
+        if self.variant_sizes or self.quality_gate or self.bundle_thumb_size or self._selects_best_of:
+            self._image_executor()
+        if self.quality_gate:
+            seasons = await asyncio.to_thread(queue.seasons)
+            loaded = await asyncio.to_thread(
+                self.quality_gate.load_history, [season['season_id'] for season in seasons]
+            )
+            print(f"🔍 Quality gate: {loaded} hashes from previous seasons")
+        
+        generators: Dict[str, AICardGenerator] = {}
+        
+        async def season_generator(season_id: str) -> 'AICardGenerator':
+            if season_id not in generators:
+                generator = self.for_season(season_id)
+                generator.metrics = RunMetrics(season_id, self.router.label, concurrency)
+                if self.differential:
+                    await asyncio.to_thread(generator.load_remote_season)
+                generators[season_id] = generator
+            return generators[season_id]
+        
+        async def run_job(job: Dict):
+            generator = await season_generator(job['season_id'])
+            manifest = SeasonManifest(job['season_id'], self.manifest_dir)
+            try:
+                card = await generator._process_card_async(
+                    client, semaphore, job['concept'], job['style'], manifest, job['cache_slot']
+                )
+                return card, None, None
+            except GenerationFailedError as e:
+                return None, e.kind, str(e)
+            except Exception as e:
+                print(f"   ❌ Error ({job['concept']['name']}): {e}")
+                manifest.record_failed(job['concept'], None, str(e))
+                return None, ErrorKind.TRANSIENT, str(e)
+        
+        async def commit_drained(season_ids) -> None:
+            for season_id in season_ids:
+                if not await asyncio.to_thread(queue.claim_commit, season_id, worker_id):
+                    continue
+                generator = generators.get(season_id) or self.for_season(season_id)
+                print(f"\n💾 {season_id}: queue drained, committing to Firestore")
+                try:
+                    result = await asyncio.to_thread(generator.commit_from_queue, queue,
+                                                     firestore_batch_size)
+                except Exception as e:
+                    print(f"❌ Commit failed ({season_id}): {e}")
+                    result = None
+                if result is None or result['failed']:
+                    # 커밋 권한 반환 (worker를 다시 실행하면 커밋만 재시도)
+                    await asyncio.to_thread(queue.release_commit, season_id)
+                    if result:
+                        print(f"❌ {season_id}: failed to save {result['failed']} cards")
+                    stats['commit_failed'].append(season_id)
+                    continue
+                print(f"✅ {season_id}: saved {result['committed']} cards to Firestore")
+                if result['bundle']:
+                    print(f"📦 Season bundle: {result['bundle']['manifest_url']}")
+                stats['committed'].append(season_id)
+        
+        in_flight: Dict[asyncio.Task, Dict] = {}
+        
+        async def heartbeat():
+            while True:
+                await asyncio.sleep(lease_seconds / 3)
+                keys = [(job['season_id'], job['index']) for job in in_flight.values()]
+                if keys:
+                    await asyncio.to_thread(queue.heartbeat, worker_id, keys, lease_seconds)
+        
+        stats = {'worker_id': worker_id, 'done': 0, 'requeued': 0, 'failed': 0,
+                 'committed': [], 'commit_failed': []}
+        season_counts: Dict[str, Dict[str, int]] = {}
+        print(f"👷 Worker {worker_id}: queue {queue.path}, concurrency {concurrency}")
+        
+        async with self._open_sdk_client() as client:
+            beat = asyncio.create_task(heartbeat())
+            try:
+                while True:
+                    # 업로드와 다음 생성이 겹치도록 동시성의 2배까지 lease
+                    jobs = await asyncio.to_thread(queue.lease, worker_id,
+                                                   2 * concurrency - len(in_flight), lease_seconds)
+                    for job in jobs:
+                        in_flight[asyncio.create_task(run_job(job))] = job
+                    
+                    if not in_flight:
+                        counts = await asyncio.to_thread(queue.counts)
+                        if not counts[JobStatus.PENDING] and not counts[JobStatus.LEASED]:
+                            seasons = await asyncio.to_thread(queue.seasons)
+                            await commit_drained([season['season_id'] for season in seasons
+                                                  if not season['committed_by']])
+                            break
+                        # 다른 worker가 실행 중인 작업만 남음 (죽은 worker의 lease 만료 대기)
+                        await asyncio.sleep(poll_interval)
+                        continue
+                    
+                    done, _ = await asyncio.wait(in_flight, timeout=poll_interval,
+                                                 return_when=asyncio.FIRST_COMPLETED)
+                    finished = set()
+                    for task in done:
+                        job = in_flight.pop(task)
+                        card, kind, error = task.result()
+                        counts = season_counts.setdefault(job['season_id'], {'done': 0, 'failed': 0})
+                        if card:
+                            await asyncio.to_thread(queue.complete, worker_id, job['season_id'],
+                                                    job['index'], card)
+                            stats['done'] += 1
+                            counts['done'] += 1
+                            status = '✅'
+                        else:
+                            status = await asyncio.to_thread(
+                                queue.fail, worker_id, job['season_id'], job['index'],
+                                f'{kind}: {error}', kind in FINAL_FAILURE_KINDS
+                            )
+                            if status == JobStatus.PENDING:
+                                stats['requeued'] += 1
+                            elif status == JobStatus.FAILED:
+                                stats['failed'] += 1
+                                counts['failed'] += 1
+                            status = f'⚠️  ({kind}, {status or "lease lost"})'
+                        finished.add(job['season_id'])
+                        print(f"[{job['season_id']} #{job['index']}] {status} {job['concept']['name']} "
+                              f"(attempt {job['attempts']})")
+                    await commit_drained(finished)
+            finally:
+                beat.cancel()
+        
+        # 이 worker가 처리한 시즌별 계측 리포트
+        for season_id, generator in generators.items():
+            counts = season_counts.get(season_id, {'done': 0, 'failed': 0})
+            generator.metrics.finish(counts['done'], counts['failed'])
+            generator.metrics.model_stats = self.router.snapshot()
+            generator.metrics.print_summary()
+            if self.report_dir:
+                print(f"📊 Run report: {generator.metrics.write_report(self.report_dir)}")
+        
+        print(f"\n👷 Worker {worker_id} finished: {stats['done']} done, "
+              f"{stats['requeued']} requeued, {stats['failed']} failed, "
+              f"committed: {', '.join(stats['committed']) or '-'}")
+        return stats
+    
+    def run_worker(self, queue: 'JobQueue', worker_id: Optional[str] = None,
+                   concurrency: int = DEFAULT_CONCURRENCY,
+                   lease_seconds: float = DEFAULT_LEASE_SECONDS,
+                   poll_interval: float = 2.0,
+                   firestore_batch_size: int = DEFAULT_FLUSH_SIZE) -> Dict:
+        """작업 큐 worker (동기 래퍼)"""
+        
+        return asyncio.run(self.run_worker_async(
+            queue, worker_id, concurrency, lease_seconds, poll_interval, firestore_batch_size
+        ))
+
+def _add_season_options(parser: argparse.ArgumentParser):
+    """시즌 구성 옵션 (모드 / 테마 / 스타일)"""
+    
+    parser.add_argument('--mode', choices=GENERATION_MODES, default=GenerationMode.EVOLUTION,
+                        help='생성 모드 (기본값: evolution)')
+    parser.add_argument('--theme', default='진화하는 몬스터', help='카드 테마')
+    parser.add_argument('--style', choices=CARD_STYLES, default=CardStyle.CUTE,
+                        help='아트 스타일 (기본값: cute)')
+    parser.add_argument('--names', default=None,
+                        help='진화 모드 생명체 이름 20개 (쉼표 구분)')
+    parser.add_argument('--season-id', default=None,
+                        help='시즌 ID (기본값: 현재 주차 기반 2025_S{week}_v1)')
+    parser.add_argument('--cards', type=int, default=DEFAULT_SEASON_SIZE,
+                        help='시즌 카드 수 (기본값: %(default)s, 이벤트는 수천~수만 장 가능)')
+    parser.add_argument('--rarity-spec', default=None,
+                        help='희귀도 분배 (장수 또는 비율, 예: normal=20,rare=20,superRare=20,ultraRare=9,secret=1)')
+
+
+def _add_firebase_options(parser: argparse.ArgumentParser):
+    """Firebase / 매니페스트 옵션"""
+    
+    parser.add_argument('--firebase-key', default=FIREBASE_KEY_PATH,
+                        help=f'Firebase Admin SDK 키 파일 (기본값: {FIREBASE_KEY_PATH})')
+    parser.add_argument('--project', default=None,
+                        help='Firebase 프로젝트 ID (기본값: 키 파일의 project_id)')
+    parser.add_argument('--storage-bucket', default=None,
+                        help=f'Storage 버킷 (기본값: {{project}}{DEFAULT_BUCKET_SUFFIX})')
+    parser.add_argument('--manifest-dir', default=DEFAULT_MANIFEST_DIR,
+                        help='체크포인트 매니페스트 디렉토리')
+    parser.add_argument('--firestore-batch-size', type=int, default=DEFAULT_FLUSH_SIZE,
+                        help=f'Firestore에 커밋할 카드 묶음 크기 (기본값: {DEFAULT_FLUSH_SIZE}, 최대 500)')
+    parser.add_argument('--max-supply', default=None,
+                        help=f'카드당 발행 수량 (전체 또는 희귀도별, 예: normal=62000,secret=8800, '
+                             f'기본값: {DEFAULT_MAX_SUPPLY})')
+    parser.add_argument('--peak-pulls-per-second', type=float, default=DEFAULT_PEAK_PULLS_PER_SECOND,
+                        help='출시 직후 예상 초당 뽑기 수 (카드별 발행 수량 shard 수 계산, 기본값: %(default)s)')
+    parser.add_argument('--no-supply-shards', action='store_true',
+                        help='발행 수량 shard 문서를 쓰지 않음 (시즌 요약 문서만)')
+    parser.add_argument('--migrate-supply', action='store_true',
+                        help='이미 뽑힌 카드의 shard 구성 변경 허용 (발행된 시리얼은 건너뜀, 뽑기를 멈춘 상태에서 실행)')
+    parser.add_argument('--differential', action='store_true',
+                        help='원격 blob 해시 / 카드 문서와 비교해서 바뀐 것만 쓰기 (재실행 시 CDN 캐시 유지)')
+    parser.add_argument('--immutable-assets', action='store_true',
+                        help='카드 이미지 / 변형을 내용 해시 이름 + immutable Cache-Control로 업로드')
+
+
+def _add_variant_options(parser: argparse.ArgumentParser):
+    """이미지 변형 (썸네일 / WebP) 옵션"""
+    
+    parser.add_argument('--variant-sizes', default=','.join(DEFAULT_VARIANT_SIZES),
+                        help='변형 크기 목록 (긴 변 px, original 포함 가능, 기본값: %(default)s)')
+    parser.add_argument('--variant-formats', default=','.join(DEFAULT_VARIANT_FORMATS),
+                        help='변형 포맷 목록 (webp/png/jpeg, 기본값: %(default)s)')
+    parser.add_argument('--variant-workers', type=int, default=None,
+                        help='변형 생성 프로세스 수 (기본값: CPU 코어 수)')
+    parser.add_argument('--no-variants', action='store_true',
+                        help='변형 생성 없이 원본만 업로드')
+
+
+def _add_bundle_options(parser: argparse.ArgumentParser):
+    """시즌 번들 (썸네일 아틀라스 + 매니페스트) 옵션"""
+    
+    parser.add_argument('--bundle-thumb-size', type=int, default=DEFAULT_THUMB_SIZE,
+                        help='번들 아틀라스 썸네일 크기 (px, 기본값: %(default)s)')
+    parser.add_argument('--no-bundle', action='store_true',
+                        help='시즌 번들 생성 안 함')
+
+
+def _add_quality_options(parser: argparse.ArgumentParser):
+    """업로드 전 품질 검사 (중복 / 빈 이미지) 옵션"""
+    
+    parser.add_argument('--hash-dir', default=DEFAULT_HASH_DIR,
+                        help='시즌별 지각 해시 저장 디렉토리 (이전 시즌 비교용)')
+    parser.add_argument('--max-hash-distance', type=int, default=DEFAULT_MAX_DISTANCE,
+                        help='이 해밍 거리 이하(64bit 중)면 중복으로 판정 (기본값: %(default)s)')
+    parser.add_argument('--min-contrast', type=float, default=DEFAULT_MIN_CONTRAST,
+                        help='최소 명암 대비 (0~1, 기본값: %(default)s)')
+    parser.add_argument('--min-detail', type=float, default=DEFAULT_MIN_DETAIL,
+                        help='최소 디테일 점수 (0~1, 기본값: %(default)s)')
+    parser.add_argument('--max-regenerations', type=int, default=DEFAULT_MAX_REGENERATIONS,
+                        help='품질 검사 탈락 시 재생성 횟수 (기본값: %(default)s)')
+    parser.add_argument('--no-quality-gate', action='store_true',
+                        help='업로드 전 품질 검사 사용 안 함')
+
+
+def _add_cache_options(parser: argparse.ArgumentParser):
+    """이미지 캐시 옵션"""
+    
+    parser.add_argument(
+        '--cache-dir', default=DEFAULT_CACHE_DIR,
+        help='프롬프트 → 이미지 캐시 디렉토리'
+    )
+    parser.add_argument(
+        '--cache-max-mb', type=int, default=DEFAULT_CACHE_MAX_BYTES // (1024 * 1024),
+        help='이미지 캐시 최대 용량 (MB, 초과 시 LRU 삭제)'
+    )
+    parser.add_argument(
+        '--no-cache', action='store_true',
+        help='이미지 캐시 사용 안 함'
+    )
+
+
+def _add_catalog_options(parser: argparse.ArgumentParser, recording: bool = True):
+    """로컬 카탈로그 옵션 (recording=True이면 생성 시 기록 끄기 옵션 포함)"""
+    
+    parser.add_argument('--catalog-dir', default=DEFAULT_CATALOG_DIR,
+                        help='로컬 시즌 카탈로그 디렉토리 (query 명령으로 조회)')
+    if recording:
+        parser.add_argument('--no-catalog', action='store_true',
+                            help='완료된 시즌을 로컬 카탈로그에 기록하지 않음')
+
+
+def _add_queue_options(parser: argparse.ArgumentParser):
+    """작업 큐 옵션"""
+    
+    parser.add_argument('--queue', default=DEFAULT_QUEUE_PATH,
+                        help='작업 큐 파일 (SQLite, 여러 호스트가 공유하려면 공유 디렉토리, 기본값: %(default)s)')
+
+
+def _add_run_options(parser: argparse.ArgumentParser):
+    """이미지 생성 실행 옵션"""
+    
+    parser.add_argument(
+        '--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+        help=f'동시 이미지 생성 요청 수 (기본값: {DEFAULT_CONCURRENCY})'
+    )
+    parser.add_argument(
+        '--resume', action='store_true',
+        help='매니페스트에 완료된 카드는 건너뛰고 누락/실패 카드만 재생성'
+    )
+    _add_cache_options(parser)
+    parser.add_argument(
+        '--max-retries', type=int, default=None,
+        help='카드당 최대 재시도 횟수 (기본값: 오류 종류별 정책)'
+    )
+    parser.add_argument(
+        '--best-of', default=None,
+        help='희귀도별 후보 이미지 수 (한 요청에 N장 → 선명도 / 배경 / 중복 점수로 1장 선택, '
+             '예: ultraRare=3,secret=4)'
+    )
+    parser.add_argument(
+        '--model', default=IMAGE_MODEL,
+        help=f'이미지 모델 (희귀도별 지정 가능, 예: {IMAGE_MODEL},secret=gemini-imagen4, '
+             f'기본값: {IMAGE_MODEL})'
+    )
+    parser.add_argument(
+        '--hedge-models', default=None,
+        help='백업 모델 (쉼표 구분). 요청이 관측된 p95를 넘기면 백업 모델로 한 번 더 요청 '
+             '(추가 비용 발생, 기본값: hedge 안 함)'
+    )
+    parser.add_argument(
+        '--min-hedge-delay', type=float, default=MIN_HEDGE_DELAY,
+        help=f'hedge 전 최소 대기 시간 (초, 기본값: {MIN_HEDGE_DELAY})'
+    )
+    parser.add_argument(
+        '--rate-limit', type=float, default=DEFAULT_RATE_LIMIT,
+        help=f'초당 최대 생성 요청 수 (모든 작업자 공유, 기본값: {DEFAULT_RATE_LIMIT})'
+    )
+    parser.add_argument(
+        '--report-dir', default=DEFAULT_REPORT_DIR,
+        help='단계별 계측 리포트(JSON/JSONL) 저장 디렉토리'
+    )
+    parser.add_argument(
+        '--prometheus-file', default=None,
+        help='Prometheus text 형식 메트릭 파일 경로 (선택)'
+    )
+    parser.add_argument(
+        '--plan', default=None,
+        help='다중 시즌 계획 파일 (JSON). 지정하면 계획의 모든 시즌을 일괄 생성'
+    )
+
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    """커맨드라인 옵션 파싱 (하위 명령 없이 실행하면 대화형 모드)"""
+    
+    parser = argparse.ArgumentParser(description='Weekly Gacha AI Card Generator')
+    parser.add_argument('--season-id', default=None,
+                        help='시즌 ID (기본값: 현재 주차 기반 2025_S{week}_v1)')
+    _add_firebase_options(parser)
+    _add_run_options(parser)
+    _add_variant_options(parser)
+    _add_quality_options(parser)
+    _add_bundle_options(parser)
+    _add_catalog_options(parser)
+    
+    commands = parser.add_subparsers(dest='command', metavar='command')
+    
+    concepts = commands.add_parser('concepts', help='카드 컨셉 미리보기 (Firebase 불필요)')
+    _add_season_options(concepts)
+    concepts.add_argument('--json', action='store_true', help='JSON으로 출력')
+    
+    prompts = commands.add_parser('prompts', help='이미지 생성 프롬프트 출력 (Firebase 불필요)')
+    _add_season_options(prompts)
+    prompts.add_argument('--json', action='store_true', help='JSONL로 출력')
+    
+    generate = commands.add_parser('generate', help='이미지 생성 → 업로드 → Firestore 저장 (비대화형)')
+    _add_season_options(generate)
+    _add_firebase_options(generate)
+    _add_run_options(generate)
+    _add_variant_options(generate)
+    _add_quality_options(generate)
+    _add_bundle_options(generate)
+    _add_catalog_options(generate)
+    
+    upload = commands.add_parser('upload', help='로컬 이미지(card_{index}.png) → Storage 업로드')
+    _add_season_options(upload)
+    _add_firebase_options(upload)
+    _add_variant_options(upload)
+    _add_bundle_options(upload)
+    upload.add_argument('--images', required=True, help='카드 이미지 디렉토리')
+    upload.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help='동시 업로드 수')
+    upload.add_argument('--resume', action='store_true', help='매니페스트에 완료된 카드는 건너뛰기')
+    
+    publish = commands.add_parser('publish', help='로컬 결과 ↔ 원격 비교 → 바뀐 blob / 문서 필드만 게시')
+    _add_season_options(publish)
+    _add_firebase_options(publish)
+    _add_cache_options(publish)
+    _add_variant_options(publish)
+    _add_bundle_options(publish)
+    publish.add_argument('--images', default=None,
+                         help='카드 이미지 디렉토리 (card_{index}.png, 없으면 이미지 캐시)')
+    publish.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                         help='동시 업로드 수')
+    publish.add_argument('--dry-run', action='store_true', help='계획만 출력하고 쓰지 않음')
+    
+    simulate = commands.add_parser('simulate', help='뽑기 시뮬레이션 → 품절 시점 / 추천 재고 (Firebase 불필요)')
+    _add_season_options(simulate)
+    simulate.add_argument('--input', default=None,
+                          help='카드 JSON (카드 문서 목록 또는 시즌 번들 매니페스트, rarity / maxSupply 사용)')
+    simulate.add_argument('--max-supply', default=None,
+                          help=f'카드당 발행 수량 (전체 또는 희귀도별, 기본값: {DEFAULT_MAX_SUPPLY})')
+    simulate.add_argument('--pulls', type=int, default=DEFAULT_TOTAL_PULLS,
+                          help='총 뽑기 수 (기본값: %(default)s)')
+    simulate.add_argument('--players', type=int, default=DEFAULT_PLAYERS,
+                          help='플레이어 수 (기본값: %(default)s)')
+    simulate.add_argument('--pulls-per-player', type=float, default=DEFAULT_PULLS_PER_PLAYER,
+                          help='1인당 일일 뽑기 수 (기본값: %(default)s)')
+    simulate.add_argument('--drop-rates', default=None,
+                          help='희귀도 드롭 확률 (기본값: 앱과 동일, 예: normal=0.7,rare=0.2,...)')
+    simulate.add_argument('--target-days', type=float, default=DEFAULT_TARGET_DAYS,
+                          help='추천 재고 기준: 이 기간 동안 품절되지 않는 수량 (기본값: %(default)s)')
+    simulate.add_argument('--steps-per-day', type=int, default=DEFAULT_STEPS_PER_DAY,
+                          help='하루 시뮬레이션 구간 수 (기본값: %(default)s)')
+    simulate.add_argument('--seed', type=int, default=None, help='난수 시드')
+    simulate.add_argument('--json', action='store_true', help='JSON으로 출력')
+    
+    enqueue = commands.add_parser('enqueue', help='시즌 카드 → 작업 큐 (worker가 생성)')
+    _add_season_options(enqueue)
+    _add_queue_options(enqueue)
+    enqueue.add_argument('--retry-failed', action='store_true',
+                         help='실패로 확정된 작업을 다시 대기 상태로')
+    
+    serve = commands.add_parser('serve', help='상주 생성 daemon (로컬 HTTP 작업 API + SSE 진행 이벤트)')
+    _add_firebase_options(serve)
+    _add_run_options(serve)
+    _add_variant_options(serve)
+    _add_quality_options(serve)
+    _add_bundle_options(serve)
+    _add_catalog_options(serve)
+    serve.add_argument('--host', default=DEFAULT_DAEMON_HOST,
+                       help='수신 주소 (기본값: %(default)s, 외부에 열 때는 --token 필요)')
+    serve.add_argument('--port', type=int, default=DEFAULT_DAEMON_PORT, help='수신 포트 (기본값: %(default)s)')
+    serve.add_argument('--max-jobs', type=int, default=DEFAULT_MAX_JOBS,
+                       help='동시에 실행할 시즌 작업 수 (생성 요청 동시성은 --concurrency를 공유, '
+                            '기본값: %(default)s)')
+    serve.add_argument('--token', default=os.environ.get(DAEMON_TOKEN_ENV),
+                       help=f'API Bearer 토큰 (SSE는 ?token=, 기본값: 환경 변수 {DAEMON_TOKEN_ENV})')
+    serve.add_argument('--allow-origin', default=None,
+                       help='CORS 허용 origin (웹 관리 화면에서 직접 호출할 때)')
+    
+    worker = commands.add_parser('worker', help='작업 큐 worker (여러 프로세스 / 호스트에서 실행 가능)')
+    _add_queue_options(worker)
+    _add_firebase_options(worker)
+    _add_run_options(worker)
+    _add_variant_options(worker)
+    _add_quality_options(worker)
+    _add_bundle_options(worker)
+    worker.add_argument('--worker-id', default=None,
+                        help='worker 이름 (기본값: 호스트명:PID)')
+    worker.add_argument('--lease-seconds', type=float, default=DEFAULT_LEASE_SECONDS,
+                        help='작업 lease 시간 (초, 실행 중에는 자동 연장, 기본값: %(default)s)')
+    worker.add_argument('--max-attempts', type=int, default=DEFAULT_MAX_ATTEMPTS,
+                        help='작업당 최대 시도 횟수 (worker 종료 포함, 기본값: %(default)s)')
+    worker.add_argument('--poll-interval', type=float, default=2.0,
+                        help='다른 worker의 작업만 남았을 때 확인 간격 (초, 기본값: %(default)s)')
+    
+    queue = commands.add_parser('queue', help='작업 큐 상태 출력')
+    _add_queue_options(queue)
+    queue.add_argument('--json', action='store_true', help='JSON으로 출력')
+    
+    plan = commands.add_parser('plan', help='이전 실행 리포트로 소요 시간 / 비용 예측 (네트워크 불필요)')
+    _add_season_options(plan)
+    _add_run_options(plan)
+    _add_variant_options(plan)
+    plan.add_argument('--history-runs', type=int, default=DEFAULT_HISTORY_RUNS,
+                      help='예측에 쓸 최근 리포트 수 (기본값: %(default)s)')
+    plan.add_argument('--trials', type=int, default=DEFAULT_TRIALS,
+                      help='시뮬레이션 반복 횟수 (기본값: %(default)s)')
+    plan.add_argument('--seed', type=int, default=None, help='난수 시드')
+    plan.add_argument('--json', action='store_true', help='JSON으로 출력')
+    
+    export = commands.add_parser('export', help='게시된 시즌 (blob + Firestore 문서) → 로컬 아카이브')
+    _add_firebase_options(export)
+    export.add_argument('--season-id', required=True, help='시즌 ID')
+    export.add_argument('--output', default=None,
+                        help=f'아카이브 경로 (기본값: {DEFAULT_ARCHIVE_DIR}/{{season_id}}.season.zip)')
+    export.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help='동시 다운로드 수')
+    
+    restore = commands.add_parser('import', help='아카이브 → 다른 프로젝트 / 버킷에 복원 (재실행하면 이어서)')
+    _add_firebase_options(restore)
+    restore.add_argument('archive', help='export로 만든 아카이브')
+    restore.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                         help='동시 업로드 수')
+    restore.add_argument('--dry-run', action='store_true', help='계획만 출력하고 쓰지 않음')
+    
+    index = commands.add_parser('index', help='Firestore 시즌 → 로컬 카탈로그 (색인되지 않은 시즌만 읽음)')
+    _add_firebase_options(index)
+    _add_catalog_options(index, recording=False)
+    index.add_argument('--season-id', default=None,
+                       help='동기화할 시즌 ID (쉼표 구분, 기본값: seasons 컬렉션 전체)')
+    index.add_argument('--refresh', action='store_true', help='이미 색인된 시즌도 다시 읽기')
+    index.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                       help='동시에 읽을 시즌 수')
+    
+    query = commands.add_parser('query', help='로컬 카탈로그 조회 (Firebase / 네트워크 불필요)')
+    _add_catalog_options(query, recording=False)
+    for column in GROUP_COLUMNS:
+        if column != 'source':
+            query.add_argument(f"--{column.replace('_', '-')}", dest=f'where_{column}', default=None,
+                               help=f'{column} 필터 (쉼표 구분)')
+    query.add_argument('--name', default=None, help='카드 이름에 포함된 문자열')
+    query.add_argument('--group-by', default=None,
+                       help=f"카드 / 시즌 수 / 비용 집계 기준 (쉼표 구분: {', '.join(GROUP_COLUMNS)})")
+    query.add_argument('--similar', default=None,
+                       help='이 프롬프트와 비슷한 이전 카드 (단어 집합 유사도)')
+    query.add_argument('--columns', default=','.join(DEFAULT_QUERY_COLUMNS),
+                       help=f"출력 열 (쉼표 구분: {', '.join(COLUMNS)})")
+    query.add_argument('--limit', type=int, default=20, help='최대 행 수 (기본값: %(default)s)')
+    query.add_argument('--json', action='store_true', help='JSON으로 출력')
+    
+    commit = commands.add_parser('commit', help='매니페스트의 완료 카드 → Firestore 저장')
+    _add_firebase_options(commit)
+    _add_bundle_options(commit)
+    commit.add_argument('--season-id', required=True, help='시즌 ID')
+    
+    # 하위 명령에 다시 등록한 공통 옵션은 기본값을 생략 → 하위 명령 앞에 준 값(--concurrency 4 generate)이 유지됨
+    shared = {action.dest for action in parser._actions}
+    for subparser in commands.choices.values():
+        for action in subparser._actions:
+            if action.dest in shared and action.dest != 'help':
+                if action.help:
+                    action.help = action.help.replace('%(default)s', str(action.default))
+                action.default = argparse.SUPPRESS
+    
+    return parser.parse_args(argv)
+
+
+def build_generator(args: argparse.Namespace) -> AICardGenerator:
+    """커맨드라인 옵션으로 AI 생성기 생성 (Firebase는 처음 필요할 때 초기화)"""
+    
+    image_cache = None
+    if hasattr(args, 'cache_dir') and not args.no_cache:
+        image_cache = ImageCache(args.cache_dir, args.cache_max_mb * 1024 * 1024)
+    
+    variant_sizes, variant_formats = None, DEFAULT_VARIANT_FORMATS
+    if hasattr(args, 'variant_sizes') and not args.no_variants:
+        variant_sizes = parse_variant_sizes(args.variant_sizes)
+        variant_formats = parse_variant_formats(args.variant_formats)
+    
+    quality_gate = None
+    if hasattr(args, 'hash_dir') and not args.no_quality_gate:
+        quality_gate = QualityGate(args.hash_dir, args.max_hash_distance, args.min_contrast,
+                                   args.min_detail, args.max_regenerations)
+    
+    bundle_thumb_size = None
+    if hasattr(args, 'bundle_thumb_size') and not args.no_bundle:
+        bundle_thumb_size = args.bundle_thumb_size
+    
+    max_retries = getattr(args, 'max_retries', None)
+    return AICardGenerator(
+        firebase_key_path=args.firebase_key,
+        season_id=args.season_id,
+        season_size=getattr(args, 'cards', DEFAULT_SEASON_SIZE),
+        rarity_weights=_rarity_weights(args),
+        max_supply=_max_supply(args),
+        manifest_dir=args.manifest_dir,
+        image_cache=image_cache,
+        retry_policy=RetryPolicy.with_max_retries(max_retries) if max_retries is not None else None,
+        rate_limit=getattr(args, 'rate_limit', DEFAULT_RATE_LIMIT),
+        report_dir=getattr(args, 'report_dir', DEFAULT_REPORT_DIR),
+        prometheus_file=getattr(args, 'prometheus_file', None),
+        variant_sizes=variant_sizes,
+        variant_formats=variant_formats,
+        variant_workers=getattr(args, 'variant_workers', None),
+        quality_gate=quality_gate,
+        bundle_thumb_size=bundle_thumb_size,
+        differential=getattr(args, 'differential', False),
+        immutable_assets=getattr(args, 'immutable_assets', False),
+        best_of=parse_best_of_spec(args.best_of) if getattr(args, 'best_of', None) else None,
+        router=_model_router(args),
+        supply_shards=not getattr(args, 'no_supply_shards', False),
+        peak_pulls_per_second=getattr(args, 'peak_pulls_per_second', DEFAULT_PEAK_PULLS_PER_SECOND),
+        migrate_supply=getattr(args, 'migrate_supply', False),
+        project_id=getattr(args, 'project', None),
+        storage_bucket=getattr(args, 'storage_bucket', None),
+        catalog_dir=None if getattr(args, 'no_catalog', False) else getattr(args, 'catalog_dir',
+                                                                            DEFAULT_CATALOG_DIR)
+    )
+
+
+def _model_router(args: argparse.Namespace) -> ModelRouter:
+    """--model / --hedge-models 옵션 → 모델 라우터"""
+    backups = [model.strip() for model in (getattr(args, 'hedge_models', None) or '').split(',')
+               if model.strip()]
+    return ModelRouter(parse_model_spec(getattr(args, 'model', IMAGE_MODEL)), backups,
+                       min_hedge_delay=getattr(args, 'min_hedge_delay', MIN_HEDGE_DELAY))
+
+
+def _rarity_weights(args: argparse.Namespace) -> Sequence:
+    """--rarity-spec 옵션 → 희귀도 가중치 (없으면 기본 분배)"""
+    if getattr(args, 'rarity_spec', None):
+        return parse_rarity_spec(args.rarity_spec)
+    return DEFAULT_RARITY_WEIGHTS
+
+
+def _max_supply(args: argparse.Namespace) -> Optional[Dict[str, int]]:
+    """--max-supply 옵션 → 희귀도별 카드당 발행 수량"""
+    if getattr(args, 'max_supply', None):
+        return parse_supply_spec(args.max_supply)
+    return None
+
+
+def _preview_generator(args: argparse.Namespace) -> AICardGenerator:
+    """컨셉 / 프롬프트 미리보기용 생성기 (캐시, 품질 검사 등 없이)"""
+    return AICardGenerator(season_id=args.season_id, season_size=args.cards,
+                           rarity_weights=_rarity_weights(args))
+
+
+def _custom_names(args: argparse.Namespace) -> Optional[List[str]]:
+    """--names 옵션 → 생명체 이름 목록"""
+    return [name.strip() for name in args.names.split(',')] if args.names else None
+
+
+def _season_concepts(generator: AICardGenerator, args: argparse.Namespace) -> List[Dict]:
+    """옵션의 모드 / 테마 / 스타일로 카드 컨셉 생성"""
+    return generator.generate_card_concepts(args.mode, args.theme, args.style, _custom_names(args))
+
+
+def run_concepts(args: argparse.Namespace) -> int:
+    """카드 컨셉 출력"""
+    
+    concepts = _season_concepts(_preview_generator(args), args)
+    if args.json:
+        print(json.dumps(concepts, ensure_ascii=False, indent=2))
+        return 0
+    
+    for concept in concepts:
+        print(f"{concept['index']:>4}  {concept['rarity']:<11} {concept['name']}")
+    print(f"📦 {len(concepts)} cards ({args.mode}, {args.theme}, {args.style})")
+    return 0
+
+
+def run_prompts(args: argparse.Namespace) -> int:
+    """카드별 이미지 생성 프롬프트 출력"""
+    
+    generator = _preview_generator(args)
+    for concept in _season_concepts(generator, args):
+        prompt = generator._build_card_prompt(concept, args.style)
+        if args.json:
+            print(json.dumps({'index': concept['index'], 'name': concept['name'],
+                              'rarity': concept['rarity'], 'prompt': prompt},
+                             ensure_ascii=False))
+        else:
+            print(f"[{concept['index']}] {concept['name']} ({concept['rarity']})")
+            print(f"    {prompt}")
+    return 0
+
+
+def run_generate(args: argparse.Namespace) -> int:
+    """시즌 생성 (비대화형)"""
+    
+    if args.plan:
+        return run_batch(args)
+    
+    generator = build_generator(args)
+    result = generator.generate_full_season(
+        mode=args.mode,
+        theme=args.theme,
+        style=args.style,
+        custom_names=_custom_names(args),
+        concurrency=args.concurrency,
+        resume=args.resume,
+        firestore_batch_size=args.firestore_batch_size
+    )
+    return 0 if result['success'] else 1
+
+
+def run_upload(args: argparse.Namespace) -> int:
+    """로컬 이미지 업로드 (Firestore 저장은 commit 명령)"""
+    
+    generator = build_generator(args)
+    concepts = _season_concepts(generator, args)
+    stats = generator.upload_local_images(concepts, args.style, args.images,
+                                          concurrency=args.concurrency, resume=args.resume)
+    print(f"✅ Uploaded {stats['uploaded']} images to seasons/{generator.season_id}/cards "
+          f"(skipped {stats['skipped']}, missing {stats['missing']}, failed {stats['failed']})")
+    print(f"💾 Next: generate_cards_with_ai.py commit --season-id {generator.season_id}")
+    return 0 if not stats['failed'] and not stats['missing'] else 1
+
+
+def run_commit(args: argparse.Namespace) -> int:
+    """매니페스트 → Firestore 저장"""
+    
+    generator = build_generator(args)
+    stats = generator.commit_from_manifest(flush_size=args.firestore_batch_size)
+    print(f"✅ Saved {stats['committed']} cards to Firestore (seasons/{generator.season_id}/cards)")
+    if stats['failed']:
+        print(f"❌ Failed to save {stats['failed']} cards")
+    if stats['bundle']:
+        print(f"📦 Season bundle: {stats['bundle']['manifest_url']}")
+    return 0 if not stats['failed'] else 1
+
+
+def run_publish(args: argparse.Namespace) -> int:
+    """차등 게시 (계획 출력 후 적용, --dry-run이면 계획만)"""
+    
+    generator = build_generator(args)
+    concepts = _season_concepts(generator, args)
+    stats = generator.publish_season(concepts, args.style, args.images,
+                                     concurrency=args.concurrency,
+                                     flush_size=args.firestore_batch_size,
+                                     dry_run=args.dry_run)
+    if args.dry_run:
+        print("💡 Dry run: nothing written")
+        return 0
+    
+    print(f"✅ Published {generator.season_id}: {stats['uploaded']} uploads, "
+          f"{stats['written']} document writes "
+          f"(unchanged: {stats['unchanged_blobs']} blobs, {stats['unchanged_docs']} documents)")
+    if stats['upload_failed'] or stats['write_failed']:
+        print(f"❌ Failed: {stats['upload_failed']} cards (upload), "
+              f"{stats['write_failed']} documents (rerun publish to retry)")
+    if stats['bundle']:
+        print(f"📦 Season bundle: {stats['bundle']['manifest_url']}")
+    return 0 if not stats['upload_failed'] and not stats['write_failed'] else 1
+
+
+def run_export(args: argparse.Namespace) -> int:
+    """게시된 시즌 → 로컬 아카이브"""
+    
+    from season_archive import archive_path
+    generator = build_generator(args)
+    stats = generator.export_season(args.output or archive_path(generator.season_id),
+                                    concurrency=args.concurrency)
+    print(f"   {stats['blobs']} blobs ({stats['blob_bytes'] / 1024 / 1024:.1f} MB), "
+          f"{stats['documents']} documents")
+    return 0
+
+
+def run_import(args: argparse.Namespace) -> int:
+    """아카이브 → 대상 프로젝트 / 버킷 (--dry-run이면 계획만)"""
+    
+    from season_archive import SeasonArchiveReader
+    with SeasonArchiveReader(args.archive) as archive:
+        args.season_id = archive.season_id
+        generator = build_generator(args)
+        stats = generator.import_season(archive, concurrency=args.concurrency,
+                                        flush_size=args.firestore_batch_size,
+                                        dry_run=args.dry_run)
+    if args.dry_run:
+        print("💡 Dry run: nothing written")
+        return 0
+    
+    print(f"✅ Imported {generator.season_id} into {generator.bucket.name}: "
+          f"{stats['uploaded']} uploads, {stats['written']} document writes "
+          f"(unchanged: {stats['unchanged_blobs']} blobs, {stats['unchanged_docs']} documents)")
+    if stats['upload_failed'] or stats['write_failed']:
+        print(f"❌ Failed: {stats['upload_failed']} uploads, {stats['write_failed']} documents "
+              f"(rerun import to resume)")
+        return 1
+    if stats['refused']:
+        print(f"❌ Supply layout kept for {len(stats['refused'])} cards already pulled in the target "
+              f"({', '.join(stats['refused'][:5])}, rerun with --migrate-supply)")
+        return 1
+    if stats['mismatched']:
+        print(f"❌ Verification failed: {len(stats['mismatched'])} mismatched "
+              f"({', '.join(stats['mismatched'][:5])})")
+        return 1
+    print(f"🔍 Verified {stats['verified_blobs']} blobs, {stats['verified_docs']} documents")
+    return 0
+
+
+def _split(value: Optional[str]) -> List[str]:
+    """쉼표 구분 옵션 → 목록"""
+    return [item.strip() for item in (value or '').split(',') if item.strip()]
+
+
+def run_index(args: argparse.Namespace) -> int:
+    """Firestore 시즌 → 로컬 카탈로그 (증분)"""
+    
+    generator = build_generator(args)
+    stats = generator.sync_catalog(_split(args.season_id) or None, refresh=args.refresh,
+                                   concurrency=args.concurrency)
+    print(f"✅ Catalog: {stats['fetched']} seasons ({stats['cards']} cards) added, "
+          f"{stats['empty']} empty, {stats['failed']} failed → {args.catalog_dir}")
+    return 0 if not stats['failed'] else 1
+
+
+def _format_cell(value) -> str:
+    """카탈로그 값 → 표 칸 (빈 값 / NaN은 '-')"""
+    if value is None or value == '':
+        return '-'
+    if isinstance(value, float):
+        return '-' if value != value else f'{value:.3f}'
+    text = str(value)
+    return text if len(text) <= 60 else text[:57] + '...'
+
+
+def run_query(args: argparse.Namespace) -> int:
+    """로컬 카탈로그 조회 (필터 / 집계 / 유사 프롬프트)"""
+    
+    from season_catalog import SeasonCatalog
+    catalog = SeasonCatalog(args.catalog_dir)
+    where = {column: _split(getattr(args, f'where_{column}'))
+             for column in GROUP_COLUMNS if _split(getattr(args, f'where_{column}', None))}
+    columns = _split(args.columns)
+    
+    if args.group_by:
+        rows = catalog.group(_split(args.group_by), where, args.name)
+        columns = _split(args.group_by) + ['cards', 'seasons', 'cost']
+    elif args.similar:
+        rows = catalog.similar(args.similar, where, columns, limit=args.limit)
+        columns = columns + ['similarity']
+    else:
+        rows = catalog.query(where, args.name, columns, limit=args.limit)
+    
+    if args.json:
+        rows = [{key: None if isinstance(value, float) and value != value else value
+                 for key, value in row.items()} for row in rows]
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+        return 0
+    
+    summary = catalog.summary()
+    print(f"🗂️  Catalog: {summary['seasons']} seasons, {summary['cards']} cards ({args.catalog_dir})")
+    if not rows:
+        print("   (no matching cards)")
+        return 0
+    cells = [[_format_cell(row.get(column)) for column in columns] for row in rows]
+    widths = [max(len(column), *(len(row[i]) for row in cells)) for i, column in enumerate(columns)]
+    print('   ' + '  '.join(column.ljust(width) for column, width in zip(columns, widths)))
+    for row in cells:
+        print('   ' + '  '.join(cell.ljust(width) for cell, width in zip(row, widths)))
+    return 0
+
+
+def _simulation_cards(args: argparse.Namespace) -> Tuple[List[str], List[int]]:
+    """시뮬레이션할 카드 → (희귀도 목록, 재고 목록)
+
+    --input이 있으면 JSON의 rarity / maxSupply, 없으면 시즌 옵션의 컨셉 + --max-supply
+    """
+    
+    max_supply = _max_supply(args) or {}
+    if args.input:
+        try:
+            with open(args.input, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise SimulationError(f"cannot read cards from {args.input}: {e}") from e
+        cards = data.get('cards', []) if isinstance(data, dict) else data
+        try:
+            rarities = [card['rarity'] for card in cards]
+            supplies = [int(card.get('maxSupply') or max_supply.get(card['rarity'], DEFAULT_MAX_SUPPLY))
+                        for card in cards]
+        except (KeyError, TypeError, ValueError) as e:
+            raise SimulationError(f"invalid card in {args.input}: {e}") from e
+    else:
+        rarities = [concept['rarity'] for concept in _season_concepts(_preview_generator(args), args)]
+        supplies = [max_supply.get(rarity, DEFAULT_MAX_SUPPLY) for rarity in rarities]
+    if not rarities:
+        raise SimulationError("no cards to simulate")
+    return rarities, supplies
+
+
+def run_simulate(args: argparse.Namespace) -> int:
+    """뽑기 시뮬레이션 → 희귀도별 품절 시점 / 남은 재고 곡선 / 추천 재고"""
+    
+    from gacha_simulator import simulate_pulls, suggest_supply, summarize, DEFAULT_DROP_RATES
+    rarities, supplies = _simulation_cards(args)
+    drop_rates = parse_rarity_spec(args.drop_rates) if args.drop_rates else DEFAULT_DROP_RATES
+    
+    started = time.perf_counter()
+    result = simulate_pulls(rarities, supplies, drop_rates, args.pulls, args.players,
+                            args.pulls_per_player, args.seed, args.steps_per_day)
+    elapsed = time.perf_counter() - started
+    
+    rows = summarize(result, rarities, supplies)
+    card_counts = {row['rarity']: row['cards'] for row in rows}
+    suggestion = suggest_supply(card_counts, drop_rates, result['daily_pulls'], args.target_days)
+    suggestion_spec = ','.join(f'{rarity}={value}' for rarity, value in suggestion.items())
+    
+    if args.json:
+        print(json.dumps({
+            'pulls': result['pulls'],
+            'days': result['days'],
+            'daily_pulls': result['daily_pulls'],
+            'rarities': rows,
+            'curve': result['curve'],
+            'suggested_max_supply': suggestion,
+        }, ensure_ascii=False, indent=2))
+        return 0
+    
+    def day(value):
+        return f'{value:.2f}d' if value is not None else '-'
+    
+    print(f"🎰 {result['pulls']:,} pulls over {result['days']:.1f} days "
+          f"({result['daily_pulls']:,.0f}/day, {len(rarities)} cards, {elapsed:.2f}s)")
+    print(f"   {'rarity':<11}{'cards':>7}{'supply':>12}{'sold':>12}{'first out':>11}"
+          f"{'all out':>10}{'empty pulls':>13}")
+    for row in rows:
+        print(f"   {row['rarity']:<11}{row['cards']:>7,}{row['total_supply']:>12,}{row['sold']:>12,}"
+              f"{day(row['first_sellout_day']):>11}{day(row['all_sold_out_day']):>10}"
+              f"{row['empty_pulls']:>13,}")
+    
+    print("\n📉 Remaining supply (%)")
+    print(f"   {'day':>6}" + ''.join(f"{row['rarity']:>11}" for row in rows))
+    curve = result['curve']
+    exhausted = [i for i, point in enumerate(curve) if not any(point['remaining'].values())]
+    if exhausted:
+        curve = curve[:exhausted[0] + 1]  # 전체 품절 이후는 생략
+    step = max(1, -(-len(curve) // 14))  # 최대 14줄
+    points = curve[step - 1::step]
+    if points[-1] is not curve[-1]:
+        points.append(curve[-1])
+    for point in points:
+        print(f"   {point['day']:>6.1f}" + ''.join(
+            f"{100 * point['remaining'][row['rarity']] / max(row['total_supply'], 1):>10.1f}%"
+            for row in rows))
+    
+    print(f"\n💡 Suggested supply per card ({args.target_days:g} days without sell-out):")
+    print(f"   --max-supply {suggestion_spec}")
+    return 0
+
+
+def _predict_run(args: argparse.Namespace, trials: int = DEFAULT_TRIALS,
+                 seed: Optional[int] = None) -> Dict:
+    """옵션의 시즌 크기 / 모델 / 동시성 / 재시도 / hedge / 변형 설정으로 실행 예측"""
+    
+    from run_planner import RunHistory, predict
+    season_size = getattr(args, 'cards', DEFAULT_SEASON_SIZE)
+    counts = allocate_counts(season_size, _rarity_weights(args))
+    router = _model_router(args)
+    best_of = parse_best_of_spec(args.best_of) if getattr(args, 'best_of', None) else {}
+    rarities = [rarity for rarity, count in zip(RARITY_ORDER, counts) for _ in range(count)]
+    
+    history = RunHistory.load(getattr(args, 'report_dir', None) or DEFAULT_REPORT_DIR,
+                              getattr(args, 'history_runs', DEFAULT_HISTORY_RUNS))
+    max_retries = getattr(args, 'max_retries', None)
+    return predict(
+        history,
+        card_models=[router.primary(rarity) for rarity in rarities],
+        card_images=[best_of.get(rarity, 1) for rarity in rarities],
+        concurrency=args.concurrency,
+        rate_limit=args.rate_limit,
+        policy=RetryPolicy.with_max_retries(max_retries) if max_retries is not None else None,
+        backups=router.backups,
+        min_hedge_delay=router.min_hedge_delay,
+        variants=not getattr(args, 'no_variants', False),
+        trials=trials,
+        seed=seed
+    )
+
+
+def run_plan(args: argparse.Namespace) -> int:
+    """이전 실행 기록으로 시즌 소요 시간 / 비용 예측 (dry run)"""
+    
+    from run_planner import format_duration
+    prediction = _predict_run(args, args.trials, args.seed)
+    if args.json:
+        print(json.dumps(prediction, ensure_ascii=False, indent=2))
+        return 0
+    
+    wall, cost = prediction['wall_clock'], prediction['cost']
+    print(f"🔮 Plan: {prediction['cards']} cards, concurrency {args.concurrency}, "
+          f"rate limit {args.rate_limit:g}/s ({prediction['trials']} trials, "
+          f"history: {prediction['history_runs']} runs)")
+    print(f"   {'model':<18}{'samples':>9}{'p50':>9}{'p95':>9}{'errors':>9}")
+    for model, stats in prediction['models'].items():
+        source = ' (prior)' if stats['prior'] else ''
+        print(f"   {model:<18}{stats['samples']:>9}{stats['p50']:>8.1f}s{stats['p95']:>8.1f}s"
+              f"{stats['error_rate'] * 100:>8.1f}%{source}")
+    print(f"⏱️  Wall clock: p50 {format_duration(wall['p50'])}, p90 {format_duration(wall['p90'])}, "
+          f"p99 {format_duration(wall['p99'])}")
+    print(f"💰 Cost: p50 ${cost['p50']:.2f}, p90 ${cost['p90']:.2f}, max ${cost['max']:.2f}")
+    print(f"📡 Provider calls: p50 {prediction['calls']['p50']:.0f}, "
+          f"hedges p50 {prediction['hedges']['p50']:.0f}, "
+          f"failed cards p50 {prediction['failed']['p50']:.0f}")
+    if any(stats['prior'] for stats in prediction['models'].values()):
+        print("ℹ️  Models without history use prior estimates (run once with --report-dir to calibrate)")
+    return 0
+
+
+def run_enqueue(args: argparse.Namespace) -> int:
+    """시즌 카드를 작업 큐에 추가 (Firebase / GenSpark 불필요)"""
+    
+    from job_queue import JobQueue, JobStatus
+    generator = _preview_generator(args)
+    queue = JobQueue(args.queue)
+    concepts = _season_concepts(generator, args)
+    added = generator.enqueue_season(queue, concepts, args.style)
+    if args.retry_failed:
+        print(f"🔁 Requeued {queue.retry_failed(generator.season_id)} failed jobs")
+    counts = queue.counts(generator.season_id)
+    print(f"📥 {generator.season_id}: {added} jobs added ({len(concepts) - added} already queued), "
+          f"{counts[JobStatus.PENDING]} pending, {counts[JobStatus.DONE]} done, "
+          f"{counts[JobStatus.FAILED]} failed")
+    print(f"👷 Next: generate_cards_with_ai.py worker --queue {args.queue} (any number of hosts)")
+    return 0
+
+
+def run_worker(args: argparse.Namespace) -> int:
+    """작업 큐 worker (큐가 비면 종료)"""
+    
+    from job_queue import JobQueue
+    generator = build_generator(args)
+    queue = JobQueue(args.queue, max_attempts=args.max_attempts)
+    stats = generator.run_worker(queue, args.worker_id, concurrency=args.concurrency,
+                                 lease_seconds=args.lease_seconds,
+                                 poll_interval=args.poll_interval,
+                                 firestore_batch_size=args.firestore_batch_size)
+    return 0 if not stats['failed'] and not stats['commit_failed'] else 1
+
+
+def run_serve(args: argparse.Namespace) -> int:
+    """상주 생성 daemon (SIGINT / SIGTERM → 새 작업 거부, 실행 중 작업은 완료 카드 커밋 후 종료)"""
+    
+    from generation_daemon import JobBoard, JobState, DaemonServer
+    if args.host not in ('127.0.0.1', 'localhost', '::1') and not args.token:
+        print(f"❌ --token (or {DAEMON_TOKEN_ENV}) is required when listening on {args.host}")
+        return 2
+    
+    generator = build_generator(args)
+    board = JobBoard(GENERATION_MODES, CARD_STYLES, resume=args.resume)
+    try:
+        server = DaemonServer(board, args.host, args.port, args.token, args.allow_origin)
+    except OSError as e:
+        print(f"❌ Cannot listen on {args.host}:{args.port}: {e}")
+        return 1
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: board.close())
+    
+    server.start()
+    print(f"🛰️  Job API: {server.url}  (POST /jobs, GET /jobs/{{id}}, GET /events)")
+    try:
+        stats = generator.serve_jobs(board, concurrency=args.concurrency, max_jobs=args.max_jobs,
+                                     firestore_batch_size=args.firestore_batch_size)
+    finally:
+        server.shutdown()
+        server.server_close()
+    return 0 if not stats[JobState.FAILED] else 1
+
+
+def run_queue(args: argparse.Namespace) -> int:
+    """작업 큐 시즌별 상태 출력"""
+    
+    from job_queue import JobQueue, JobStatus
+    seasons = JobQueue(args.queue).seasons()
+    if args.json:
+        print(json.dumps(seasons, ensure_ascii=False, indent=2))
+        return 0
+    
+    for season in seasons:
+        jobs = season['jobs']
+        committed = f"committed by {season['committed_by']}" if season['committed_by'] else 'not committed'
+        print(f"{season['season_id']:<20} {jobs[JobStatus.PENDING]:>6} pending "
+              f"{jobs[JobStatus.LEASED]:>6} leased {jobs[JobStatus.DONE]:>6} done "
+              f"{jobs[JobStatus.FAILED]:>6} failed  ({committed})")
+    if not seasons:
+        print(f"📭 Queue is empty: {args.queue}")
+    return 0
+
+
+def run_batch(args: argparse.Namespace) -> int:
+    """계획 파일의 시즌을 대화형 입력 없이 일괄 생성 → 종료 코드"""
+    
+    try:
+        plan = load_season_plan(args.plan, GENERATION_MODES, CARD_STYLES)
+    except (OSError, SeasonPlanError) as e:
+        print(f"❌ Invalid season plan: {e}")
+        return 2
+    
+    print("\n🎴 Weekly Gacha AI Card Generator (batch)")
+    print("=" * 60)
+    for entry in plan:
+        print(f"   {entry['season_id']}: {entry['mode']} / {entry['theme']} / {entry['style']}")
+    print("=" * 60)
+    
+    generator = build_generator(args)
+    results = generator.generate_seasons(
+        plan,
+        concurrency=args.concurrency,
+        resume=args.resume,
+        firestore_batch_size=args.firestore_batch_size
+    )
+    return 0 if all(result['success'] for result in results) else 1
+
+
+def run_wizard(args: argparse.Namespace) -> int:
+    """대화형 시즌 생성 (하위 명령 없이 실행한 경우)"""
+    
+    from run_planner import format_duration
+    if args.plan:
+        return run_batch(args)
+    
+    print("\n🎴 Weekly Gacha AI Card Generator")
+    print("=" * 60)
+    
+    # 사용자 입력
     print("\n📋 Generation Configuration:")
     print("-" * 60)
     
@@ -509,23 +3686,30 @@ def main():
     print(f"   Mode: {mode}")
     print(f"   Theme: {theme}")
     print(f"   Style: {style}")
-    print(f"   Cards: 70")
-    print(f"   Est. Time: 30-40 minutes")
-    print(f"   Est. Cost: $2.80 (1024×1024)")
+    prediction = _predict_run(args, trials=20)
+    print(f"   Cards: {prediction['cards']}")
+    print(f"   Model: {_model_router(args).label}")
+    print(f"   Concurrency: {args.concurrency}")
+    print(f"   Est. Time: {format_duration(prediction['wall_clock']['p50'])} "
+          f"(p90 {format_duration(prediction['wall_clock']['p90'])})")
+    print(f"   Est. Cost: ${prediction['cost']['p50']:.2f}")
     print("=" * 60)
     
     confirm = input("\n⚠️  Start generation? (yes/no) [yes]: ").strip().lower() or 'yes'
     
     if confirm != 'yes':
         print("❌ Generation cancelled")
-        return
+        return 0
     
     # AI 생성기 초기화 및 실행
-    generator = AICardGenerator()
+    generator = build_generator(args)
     result = generator.generate_full_season(
         mode=mode,
         theme=theme,
-        style=style
+        style=style,
+        concurrency=args.concurrency,
+        resume=args.resume,
+        firestore_batch_size=args.firestore_batch_size
     )
     
     # 결과 출력
@@ -535,9 +3719,43 @@ def main():
         print(f"\n⚠️  Generation completed with {result['failed']} failures")
     
     print(f"\n🔗 View in Firebase Console:")
-    print(f"   https://console.firebase.google.com/project/weeklygacha-24683/firestore")
+    print(f"   https://console.firebase.google.com/project/{generator.project_id}/firestore")
     print(f"   Collection: seasons/{result['season_id']}/cards")
+    
+    return 0 if result['success'] else 1
+
+
+COMMANDS = {
+    'concepts': run_concepts,
+    'prompts': run_prompts,
+    'generate': run_generate,
+    'upload': run_upload,
+    'commit': run_commit,
+    'publish': run_publish,
+    'export': run_export,
+    'import': run_import,
+    'index': run_index,
+    'query': run_query,
+    'simulate': run_simulate,
+    'plan': run_plan,
+    'enqueue': run_enqueue,
+    'worker': run_worker,
+    'queue': run_queue,
+    'serve': run_serve,
+}
+
+
+def main(argv: List[str] = None) -> int:
+    """메인 실행 함수"""
+    
+    args = parse_args(argv)
+    try:
+        return COMMANDS.get(args.command, run_wizard)(args)
+    except (FirebaseInitError, ImageVariantError, ImageQualityError, RarityAllocationError,
+            SimulationError, ModelRoutingError, SeasonArchiveError, CatalogError) as e:
+        print(f"❌ {e}")
+        return 1
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
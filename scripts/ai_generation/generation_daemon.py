@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+생성 daemon (serve 명령): 로컬 HTTP 작업 API + Server-Sent Events 진행 이벤트
+
+Firebase / SDK 클라이언트를 한 번만 초기화한 채로 상주하면서 시즌 생성 작업을 받습니다.
+- POST /jobs                시즌 1개 또는 계획({"seasons": [...]}, --plan 파일과 같은 형식) → 시즌마다 작업 1개
+- GET  /jobs, /jobs/{id}    작업 상태 / 진행률 / 결과
+- POST /jobs/{id}/cancel    대기 중이면 취소, 실행 중이면 완료된 카드까지 커밋하고 중단 (DELETE /jobs/{id}도 동일)
+- GET  /events              전체 진행 이벤트 (SSE), /jobs/{id}/events는 작업 하나 (작업이 끝나면 스트림 종료)
+- GET  /health
+이벤트는 최근 DEFAULT_EVENT_HISTORY개를 보관하므로 재연결 시 Last-Event-ID 이후부터 이어서 받습니다.
+작업 실행은 AICardGenerator.serve_jobs_async, 이 모듈은 작업 목록 / 이벤트 / HTTP만 담당합니다 (표준 라이브러리만 사용).
+"""
+
+import hmac
+import json
+import time
+import uuid
+import threading
+from collections import deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from season_plan import SeasonPlanError, parse_season_plan
+
+DEFAULT_EVENT_HISTORY = 10000
+KEEPALIVE_SECONDS = 15.0
+MAX_BODY_BYTES = 1024 * 1024
+
+
+class JobState:
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+
+FINISHED_STATES = frozenset({JobState.SUCCEEDED, JobState.FAILED, JobState.CANCELLED})
+
+
+class JobSubmitError(ValueError):
+    """작업 요청 오류 (status: HTTP 상태 코드)"""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+class EventLog:
+    """진행 이벤트 기록 (증가하는 id, 최근 max_events개 보관, 새 이벤트 대기)"""
+
+    def __init__(self, max_events: int = DEFAULT_EVENT_HISTORY):
+        self._events = deque(maxlen=max_events)
+        self._next_id = 1
+        self._changed = threading.Condition()
+
+    @property
+    def last_id(self) -> int:
+        return self._next_id - 1
+
+    def append(self, event: Dict) -> Dict:
+        with self._changed:
+            event = dict(event, id=self._next_id)
+            self._next_id += 1
+            self._events.append(event)
+            self._changed.notify_all()
+        return event
+
+    def since(self, last_id: int, job_id: Optional[str] = None) -> List[Dict]:
+        """last_id 이후 이벤트 (job_id가 있으면 그 작업만)"""
+        with self._changed:
+            return self._since(last_id, job_id)
+
+    def _since(self, last_id: int, job_id: Optional[str]) -> List[Dict]:
+        events = []
+        for event in reversed(self._events):
+            if event['id'] <= last_id:
+                break
+            if job_id is None or event.get('job') == job_id:
+                events.append(event)
+        events.reverse()
+        return events
+
+    def wait(self, last_id: int, job_id: Optional[str] = None,
+             timeout: float = KEEPALIVE_SECONDS) -> List[Dict]:
+        """last_id 이후 이벤트가 생길 때까지 최대 timeout초 대기 (없으면 빈 목록)"""
+
+        deadline = time.monotonic() + timeout
+        with self._changed:
+            while True:
+                events = self._since(last_id, job_id)
+                remaining = deadline - time.monotonic()
+                if events or remaining <= 0:
+                    return events
+                self._changed.wait(remaining)
+
+
+class JobBoard:
+    """daemon 작업 목록 (HTTP 스레드에서 추가 / 취소, 이벤트 루프에서 next_job으로 꺼냄)"""
+
+    def __init__(self, modes: Iterable[str], styles: Iterable[str], resume: bool = False,
+                 max_events: int = DEFAULT_EVENT_HISTORY):
+        self.modes = tuple(modes)
+        self.styles = tuple(styles)
+        self.resume = resume
+        self.events = EventLog(max_events)
+        self.started_at = time.time()
+        self.closed = False
+        self._jobs: Dict[str, Dict] = {}
+        self._queue = deque()
+        self._cancel_hooks: Dict[str, Callable[[], None]] = {}
+        self._changed = threading.Condition()
+
+    def submit(self, body) -> List[Dict]:
+        """작업 요청 (시즌 항목 1개 또는 {"seasons": [...]}) → 추가된 작업
+
+        같은 시즌이 대기 / 실행 중이면 409 (매니페스트를 두 작업이 같이 쓰지 않도록).
+        resume을 지정하지 않으면 daemon 기본값 (--resume).
+        """
+
+        if not isinstance(body, dict):
+            raise JobSubmitError("request body must be a JSON object")
+        resume = body.get('resume', self.resume)
+        if not isinstance(resume, bool):
+            raise JobSubmitError("'resume' must be true or false")
+        try:
+            entries = parse_season_plan(body if 'seasons' in body else {'seasons': [body]},
+                                        self.modes, self.styles)
+        except SeasonPlanError as e:
+            raise JobSubmitError(str(e)) from e
+
+        with self._changed:
+            if self.closed:
+                raise JobSubmitError("daemon is shutting down", status=503)
+            active = {job['season_id']: job['id'] for job in self._jobs.values()
+                      if job['status'] not in FINISHED_STATES}
+            for entry in entries:
+                if entry['season_id'] in active:
+                    raise JobSubmitError(f"{entry['season_id']} is already queued or running "
+                                         f"(job {active[entry['season_id']]})", status=409)
+
+            jobs = []
+            for entry in entries:
+                job = dict(entry, id=uuid.uuid4().hex[:12], status=JobState.QUEUED, resume=resume,
+                           submitted_at=datetime.now().isoformat(), started_at=None, finished_at=None,
+                           progress={'done': 0, 'total': entry['cards'], 'percent': 0.0},
+                           cancel_requested=False, result=None, error=None)
+                self._jobs[job['id']] = job
+                self._queue.append(job['id'])
+                jobs.append(job)
+                self._publish(job, 'job_queued', position=len(self._queue))
+            self._changed.notify_all()
+            return [self._view(job) for job in jobs]
+
+    def next_job(self, timeout: float) -> Optional[Dict]:
+        """대기 중인 작업 1개 → running 상태로 꺼냄 (timeout초 동안 없거나 닫히면 None)"""
+
+        deadline = time.monotonic() + timeout
+        with self._changed:
+            while not self._queue and not self.closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._changed.wait(remaining)
+            if self.closed or not self._queue:
+                return None
+            job = self._jobs[self._queue.popleft()]
+            job['status'] = JobState.RUNNING
+            job['started_at'] = datetime.now().isoformat()
+            self._publish(job, 'job_started')
+            return dict(job)
+
+    def started(self, job_id: str, cancel: Callable[[], None]):
+        """실행 중인 작업의 취소 함수 등록 (그 사이 취소 요청이 왔으면 바로 호출)"""
+
+        with self._changed:
+            self._cancel_hooks[job_id] = cancel
+            requested = self._jobs[job_id]['cancel_requested']
+        if requested:
+            cancel()
+
+    def publish(self, job_id: str, event: Dict):
+        """생성기 진행 이벤트 (progress_callback) → 작업 진행률 갱신 + 이벤트 기록"""
+
+        with self._changed:
+            job = self._jobs[job_id]
+            progress = job['progress']
+            if event.get('total'):
+                progress['total'] = event['total']
+            if event.get('done') is not None:
+                progress['done'] = event['done']
+            if progress['total']:
+                progress['percent'] = round(progress['done'] / progress['total'] * 100, 2)
+        self.events.append(dict(event, job=job_id))
+
+    def finished(self, job_id: str, status: str, result: Optional[Dict] = None,
+                 error: Optional[str] = None):
+        with self._changed:
+            job = self._jobs[job_id]
+            job.update(status=status, result=result, error=error,
+                       finished_at=datetime.now().isoformat())
+            self._cancel_hooks.pop(job_id, None)
+            self._publish(job, 'job_finished', status=status, result=result, error=error)
+            self._changed.notify_all()
+        print(f"🛰️  Job {job_id} ({job['season_id']}): {status}")
+
+    def cancel(self, job_id: str) -> Optional[Dict]:
+        """작업 취소 → 작업 상태 (없으면 None, 이미 끝난 작업은 그대로)"""
+
+        with self._changed:
+            job = self._jobs.get(job_id)
+            if job is None or job['status'] in FINISHED_STATES:
+                return self._view(job) if job else None
+            if job['status'] == JobState.QUEUED:
+                self._queue.remove(job_id)
+                job.update(status=JobState.CANCELLED, finished_at=datetime.now().isoformat())
+                self._publish(job, 'job_finished', status=JobState.CANCELLED, result=None, error=None)
+                return self._view(job)
+            job['cancel_requested'] = True
+            cancel = self._cancel_hooks.get(job_id)
+            view = self._view(job)
+        if cancel:
+            cancel()
+        return view
+
+    def close(self):
+        """새 작업 거부, 대기 중인 작업 취소, 실행 중인 작업 중단 (완료 카드는 커밋됨)"""
+
+        with self._changed:
+            if self.closed:
+                return
+            self.closed = True
+            queued = list(self._queue)
+            running = [job_id for job_id, job in self._jobs.items() if job['status'] == JobState.RUNNING]
+            self._changed.notify_all()
+        print(f"🛑 Daemon closing: {len(queued)} queued jobs cancelled, {len(running)} running jobs stopping")
+        for job_id in queued + running:
+            self.cancel(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._changed:
+            job = self._jobs.get(job_id)
+            return self._view(job) if job else None
+
+    def list(self) -> List[Dict]:
+        with self._changed:
+            return [self._view(job) for job in self._jobs.values()]
+
+    def health(self) -> Dict:
+        with self._changed:
+            counts = {state: 0 for state in (JobState.QUEUED, JobState.RUNNING, JobState.SUCCEEDED,
+                                             JobState.FAILED, JobState.CANCELLED)}
+            for job in self._jobs.values():
+                counts[job['status']] += 1
+        return {'status': 'closing' if self.closed else 'ok', 'jobs': counts,
+                'uptime': round(time.time() - self.started_at, 1), 'last_event_id': self.events.last_id}
+
+    def _publish(self, job: Dict, event: str, **data):
+        self.events.append(dict(data, event=event, job=job['id'], season_id=job['season_id'],
+                                time=time.time()))
+
+    @staticmethod
+    def _view(job: Dict) -> Dict:
+        view = {key: value for key, value in job.items() if key != 'cancel_requested'}
+        view['progress'] = dict(job['progress'])
+        view['cancel_requested'] = job['cancel_requested'] and job['status'] == JobState.RUNNING
+        return view
+
+
+class DaemonRequestHandler(BaseHTTPRequestHandler):
+    """작업 API / SSE 요청 처리 (요청마다 스레드 1개)"""
+
+    server_version = 'GachaDaemon/1'
+
+    def log_message(self, format, *args):
+        pass  # 작업 추가 / 종료는 JobBoard가 출력
+
+    @property
+    def board(self) -> JobBoard:
+        return self.server.board
+
+    def _route(self):
+        url = urlsplit(self.path)
+        self.query = parse_qs(url.query)
+        return [part for part in url.path.split('/') if part]
+
+    def _authorized(self) -> bool:
+        token = self.server.token
+        if not token:
+            return True
+        header = self.headers.get('Authorization', '')
+        given = header[len('Bearer '):] if header.startswith('Bearer ') else \
+            (self.query.get('token') or [''])[0]  # EventSource는 헤더를 보낼 수 없음
+        return hmac.compare_digest(given.encode(), token.encode())
+
+    def _cors_headers(self):
+        if self.server.allow_origin:
+            self.send_header('Access-Control-Allow-Origin', self.server.allow_origin)
+            self.send_header('Access-Control-Allow-Headers', 'Authorization, Content-Type, Last-Event-ID')
+            self.send_header('Access-Control-Allow-Methods', 'GET, POST, DELETE, OPTIONS')
+
+    def _send_json(self, status: int, data):
+        body = json.dumps(data, ensure_ascii=False, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self._cors_headers()
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status: int, message: str):
+        self._send_json(status, {'error': message})
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BODY_BYTES:
+            raise JobSubmitError(f"request body too large (max {MAX_BODY_BYTES} bytes)", status=413)
+        try:
+            return json.loads(self.rfile.read(length) or b'{}')
+        except ValueError as e:
+            raise JobSubmitError(f"invalid JSON: {e}") from e
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self._cors_headers()
+        self.end_headers()
+
+    def do_GET(self):
+        parts = self._route()
+        if parts == ['health']:
+            return self._send_json(200, self.board.health())
+        if not self._authorized():
+            return self._error(401, "missing or invalid token")
+        if parts == ['jobs']:
+            return self._send_json(200, {'jobs': self.board.list()})
+        if parts == ['events']:
+            return self._stream_events(None)
+        if len(parts) in (2, 3) and parts[0] == 'jobs':
+            job = self.board.get(parts[1])
+            if job is None:
+                return self._error(404, f"unknown job: {parts[1]}")
+            if len(parts) == 2:
+                return self._send_json(200, job)
+            if parts[2] == 'events':
+                return self._stream_events(parts[1])
+        self._error(404, f"not found: {self.path}")
+
+    def do_POST(self):
+        parts = self._route()
+        if not self._authorized():
+            return self._error(401, "missing or invalid token")
+        if parts == ['jobs']:
+            try:
+                jobs = self.board.submit(self._read_json())
+            except JobSubmitError as e:
+                return self._error(e.status, str(e))
+            print(f"📥 Queued {len(jobs)} job(s): "
+                  f"{', '.join(job['id'] + ' ' + job['season_id'] for job in jobs)}")
+            return self._send_json(202, {'jobs': jobs})
+        if len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'cancel':
+            return self._cancel(parts[1])
+        self._error(404, f"not found: {self.path}")
+
+    def do_DELETE(self):
+        parts = self._route()
+        if not self._authorized():
+            return self._error(401, "missing or invalid token")
+        if len(parts) == 2 and parts[0] == 'jobs':
+            return self._cancel(parts[1])
+        self._error(404, f"not found: {self.path}")
+
+    def _cancel(self, job_id: str):
+        job = self.board.cancel(job_id)
+        if job is None:
+            return self._error(404, f"unknown job: {job_id}")
+        if job['status'] in FINISHED_STATES and job['status'] != JobState.CANCELLED:
+            return self._error(409, f"job {job_id} already {job['status']}")
+        self._send_json(202 if job['status'] == JobState.RUNNING else 200, job)
+
+    def _stream_events(self, job_id: Optional[str]):
+        """SSE: Last-Event-ID(또는 ?last_event_id=) 이후 이벤트 → 새 이벤트 (KEEPALIVE_SECONDS마다 주석 줄)"""
+
+        try:
+            last_id = int(self.headers.get('Last-Event-ID') or (self.query.get('last_event_id') or [0])[0])
+        except ValueError:
+            return self._error(400, "Last-Event-ID must be an integer")
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('X-Accel-Buffering', 'no')
+        self._cors_headers()
+        self.end_headers()
+        try:
+            while True:
+                # 끝난 작업: 남은 이벤트를 보낸 뒤 종료 (재연결 / 종료 후 구독 / job_finished가 밀려난 경우 포함)
+                finished = job_id is not None and self.board.get(job_id)['status'] in FINISHED_STATES
+                events = (self.board.events.since(last_id, job_id) if finished else
+                          self.board.events.wait(last_id, job_id, KEEPALIVE_SECONDS))
+                if not events and not finished:
+                    self.wfile.write(b': keepalive\n\n')
+                for event in events:
+                    data = json.dumps(event, ensure_ascii=False, default=str)
+                    self.wfile.write(f"id: {event['id']}\nevent: {event['event']}\ndata: {data}\n\n"
+                                     .encode('utf-8'))
+                    last_id = event['id']
+                self.wfile.flush()
+                if finished or (job_id and any(event['event'] == 'job_finished' for event in events)):
+                    return
+        except (BrokenPipeError, ConnectionResetError):
+            return  # 클라이언트 연결 종료
+
+
+class DaemonServer(ThreadingHTTPServer):
+    """작업 API HTTP 서버 (token: Bearer 토큰, allow_origin: 웹 관리 화면용 CORS)"""
+
+    daemon_threads = True
+
+    def __init__(self, board: JobBoard, host: str, port: int,
+                 token: Optional[str] = None, allow_origin: Optional[str] = None):
+        super().__init__((host, port), DaemonRequestHandler)
+        self.board = board
+        self.token = token
+        self.allow_origin = allow_origin
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self) -> threading.Thread:
+        """백그라운드 스레드에서 요청 처리 시작 (종료: shutdown())"""
+        thread = threading.Thread(target=self.serve_forever, name='daemon-http', daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+프롬프트 → 이미지 캐시 (content-addressed)
+
+(프롬프트, 모델, 비율)의 sha256 해시를 키로 다운로드한 이미지 바이트를 저장합니다.
+- 캐시 히트 시 GenSparkSDK.image_generation 호출과 다운로드를 모두 건너뜀
+- 최대 용량 초과 시 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+- 사용 시각은 파일 mtime으로 관리 (프로세스 재시작 후에도 유지)
+- pin한 항목은 release할 때까지 삭제하지 않음 (다른 카드가 캐시 경로를 쓰는 동안)
+- 중단된 writer가 남긴 임시 파일은 시작 시 정리 (다른 프로세스가 쓰는 중일 수 있어 오래된 것만)
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+# 기본 캐시 위치 / 최대 용량
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'weekly_gacha', 'images')
+DEFAULT_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024  # 2GB
+
+CACHE_FILE_SUFFIX = '.img'
+TEMP_FILE_SUFFIX = '.tmp'
+STALE_TEMP_SECONDS = 60 * 60  # 이보다 오래 수정되지 않은 임시 파일은 중단된 writer의 것으로 보고 삭제
+
+
+class ImageCache:
+    """크기 제한이 있는 LRU 이미지 캐시"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR,
+                 max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key → size (오래된 순)
+        self._pins: Dict[str, int] = {}  # key → 사용 중인 수
+        self._total_bytes = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._scan()
+
+    @staticmethod
+    def make_key(prompt: str, model: str, aspect_ratio: str, slot: int = 0) -> str:
+        """캐시 키 생성 (프롬프트 + 모델 + 비율)
+
+        slot: 한 시즌 안에서 같은 프롬프트가 반복될 때의 순번
+              (테마 모드처럼 동일 프롬프트 카드가 같은 이미지를 공유하지 않도록)
+        """
+        parts = [prompt, model, aspect_ratio]
+        if slot:
+            parts.append(slot)
+        payload = json.dumps(parts, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def path_for(self, key: str) -> str:
+        """캐시 파일 경로 (키 앞 2글자로 샤딩)"""
+        return os.path.join(self.cache_dir, key[:2], key + CACHE_FILE_SUFFIX)
+
+    def _scan(self):
+        """디스크의 기존 캐시 항목 로드 (mtime 순) + 오래된 임시 파일 삭제"""
+
+        found = []
+        stale_before = time.time() - STALE_TEMP_SECONDS
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith((CACHE_FILE_SUFFIX, TEMP_FILE_SUFFIX)):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                    if name.endswith(TEMP_FILE_SUFFIX):
+                        if stat.st_mtime < stale_before:
+                            os.remove(path)
+                        continue
+                except OSError:
+                    continue
+                found.append((stat.st_mtime, name[:-len(CACHE_FILE_SUFFIX)], stat.st_size))
+
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+
+    def pin(self, key: str):
+        """항목을 사용 중으로 표시 (release 전까지 LRU 삭제 대상에서 제외, 아직 없는 항목도 가능)"""
+
+        with self._lock:
+            self._pins[key] = self._pins.get(key, 0) + 1
+
+    def release(self, key: str):
+        """pin 해제 → 미뤄 둔 삭제 진행"""
+
+        with self._lock:
+            count = self._pins.get(key, 0) - 1
+            if count > 0:
+                self._pins[key] = count
+            else:
+                self._pins.pop(key, None)
+                self._evict()
+
+    @contextmanager
+    def pinned(self, key: str):
+        """with 블록 동안 pin (get / commit이 돌려준 경로를 블록 안에서 안전하게 사용)"""
+
+        self.pin(key)
+        try:
+            yield
+        finally:
+            self.release(key)
+
+    def get(self, key: str) -> Optional[str]:
+        """캐시된 이미지 파일 경로 반환 (없으면 None)
+
+        경로는 다른 항목 기록 시 LRU로 삭제될 수 있으므로, 바로 읽지 않으면 pinned(key) 안에서 사용합니다.
+        """
+
+        path = self.path_for(key)
+        with self._lock:
+            if key not in self._entries or not os.path.exists(path):
+                self._forget(key)
+                self.misses += 1
+                return None
+
+            # LRU 갱신
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return path
+
+    def read(self, key: str) -> Optional[bytes]:
+        """캐시된 이미지 바이트 반환 (없으면 None)"""
+
+        with self.pinned(key):
+            path = self.get(key)
+            if not path:
+                return None
+            with open(path, 'rb') as f:
+                return f.read()
+
+    def put(self, key: str, data: bytes) -> str:
+        """이미지 저장 (임시 파일 → rename으로 원자적 기록)"""
+
+        writer = self.open_writer(key)
+        writer.write(data)
+        return writer.commit()
+
+    def open_writer(self, key: str) -> 'CacheWriter':
+        """스트리밍 기록용 writer (commit 전까지는 캐시에 보이지 않음)"""
+
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=TEMP_FILE_SUFFIX)
+        return CacheWriter(self, key, os.fdopen(fd, 'wb'), tmp_path)
+
+    def _commit(self, key: str, tmp_path: str, size: int) -> str:
+        """writer의 임시 파일을 캐시 항목으로 등록"""
+
+        path = self.path_for(key)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._forget(key)
+            self._entries[key] = size
+            self._total_bytes += size
+            self._evict()
+
+        return path
+
+    def discard(self, key: str):
+        """항목 삭제 (품질 검사에서 거부된 이미지 등)"""
+
+        with self._lock:
+            self._forget(key)
+        try:
+            os.remove(self.path_for(key))
+        except OSError:
+            pass
+
+    def _forget(self, key: str):
+        """인덱스에서 항목 제거 (lock 보유 상태에서 호출)"""
+        size = self._entries.pop(key, None)
+        if size is not None:
+            self._total_bytes -= size
+
+    def _evict(self):
+        """최대 용량 이하가 될 때까지 LRU 항목 삭제 (pin된 항목과 최신 항목 제외, lock 보유 상태에서 호출)"""
+
+        if self._total_bytes <= self.max_bytes:
+            return
+        for key in list(self._entries)[:-1]:
+            if self._total_bytes <= self.max_bytes:
+                break
+            if key in self._pins:
+                continue  # release할 때 다시 확인
+            self._total_bytes -= self._entries.pop(key)
+            try:
+                os.remove(self.path_for(key))
+            except OSError:
+                pass
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+
+class CacheWriter:
+    """캐시 항목 스트리밍 기록 (임시 파일 → commit 시 rename)"""
+
+    def __init__(self, cache: ImageCache, key: str, f, tmp_path: str):
+        self._cache = cache
+        self._key = key
+        self._file = f
+        self._tmp_path = tmp_path
+        self._size = 0
+
+    def write(self, data: bytes):
+        self._file.write(data)
+        self._size += len(data)
+
+    def commit(self) -> str:
+        """기록 완료 → 캐시에 등록"""
+        self._file.close()
+        return self._cache._commit(self._key, self._tmp_path, self._size)
+
+    def abort(self):
+        """기록 취소 → 임시 파일 삭제"""
+        self._file.close()
+        try:
+            os.remove(self._tmp_path)
+        except OSError:
+            pass
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+업로드 전 이미지 품질 검사 (중복 / 빈 이미지)
+
+- 지각 해시(pHash, 64bit DCT): 비슷한 이미지는 해밍 거리가 작음
+- 유사도 인덱스: 이번 시즌 + 이전 시즌 해시 전체와 XOR/popcount 벡터 비교
+- 디테일 점수: 명암 대비(표준편차)와 평균 경사도로 빈 이미지 / 단색 이미지 감지
+- 후보 점수 (best-of-N): 선명도(라플라시안 표준편차)와 배경 정리도(테두리 균일도)
+- 시즌별 해시는 로컬에 저장 (~/.cache/weekly_gacha/hashes/{season_id}.npz)
+
+NumPy / Pillow는 실제 검사 시에만 import합니다.
+"""
+
+import os
+import glob
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 기본 해시 저장 디렉토리
+DEFAULT_HASH_DIR = os.path.expanduser('~/.cache/weekly_gacha/hashes')
+
+# 기본 임계값
+DEFAULT_MAX_DISTANCE = 6  # 64bit 중 이 값 이하로 다르면 중복 (유사도 ≈ 0.9 이상)
+DEFAULT_MIN_CONTRAST = 0.03  # 그레이스케일 표준편차 / 255
+DEFAULT_MIN_DETAIL = 0.01  # 평균 경사도 / 255
+DEFAULT_MAX_REGENERATIONS = 2
+
+HASH_SIZE = 8  # 8x8 DCT 저주파 → 64bit
+HASH_SAMPLE = 32  # DCT 입력 크기
+DETAIL_SAMPLE = 64  # 디테일 점수 계산 크기
+BORDER_WIDTH = 4  # 배경 정리도 계산에 쓰는 테두리 폭 (DETAIL_SAMPLE 기준 px)
+BACKGROUND_WEIGHT = 0.5  # 후보 점수에서 배경 정리도 가중치 (선명도는 후보 중 최댓값 기준 1.0)
+
+
+class QualityReject:
+    DUPLICATE = 'duplicate'
+    LOW_DETAIL = 'low_detail'
+
+
+class ImageQualityError(RuntimeError):
+    """품질 검사 불가 (NumPy / Pillow 미설치)"""
+
+
+def require_numpy():
+    """NumPy / Pillow 설치 확인 (없으면 ImageQualityError)"""
+
+    try:
+        import numpy  # noqa: F401
+        import PIL  # noqa: F401
+    except ImportError as e:
+        raise ImageQualityError(
+            "NumPy and Pillow are required for the quality gate "
+            "(pip install numpy Pillow, or use --no-quality-gate)"
+        ) from e
+
+
+_DCT_MATRIX = None
+
+
+def _dct_matrix(n: int):
+    """DCT-II 직교 행렬 (n x n, 1회 계산)"""
+
+    global _DCT_MATRIX
+    if _DCT_MATRIX is None or _DCT_MATRIX.shape[0] != n:
+        import numpy as np
+        k = np.arange(n)[:, None]
+        x = np.arange(n)[None, :]
+        matrix = np.cos(np.pi * (2 * x + 1) * k / (2 * n)) * np.sqrt(2 / n)
+        matrix[0] /= np.sqrt(2)
+        _DCT_MATRIX = matrix
+    return _DCT_MATRIX
+
+
+def analyze_image(path: str) -> Dict:
+    """이미지 1장 → {'phash', 'contrast', 'detail', 'sharpness', 'background'} (프로세스 풀에서 실행)"""
+
+    import numpy as np
+    from PIL import Image
+
+    with Image.open(path) as image:
+        image.draft('L', (DETAIL_SAMPLE * 2, DETAIL_SAMPLE * 2))  # JPEG는 디코딩 단계에서 축소
+        gray = image.convert('L')
+    hash_pixels = np.asarray(gray.resize((HASH_SAMPLE, HASH_SAMPLE), Image.LANCZOS), dtype=np.float64)
+    detail_pixels = np.asarray(gray.resize((DETAIL_SAMPLE, DETAIL_SAMPLE), Image.BILINEAR), dtype=np.float64)
+
+    # pHash: 2D DCT의 저주파 8x8 (DC 제외)을 중앙값과 비교
+    dct = _dct_matrix(HASH_SAMPLE)
+    low = (dct @ hash_pixels @ dct.T)[:HASH_SIZE, :HASH_SIZE].ravel()
+    bits = low > np.median(low[1:])
+    phash = int(np.packbits(bits).view('>u8')[0])
+
+    # 디테일: 명암 대비 + 평균 경사도
+    contrast = float(detail_pixels.std() / 255)
+    detail = float((np.abs(np.diff(detail_pixels, axis=0)).mean() +
+                    np.abs(np.diff(detail_pixels, axis=1)).mean()) / 2 / 255)
+
+    # 선명도: 라플라시안 표준편차, 배경: 테두리 픽셀이 균일할수록 1에 가까움
+    laplacian = (4 * detail_pixels[1:-1, 1:-1] - detail_pixels[:-2, 1:-1] - detail_pixels[2:, 1:-1]
+                 - detail_pixels[1:-1, :-2] - detail_pixels[1:-1, 2:])
+    sharpness = float(laplacian.std() / 255)
+    inner = detail_pixels[BORDER_WIDTH:-BORDER_WIDTH, BORDER_WIDTH:-BORDER_WIDTH]
+    border_count = detail_pixels.size - inner.size
+    border_mean = (detail_pixels.sum() - inner.sum()) / border_count
+    border_var = ((detail_pixels ** 2).sum() - (inner ** 2).sum()) / border_count - border_mean ** 2
+    background = float(max(0.0, 1 - np.sqrt(max(border_var, 0.0)) / 128))
+
+    return {'phash': phash, 'contrast': round(contrast, 4), 'detail': round(detail, 4),
+            'sharpness': round(sharpness, 4), 'background': round(background, 4)}
+
+
+def rank_candidates(analyses: List[Dict]) -> List[int]:
+    """best-of-N 후보 분석 결과 → 점수 높은 순 인덱스
+
+    점수 = 선명도 / 후보 중 최대 선명도 + BACKGROUND_WEIGHT × 배경 정리도
+    (중복 / 빈 이미지 판정은 QualityGate.check가 순서대로 담당)
+    """
+
+    top = max((analysis['sharpness'] for analysis in analyses), default=0.0) or 1.0
+    scores = [analysis['sharpness'] / top + BACKGROUND_WEIGHT * analysis['background']
+              for analysis in analyses]
+    return sorted(range(len(analyses)), key=lambda i: scores[i], reverse=True)
+
+
+def hamming_distances(hashes, value: int):
+    """uint64 해시 배열과 해시 1개의 해밍 거리 (벡터 연산)"""
+
+    import numpy as np
+
+    xor = np.bitwise_xor(hashes, np.uint64(value))
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(xor)
+    # NumPy 2.0 미만: 바이트별 popcount 표
+    table = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+    return table[xor.view(np.uint8).reshape(-1, 8)].sum(axis=1)
+
+
+class HashIndex:
+    """해시 + 라벨 (season_id, card_index) 유사도 인덱스 (스레드 안전)
+
+    같은 라벨을 다시 추가하면 해시를 교체합니다 (재생성된 카드).
+    """
+
+    def __init__(self, capacity: int = 1024):
+        import numpy as np
+
+        self._hashes = np.zeros(capacity, dtype=np.uint64)
+        self._labels = []
+        self._positions: Dict[Tuple[str, int], int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def _set(self, value: int, label: Tuple[str, int]):
+        """lock 보유 상태에서 호출 (용량이 차면 2배로 확장)"""
+
+        import numpy as np
+
+        position = self._positions.get(label)
+        if position is None:
+            position = len(self._labels)
+            if position == len(self._hashes):
+                grown = np.zeros(position * 2, dtype=np.uint64)
+                grown[:position] = self._hashes
+                self._hashes = grown
+            self._labels.append(label)
+            self._positions[label] = position
+        self._hashes[position] = value
+
+    def _nearest(self, value: int, exclude: Optional[Tuple[str, int]] = None):
+        """lock 보유 상태에서 호출 → (거리, 라벨), 비교 대상이 없으면 (65, None)"""
+
+        no_match = HASH_SIZE * HASH_SIZE + 1
+        count = len(self._labels)
+        if not count:
+            return no_match, None
+        distances = hamming_distances(self._hashes[:count], value)
+        if exclude in self._positions:
+            distances[self._positions[exclude]] = no_match
+        position = int(distances.argmin())
+        if distances[position] >= no_match:
+            return no_match, None
+        return int(distances[position]), self._labels[position]
+
+    def add(self, value: int, label: Tuple[str, int]):
+        with self._lock:
+            self._set(value, label)
+
+    def nearest(self, value: int, exclude: Optional[Tuple[str, int]] = None):
+        """가장 가까운 해시 → (거리, 라벨)"""
+        with self._lock:
+            return self._nearest(value, exclude)
+
+    def add_if_unique(self, value: int, label: Tuple[str, int],
+                      max_distance: int) -> Tuple[int, Optional[Tuple[str, int]]]:
+        """중복이 아니면 추가 (검사와 추가를 원자적으로) → (거리, 가장 가까운 라벨)
+
+        같은 라벨의 이전 해시는 비교에서 제외합니다.
+        """
+
+        with self._lock:
+            distance, nearest = self._nearest(value, exclude=label)
+            if distance > max_distance:
+                self._set(value, label)
+            return distance, nearest
+
+    def season_hashes(self, season_id: str):
+        """시즌 해시 → (hashes, card_indexes)"""
+
+        import numpy as np
+
+        with self._lock:
+            positions = [i for i, (season, _) in enumerate(self._labels) if season == season_id]
+            hashes = self._hashes[positions].copy()
+            indexes = np.array([self._labels[i][1] for i in positions], dtype=np.int64)
+        return hashes, indexes
+
+
+class QualityGate:
+    """중복 / 빈 이미지 검사 (시즌 간 공유 가능)"""
+
+    def __init__(self, hash_dir: str = DEFAULT_HASH_DIR,
+                 max_distance: int = DEFAULT_MAX_DISTANCE,
+                 min_contrast: float = DEFAULT_MIN_CONTRAST,
+                 min_detail: float = DEFAULT_MIN_DETAIL,
+                 max_regenerations: int = DEFAULT_MAX_REGENERATIONS):
+        self.hash_dir = hash_dir
+        self.max_distance = max_distance
+        self.min_contrast = min_contrast
+        self.min_detail = min_detail
+        self.max_regenerations = max_regenerations
+        self.rejected: Dict[str, int] = {QualityReject.DUPLICATE: 0, QualityReject.LOW_DETAIL: 0}
+        self._index = None
+        self._lock = threading.Lock()
+
+    @property
+    def index(self) -> HashIndex:
+        with self._lock:
+            if self._index is None:
+                self._index = HashIndex()
+            return self._index
+
+    def load_history(self, exclude: Iterable[str] = ()) -> int:
+        """이전 시즌 해시 로드 (처음 1회만, exclude 시즌은 제외) → 로드한 해시 수"""
+
+        import numpy as np
+
+        with self._lock:
+            if self._index is not None:
+                return 0
+            self._index = HashIndex()
+
+        exclude = set(exclude)
+        loaded = 0
+        for path in sorted(glob.glob(os.path.join(self.hash_dir, '*.npz'))):
+            season_id = os.path.basename(path)[:-len('.npz')]
+            if season_id in exclude:
+                continue
+            try:
+                with np.load(path) as data:
+                    hashes, indexes = data['hashes'], data['indexes']
+            except (OSError, KeyError, ValueError) as e:
+                print(f"   ⚠️ Skipping unreadable hash file {path}: {e}")
+                continue
+            for value, card_index in zip(hashes.tolist(), indexes.tolist()):
+                self._index.add(value, (season_id, card_index))
+            loaded += len(hashes)
+        return loaded
+
+    def check(self, analysis: Dict, season_id: str,
+              card_index: int) -> Optional[Tuple[str, str]]:
+        """검사 통과 시 인덱스에 추가하고 None, 실패 시 (QualityReject, 설명) 반환"""
+
+        if analysis['contrast'] < self.min_contrast or analysis['detail'] < self.min_detail:
+            self._count(QualityReject.LOW_DETAIL)
+            return QualityReject.LOW_DETAIL, (f"contrast {analysis['contrast']:.3f}, "
+                                              f"detail {analysis['detail']:.3f}")
+
+        distance, nearest = self.index.add_if_unique(
+            analysis['phash'], (season_id, card_index), self.max_distance
+        )
+        if distance <= self.max_distance:
+            self._count(QualityReject.DUPLICATE)
+            return QualityReject.DUPLICATE, f"{distance} bits from {nearest[0]} card_{nearest[1]}"
+        return None
+
+    def _count(self, kind: str):
+        with self._lock:
+            self.rejected[kind] += 1
+
+    def remember(self, phash: int, season_id: str, card_index: int):
+        """이미 통과한 카드 해시 등록 (재개 시 완료 카드)"""
+
+        self.index.add(phash, (season_id, card_index))
+
+    def save_season(self, season_id: str) -> str:
+        """시즌 해시 저장 → 파일 경로 (다음 시즌의 비교 대상)"""
+
+        import numpy as np
+
+        hashes, indexes = self.index.season_hashes(season_id)
+        os.makedirs(self.hash_dir, exist_ok=True)
+        path = os.path.join(self.hash_dir, f'{season_id}.npz')
+        tmp_path = path + '.tmp.npz'
+        np.savez(tmp_path, hashes=hashes, indexes=indexes)
+        os.replace(tmp_path, path)
+        return path
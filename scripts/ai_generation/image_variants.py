@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+카드 이미지 해상도 / 포맷 변형 생성
+
+업로드한 원본을 한 번만 디코딩해서 크기별(128/256/512/original),
+포맷별(WebP/PNG) 변형 파일을 만듭니다.
+- 프로세스 풀에서 실행 (render_variants는 pickle 가능한 최상위 함수)
+- 원본과 같은 포맷의 original 변형은 다시 인코딩하지 않고 원본을 재사용
+- Pillow는 변형 생성 시에만 import
+"""
+
+import os
+from typing import Dict, List, Sequence
+
+# 기본 변형 크기 (긴 변 기준 px, 'original'은 원본 해상도)
+DEFAULT_VARIANT_SIZES = ('128', '256', '512', 'original')
+DEFAULT_VARIANT_FORMATS = ('webp', 'png')
+
+FORMAT_CONTENT_TYPES = {
+    'webp': 'image/webp',
+    'png': 'image/png',
+    'jpeg': 'image/jpeg',
+}
+
+# 인코딩 설정
+WEBP_QUALITY = 85
+WEBP_METHOD = 4  # 0(빠름) ~ 6(작은 파일)
+PNG_COMPRESS_LEVEL = 6
+
+
+class ImageVariantError(RuntimeError):
+    """변형 생성 불가 (Pillow 미설치, 잘못된 설정 등)"""
+
+
+def require_pillow():
+    """Pillow 설치 확인 (없으면 ImageVariantError)"""
+
+    try:
+        import PIL  # noqa: F401
+    except ImportError as e:
+        raise ImageVariantError(
+            "Pillow is required for image variants (pip install Pillow, or use --no-variants)"
+        ) from e
+
+
+def parse_variant_sizes(text: str) -> List[str]:
+    """'128,256,original' → ['128', '256', 'original'] (검증 포함)"""
+
+    sizes = [size.strip().lower() for size in text.split(',') if size.strip()]
+    for size in sizes:
+        if size != 'original' and not (size.isdigit() and int(size) > 0):
+            raise ImageVariantError(f"invalid variant size: {size!r}")
+    return sizes
+
+
+def parse_variant_formats(text: str) -> List[str]:
+    """'webp,png' → ['webp', 'png'] (검증 포함)"""
+
+    formats = [fmt.strip().lower() for fmt in text.split(',') if fmt.strip()]
+    for fmt in formats:
+        if fmt not in FORMAT_CONTENT_TYPES:
+            raise ImageVariantError(f"unsupported variant format: {fmt!r} "
+                                    f"(expected one of {', '.join(FORMAT_CONTENT_TYPES)})")
+    return formats
+
+
+def encode_image(image, fmt: str, path: str):
+    """포맷별 인코딩 설정으로 저장"""
+
+    if fmt == 'webp':
+        image.save(path, 'WEBP', quality=WEBP_QUALITY, method=WEBP_METHOD)
+    elif fmt == 'png':
+        image.save(path, 'PNG', compress_level=PNG_COMPRESS_LEVEL)
+    else:
+        image.convert('RGB').save(path, 'JPEG', quality=WEBP_QUALITY, optimize=True)
+
+
+def render_variants(source_path: str, out_dir: str,
+                    sizes: Sequence[str] = DEFAULT_VARIANT_SIZES,
+                    formats: Sequence[str] = DEFAULT_VARIANT_FORMATS) -> List[Dict]:
+    """원본 1장 → 변형 파일 목록
+
+    반환 항목: size, format, content_type, width, height, path, bytes, same_as
+    path가 None이면 같은 이미지를 재사용하는 변형입니다
+    (same_as: 같은 결과의 다른 크기 이름, None이면 업로드한 원본).
+    원본보다 큰 크기는 원본 해상도로 대체됩니다 (확대하지 않음).
+    """
+
+    from PIL import Image
+
+    with Image.open(source_path) as source:
+        source_format = (source.format or '').lower()
+        source.load()
+        mode = 'RGBA' if 'A' in source.getbands() or 'transparency' in source.info else 'RGB'
+        original = source.convert(mode)
+
+    width, height = original.size
+    longest = max(width, height)
+
+    # 큰 크기부터 만들고, 작은 크기는 직전 결과에서 축소 (디코딩 1회, 리샘플링 비용 감소)
+    targets = sorted(
+        sizes, key=lambda s: longest if s == 'original' else min(int(s), longest), reverse=True
+    )
+
+    variants = []
+    encoded = {}  # (긴 변, 포맷) → 먼저 만든 크기 이름
+    previous = original
+    for size in targets:
+        edge = longest if size == 'original' else min(int(size), longest)
+        if edge == longest:
+            image = original
+        else:
+            scale = edge / longest
+            target = (max(1, round(width * scale)), max(1, round(height * scale)))
+            image = previous.resize(target, Image.LANCZOS, reducing_gap=3.0)
+            previous = image
+
+        for fmt in formats:
+            entry = {
+                'size': size,
+                'format': fmt,
+                'content_type': FORMAT_CONTENT_TYPES[fmt],
+                'width': image.size[0],
+                'height': image.size[1],
+                'path': None,
+                'bytes': os.path.getsize(source_path),
+                'same_as': encoded.get((edge, fmt)),
+            }
+            if entry['same_as'] is None and not (image is original and fmt == source_format):
+                path = os.path.join(out_dir, f'{size}.{fmt}')
+                encode_image(image, fmt, path)
+                entry['path'] = path
+                entry['bytes'] = os.path.getsize(path)
+            encoded.setdefault((edge, fmt), size)
+            variants.append(entry)
+
+    return variants
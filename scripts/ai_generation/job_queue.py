@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+카드 생성 작업 큐 (SQLite, lease 기반)
+
+카드 1장 = 작업 1개. 여러 프로세스 / 호스트의 worker가 같은 큐 파일을 공유합니다.
+- lease: 작업을 가져간 worker와 만료 시각 기록, 실행 중에는 heartbeat로 연장
+- worker가 죽으면 lease가 만료되고 다른 worker가 다시 가져감 (attempts 증가)
+- attempts가 max_attempts에 도달하면 실패로 확정
+- 시즌의 작업이 모두 끝나면(대기 / 실행 중 없음) 한 worker만 Firestore 커밋 권한을 얻음
+
+큐 파일은 같은 호스트의 로컬 디스크나 파일 잠금이 동작하는 공유 디렉토리에 둡니다.
+"""
+
+import os
+import json
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# sqlite3는 큐를 열 때 import (CLI의 다른 명령 시작 시간에 포함하지 않음)
+
+# 기본 큐 파일 (스크립트 위치 기준)
+DEFAULT_QUEUE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'queue', 'jobs.sqlite')
+
+DEFAULT_LEASE_SECONDS = 300.0  # provider 호출 + 업로드가 이 안에 끝나지 않으면 heartbeat로 연장
+DEFAULT_MAX_ATTEMPTS = 3
+BUSY_TIMEOUT = 30.0  # 다른 worker가 쓰기 잠금을 잡고 있을 때 대기 (초)
+
+
+class JobStatus:
+    PENDING = 'pending'
+    LEASED = 'leased'
+    DONE = 'done'
+    FAILED = 'failed'
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seasons (
+    season_id TEXT PRIMARY KEY,
+    style TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    committed_by TEXT,
+    committed_at REAL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    season_id TEXT NOT NULL,
+    card_index INTEGER NOT NULL,
+    concept TEXT NOT NULL,
+    cache_slot INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    owner TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (season_id, card_index)
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, lease_expires);
+"""
+
+
+class JobQueue:
+    """SQLite 작업 큐 (스레드 / 프로세스 안전, 호출마다 새 연결)"""
+
+    def __init__(self, path: str = DEFAULT_QUEUE_PATH, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        self.path = path
+        self.max_attempts = max_attempts
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        import sqlite3
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT)
+        try:
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self):
+        """쓰기 트랜잭션 (BEGIN IMMEDIATE: 읽고 바꾸는 사이에 다른 worker가 끼어들지 않음)"""
+
+        import sqlite3
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            # WAL은 공유 메모리가 필요해서 여러 호스트가 공유하는 파일에서는 기본 저널 모드 사용
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+        finally:
+            conn.close()
+
+    def enqueue(self, season_id: str, style: str, concepts: Iterable[Dict],
+                cache_slots: Optional[Dict[int, int]] = None) -> int:
+        """시즌 카드 작업 추가 → 새로 추가된 작업 수 (이미 있는 카드는 그대로)"""
+
+        now = time.time()
+        cache_slots = cache_slots or {}
+        rows = [(season_id, concept['index'], json.dumps(concept, ensure_ascii=False),
+                 cache_slots.get(concept['index'], 0), JobStatus.PENDING, now)
+                for concept in concepts]
+        with self._transaction() as conn:
+            conn.execute('INSERT OR IGNORE INTO seasons (season_id, style, created_at) VALUES (?, ?, ?)',
+                         (season_id, style, now))
+            before = conn.total_changes
+            conn.executemany('INSERT OR IGNORE INTO jobs (season_id, card_index, concept, cache_slot, '
+                             'status, updated_at) VALUES (?, ?, ?, ?, ?, ?)', rows)
+            return conn.total_changes - before
+
+    def retry_failed(self, season_id: str) -> int:
+        """실패로 확정된 작업을 다시 대기 상태로 (attempts 초기화) → 작업 수"""
+
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                'UPDATE jobs SET status = ?, attempts = 0, error = NULL, updated_at = ? '
+                'WHERE season_id = ? AND status = ?',
+                (JobStatus.PENDING, time.time(), season_id, JobStatus.FAILED)
+            )
+            if cursor.rowcount:
+                conn.execute('UPDATE seasons SET committed_by = NULL, committed_at = NULL '
+                             'WHERE season_id = ?', (season_id,))
+            return cursor.rowcount
+
+    def lease(self, owner: str, limit: int = 1,
+              lease_seconds: float = DEFAULT_LEASE_SECONDS) -> List[Dict]:
+        """대기 작업 또는 lease가 만료된 작업을 최대 limit개 가져오기
+
+        만료된 작업 중 attempts가 max_attempts에 도달한 작업은 실패로 확정합니다.
+        반환값: [{'season_id', 'index', 'concept', 'cache_slot', 'style', 'attempts'}]
+        """
+
+        if limit <= 0:
+            return []
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                'UPDATE jobs SET status = ?, owner = NULL, error = ?, updated_at = ? '
+                'WHERE status = ? AND lease_expires < ? AND attempts >= ?',
+                (JobStatus.FAILED, 'lease expired', now, JobStatus.LEASED, now, self.max_attempts)
+            )
+            rows = conn.execute(
+                'SELECT jobs.season_id, card_index, concept, cache_slot, attempts, style '
+                'FROM jobs JOIN seasons USING (season_id) '
+                'WHERE status = ? OR (status = ? AND lease_expires < ?) '
+                'ORDER BY attempts, jobs.season_id, card_index LIMIT ?',
+                (JobStatus.PENDING, JobStatus.LEASED, now, limit)
+            ).fetchall()
+            conn.executemany(
+                'UPDATE jobs SET status = ?, owner = ?, lease_expires = ?, attempts = attempts + 1, '
+                'updated_at = ? WHERE season_id = ? AND card_index = ?',
+                [(JobStatus.LEASED, owner, now + lease_seconds, now, row['season_id'], row['card_index'])
+                 for row in rows]
+            )
+        return [{'season_id': row['season_id'], 'index': row['card_index'],
+                 'concept': json.loads(row['concept']), 'cache_slot': row['cache_slot'],
+                 'style': row['style'], 'attempts': row['attempts'] + 1}
+                for row in rows]
+
+    def heartbeat(self, owner: str, keys: Iterable[Tuple[str, int]],
+                  lease_seconds: float = DEFAULT_LEASE_SECONDS) -> int:
+        """실행 중인 작업의 lease 연장 → 연장된 작업 수 (다른 worker가 가져간 작업은 제외)"""
+
+        now = time.time()
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                'UPDATE jobs SET lease_expires = ?, updated_at = ? '
+                'WHERE season_id = ? AND card_index = ? AND owner = ? AND status = ?',
+                [(now + lease_seconds, now, season_id, index, owner, JobStatus.LEASED)
+                 for season_id, index in keys]
+            )
+            return conn.total_changes - before
+
+    def complete(self, owner: str, season_id: str, index: int, card: Dict) -> bool:
+        """작업 완료 기록 (lease를 잃었어도 업로드는 끝났으므로 결과를 저장)"""
+
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                'UPDATE jobs SET status = ?, owner = ?, result = ?, error = NULL, '
+                'lease_expires = NULL, updated_at = ? '
+                'WHERE season_id = ? AND card_index = ? AND status != ?',
+                (JobStatus.DONE, owner, json.dumps(card, ensure_ascii=False), time.time(),
+                 season_id, index, JobStatus.DONE)
+            )
+            return cursor.rowcount > 0
+
+    def fail(self, owner: str, season_id: str, index: int, error: str,
+             final: bool = False) -> Optional[str]:
+        """작업 실패 기록 → 새 상태 (다시 대기 / 실패 확정), lease를 잃었으면 None
+
+        final=True(콘텐츠 거부 등)이거나 attempts가 max_attempts에 도달하면 실패로 확정합니다.
+        """
+
+        with self._transaction() as conn:
+            row = conn.execute(
+                'SELECT attempts FROM jobs WHERE season_id = ? AND card_index = ? '
+                'AND owner = ? AND status = ?',
+                (season_id, index, owner, JobStatus.LEASED)
+            ).fetchone()
+            if row is None:
+                return None
+            status = JobStatus.FAILED if final or row['attempts'] >= self.max_attempts else JobStatus.PENDING
+            conn.execute(
+                'UPDATE jobs SET status = ?, owner = NULL, lease_expires = NULL, error = ?, '
+                'updated_at = ? WHERE season_id = ? AND card_index = ?',
+                (status, error, time.time(), season_id, index)
+            )
+            return status
+
+    def counts(self, season_id: Optional[str] = None) -> Dict[str, int]:
+        """상태별 작업 수 (season_id가 없으면 전체)"""
+
+        with self._transaction() as conn:
+            if season_id is None:
+                rows = conn.execute('SELECT status, COUNT(*) AS n FROM jobs GROUP BY status')
+            else:
+                rows = conn.execute('SELECT status, COUNT(*) AS n FROM jobs WHERE season_id = ? '
+                                    'GROUP BY status', (season_id,))
+            counts = {status: 0 for status in (JobStatus.PENDING, JobStatus.LEASED,
+                                               JobStatus.DONE, JobStatus.FAILED)}
+            counts.update({row['status']: row['n'] for row in rows})
+            return counts
+
+    def seasons(self) -> List[Dict]:
+        """큐의 시즌 목록 (상태별 작업 수, 커밋 여부 포함)"""
+
+        with self._transaction() as conn:
+            seasons = [dict(row) for row in conn.execute('SELECT * FROM seasons ORDER BY created_at')]
+        for season in seasons:
+            season['jobs'] = self.counts(season['season_id'])
+        return seasons
+
+    def claim_commit(self, season_id: str, owner: str) -> bool:
+        """시즌 작업이 모두 끝났고 아직 커밋되지 않았으면 커밋 권한 획득 (한 worker만 True)"""
+
+        with self._transaction() as conn:
+            active = conn.execute(
+                'SELECT COUNT(*) FROM jobs WHERE season_id = ? AND status IN (?, ?)',
+                (season_id, JobStatus.PENDING, JobStatus.LEASED)
+            ).fetchone()[0]
+            if active:
+                return False
+            cursor = conn.execute(
+                'UPDATE seasons SET committed_by = ?, committed_at = ? '
+                'WHERE season_id = ? AND committed_by IS NULL',
+                (owner, time.time(), season_id)
+            )
+            return cursor.rowcount > 0
+
+    def release_commit(self, season_id: str):
+        """커밋 실패 시 권한 반환 (다음 worker / 재실행이 다시 커밋)"""
+
+        with self._transaction() as conn:
+            conn.execute('UPDATE seasons SET committed_by = NULL, committed_at = NULL '
+                         'WHERE season_id = ?', (season_id,))
+
+    def results(self, season_id: str) -> List[Dict]:
+        """완료된 카드 (인덱스 순서)"""
+
+        with self._transaction() as conn:
+            rows = conn.execute('SELECT result FROM jobs WHERE season_id = ? AND status = ? '
+                                'ORDER BY card_index', (season_id, JobStatus.DONE)).fetchall()
+        return [json.loads(row['result']) for row in rows]
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+이미지 모델 라우팅 / hedged 요청
+
+- 희귀도별 기본 모델 (예: Secret은 gemini-imagen4, 나머지는 recraft-v3)
+- 모델별 최근 지연 시간 / 오류율 (이동 윈도우)
+  지연 시간 표본은 성공한 요청만, 취소된 요청은 당시 hedge 대기 시간 이상으로 잘린 표본 (censored)
+  실패한 요청은 오류율에만 반영 (빠른 429가 p95를 끌어내려 hedge가 점점 빨라지지 않도록)
+- hedge: 요청이 관측된 p95를 넘기면 백업 모델로 같은 요청을 한 번 더 보내고 먼저 끝난 결과 사용
+- 백업 순서: 건강한 모델 → 지연 시간(p95) → 단가 순 (오류율이 높은 기본 모델은 뒤로)
+
+GenSparkSDK 클라이언트 하나가 모든 모델을 처리하므로 모델 이름만 바꿔서 요청합니다.
+"""
+
+import math
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Sequence
+
+from card_allocation import RARITY_ORDER
+from run_metrics import MODEL_COSTS, percentile
+
+DEFAULT_MODEL = 'recraft-v3'
+
+WINDOW_SIZE = 200  # 모델별 최근 요청 수
+MIN_SAMPLES = 20  # p95 / 오류율을 믿을 수 있는 최소 요청 수
+DEFAULT_HEDGE_QUANTILE = 95.0
+MIN_HEDGE_DELAY = 2.0  # p95가 아주 짧아도 이 시간(초)은 기다린 뒤 hedge
+INITIAL_HEDGE_DELAY = 30.0  # 표본이 모이기 전 hedge 대기 시간 (초, SDK timeout 120초보다 짧게)
+UNHEALTHY_ERROR_RATE = 0.5  # 이 오류율 이상이면 기본 모델이어도 백업보다 뒤로
+
+
+class ModelRoutingError(ValueError):
+    """모델 스펙 오류"""
+
+
+def parse_model_spec(spec: str, default: str = DEFAULT_MODEL) -> Dict[str, str]:
+    """희귀도별 모델 스펙 → {rarity: model}
+
+    'recraft-v3' (모든 희귀도) / 'recraft-v3,ultraRare=flux-2-pro,secret=gemini-imagen4'
+    """
+
+    models = {}
+    for item in spec.split(','):
+        if not item.strip():
+            continue
+        name, sep, value = item.partition('=')
+        if sep:
+            if name.strip() not in RARITY_ORDER:
+                raise ModelRoutingError(f"unknown rarity: {name.strip()} "
+                                        f"(expected {', '.join(RARITY_ORDER)})")
+            models[name.strip()] = value.strip()
+        else:
+            default = name.strip()
+    for model in {default, *models.values()}:
+        if not model:
+            raise ModelRoutingError("empty model name in model spec")
+    return {rarity: models.get(rarity, default) for rarity in RARITY_ORDER}
+
+
+class ModelStats:
+    """모델 1개의 최근 요청 지연 시간 / 성공 여부 (이동 윈도우)"""
+
+    def __init__(self, window: int = WINDOW_SIZE):
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)
+        self.cancelled = 0
+
+    def record(self, latency: float, ok: bool):
+        """끝난 요청: 성공만 지연 시간 표본, 실패는 오류율에만"""
+        if ok:
+            self.latencies.append(latency)
+        self.outcomes.append(ok)
+
+    def record_cancelled(self, latency: float):
+        """취소된 요청: 실제 지연 시간은 latency 이상 (오류율에는 넣지 않음)"""
+        self.latencies.append(latency)
+        self.cancelled += 1
+
+    @property
+    def samples(self) -> int:
+        return len(self.outcomes)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """지연 시간 백분위수 (표본이 부족하면 None)"""
+        if len(self.latencies) < MIN_SAMPLES:
+            return None
+        return percentile(sorted(self.latencies), q)
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return 1 - sum(self.outcomes) / len(self.outcomes)
+
+
+def _rounded(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 4)
+
+
+class ModelRouter:
+    """희귀도별 모델 선택 + hedge 시점 계산 (시즌 / 작업자 간 공유, 스레드 안전)"""
+
+    def __init__(self, models: Optional[Dict[str, str]] = None,
+                 backups: Sequence[str] = (),
+                 hedge_quantile: float = DEFAULT_HEDGE_QUANTILE,
+                 min_hedge_delay: float = MIN_HEDGE_DELAY,
+                 initial_hedge_delay: Optional[float] = INITIAL_HEDGE_DELAY,
+                 window: int = WINDOW_SIZE):
+        self.models = models or {rarity: DEFAULT_MODEL for rarity in RARITY_ORDER}
+        self.backups = list(dict.fromkeys(backups))
+        self.hedge_quantile = hedge_quantile
+        self.min_hedge_delay = min_hedge_delay
+        self.initial_hedge_delay = initial_hedge_delay
+        self._window = window
+        self._stats: Dict[str, ModelStats] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, model: str) -> ModelStats:
+        """lock 보유 상태에서 호출"""
+        if model not in self._stats:
+            self._stats[model] = ModelStats(self._window)
+        return self._stats[model]
+
+    @property
+    def label(self) -> str:
+        """리포트 / 메트릭 라벨용 모델 이름 (희귀도별로 다르면 쉼표로 연결)"""
+        return ','.join(dict.fromkeys(self.models[rarity] for rarity in RARITY_ORDER
+                                      if rarity in self.models)) or DEFAULT_MODEL
+
+    def primary(self, rarity: str) -> str:
+        """희귀도의 기본 모델 (캐시 키 / 리포트 기준)"""
+        return self.models.get(rarity, DEFAULT_MODEL)
+
+    def candidates(self, rarity: str) -> List[str]:
+        """요청 순서: [기본 모델, 백업...] (오류율이 높은 모델은 뒤로, 백업은 p95 → 단가 순)"""
+
+        primary = self.primary(rarity)
+        with self._lock:
+            def unhealthy(model: str) -> bool:
+                stats = self._get(model)
+                return stats.samples >= MIN_SAMPLES and stats.error_rate >= UNHEALTHY_ERROR_RATE
+
+            def backup_order(model: str):
+                p95 = self._get(model).quantile(self.hedge_quantile)
+                return unhealthy(model), p95 if p95 is not None else math.inf, MODEL_COSTS.get(model, math.inf)
+
+            backups = sorted((model for model in self.backups if model != primary), key=backup_order)
+            if backups and unhealthy(primary) and not unhealthy(backups[0]):
+                return backups[:1] + [primary] + backups[1:]
+        return [primary] + backups
+
+    def hedge_delay(self, model: str) -> Optional[float]:
+        """이 모델 요청을 hedge하기 전 대기 시간 (백업이 없으면 None)
+
+        표본이 부족하면 initial_hedge_delay, 이후에는 관측된 p95 (최소 min_hedge_delay)
+        """
+
+        if not self.backups:
+            return None
+        with self._lock:
+            return self._delay(self._get(model))
+
+    def _delay(self, stats: ModelStats) -> Optional[float]:
+        """lock 보유 상태에서 호출"""
+        p95 = stats.quantile(self.hedge_quantile)
+        if p95 is None:
+            return self.initial_hedge_delay
+        return max(self.min_hedge_delay, p95)
+
+    def record(self, model: str, latency: float, ok: bool):
+        """끝난 요청 결과 기록 (실패한 요청의 지연 시간은 표본에 넣지 않음)"""
+        with self._lock:
+            self._get(model).record(latency, ok)
+
+    def record_cancelled(self, model: str, latency: float):
+        """취소된 요청 기록 (hedge에 져서 취소돼도 표본은 현재 hedge 대기 시간 이상)"""
+        with self._lock:
+            stats = self._get(model)
+            stats.record_cancelled(max(latency, self._delay(stats) or 0.0))
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """모델별 표본 수 / p50 / p95 / 오류율 (리포트용)"""
+
+        with self._lock:
+            return {
+                model: {
+                    'samples': stats.samples,
+                    'cancelled': stats.cancelled,
+                    'p50': _rounded(stats.quantile(50)),
+                    'p95': _rounded(stats.quantile(self.hedge_quantile)),
+                    'error_rate': round(stats.error_rate, 4),
+                }
+                for model, stats in self._stats.items()
+            }
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+이미지 생성 재시도 / rate limit 스케줄러
+
+- 오류 분류: timeout / 429 rate limit / 할당량 소진 / 콘텐츠 거부 / URL 없음 / 일시 오류
+- 지수 백오프 + full jitter (오류 종류별 시도 횟수와 대기 시간, 시도 횟수는 종류마다 따로 셈)
+- 동시 작업자가 공유하는 token bucket rate limiter
+  (429 발생 시 전체 일시정지 + 요청 속도 절반, 성공 시 서서히 회복)
+"""
+
+import re
+import time
+import random
+import asyncio
+from typing import Dict, Optional
+
+
+class ErrorKind:
+    TIMEOUT = 'timeout'
+    RATE_LIMIT = 'rate_limit'
+    QUOTA_EXHAUSTED = 'quota_exhausted'
+    CONTENT_REJECTED = 'content_rejected'
+    NO_IMAGE = 'no_image'
+    TRANSIENT = 'transient'
+
+
+class NoImageInResultError(Exception):
+    """생성 결과에 이미지 URL이 없음"""
+
+
+# 오류 종류별 최대 시도 횟수 (첫 시도 포함)
+DEFAULT_MAX_ATTEMPTS = {
+    ErrorKind.TIMEOUT: 3,
+    ErrorKind.RATE_LIMIT: 6,
+    ErrorKind.QUOTA_EXHAUSTED: 1,  # 월 할당량 / 크레딧 소진은 기다려도 풀리지 않음
+    ErrorKind.CONTENT_REJECTED: 1,  # 같은 프롬프트는 다시 거부됨
+    ErrorKind.NO_IMAGE: 2,
+    ErrorKind.TRANSIENT: 3,
+}
+
+# 오류 종류별 백오프 기본값 (초)
+BACKOFF_BASE = {
+    ErrorKind.TIMEOUT: 2.0,
+    ErrorKind.RATE_LIMIT: 5.0,
+    ErrorKind.QUOTA_EXHAUSTED: 0.0,
+    ErrorKind.CONTENT_REJECTED: 0.0,
+    ErrorKind.NO_IMAGE: 1.0,
+    ErrorKind.TRANSIENT: 1.0,
+}
+BACKOFF_MAX = 60.0
+
+# 기본 요청 속도 (초당 생성 요청 수)
+DEFAULT_RATE_LIMIT = 2.0
+
+# 상태 코드가 없는 예외의 메시지 대체 판정 ('429'는 단어 단위로만: 4290x2160, 요청 ID 84291 제외)
+_RATE_LIMIT_PATTERN = re.compile(r'\b429\b|rate limit|ratelimit|too many requests')
+_QUOTA_MARKERS = ('quota exceeded', 'quota exhausted', 'insufficient quota', 'insufficient_quota',
+                  'out of credits', 'insufficient credits')
+_CONTENT_MARKERS = ('content policy', 'safety', 'moderation', 'nsfw', 'prohibited')
+_TIMEOUT_MARKERS = ('timeout', 'timed out', 'deadline')
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    """예외에서 HTTP 상태 코드 추출"""
+
+    for source in (error, getattr(error, 'response', None)):
+        for attr in ('status_code', 'status', 'code'):
+            value = getattr(source, attr, None)
+            if isinstance(value, int):
+                return value
+    return None
+
+
+def _classify(error: Exception, content: bool) -> str:
+    if isinstance(error, NoImageInResultError):
+        return ErrorKind.NO_IMAGE
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError)):
+        return ErrorKind.TIMEOUT
+
+    status = _status_code(error)
+    if status == 429:
+        return ErrorKind.RATE_LIMIT
+    if content and status in (400, 403, 422):
+        return ErrorKind.CONTENT_REJECTED
+    if status in (408, 504):
+        return ErrorKind.TIMEOUT
+
+    message = str(error).lower()
+    if any(marker in message for marker in _QUOTA_MARKERS):
+        return ErrorKind.QUOTA_EXHAUSTED
+    if _RATE_LIMIT_PATTERN.search(message):
+        return ErrorKind.RATE_LIMIT
+    if content and any(marker in message for marker in _CONTENT_MARKERS):
+        return ErrorKind.CONTENT_REJECTED
+    if any(marker in message for marker in _TIMEOUT_MARKERS):
+        return ErrorKind.TIMEOUT
+
+    return ErrorKind.TRANSIENT
+
+
+def classify_error(error: Exception) -> str:
+    """provider 생성 오류 → ErrorKind (400/403/422, 정책 위반 메시지는 콘텐츠 거부)"""
+    return _classify(error, content=True)
+
+
+def classify_transfer_error(error: Exception) -> str:
+    """다운로드 / Storage 업로드 오류 → ErrorKind (콘텐츠 거부 없음: 403, 만료된 URL도 다시 시도)"""
+    return _classify(error, content=False)
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Retry-After 힌트 추출 (있는 경우)"""
+
+    value = getattr(error, 'retry_after', None)
+    if value is None:
+        headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+        value = headers.get('Retry-After') if hasattr(headers, 'get') else None
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """오류 종류별 재시도 정책"""
+
+    def __init__(self, max_attempts: Optional[Dict[str, int]] = None,
+                 max_delay: float = BACKOFF_MAX):
+        self.max_attempts = dict(DEFAULT_MAX_ATTEMPTS)
+        if max_attempts:
+            self.max_attempts.update(max_attempts)
+        self.max_delay = max_delay
+
+    @classmethod
+    def with_max_retries(cls, max_retries: int) -> 'RetryPolicy':
+        """재시도 횟수 상한 일괄 적용 (콘텐츠 거부는 그대로 재시도 없음)"""
+
+        return cls({
+            kind: min(attempts, max_retries + 1)
+            for kind, attempts in DEFAULT_MAX_ATTEMPTS.items()
+        })
+
+    def should_retry(self, kind: str, attempt: int) -> bool:
+        """attempt: 이 종류의 오류로 끝난 시도 횟수 (1부터)"""
+        return attempt < self.max_attempts.get(kind, 1)
+
+    def delay(self, kind: str, attempt: int, error: Optional[Exception] = None) -> float:
+        """지수 백오프 + full jitter 대기 시간"""
+
+        hint = retry_after_seconds(error) if error is not None else None
+        if hint is not None:
+            return min(self.max_delay, hint)
+
+        base = BACKOFF_BASE.get(kind, 1.0)
+        ceiling = min(self.max_delay, base * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+
+class TokenBucket:
+    """동시 작업자가 공유하는 적응형 token bucket (asyncio)"""
+
+    def __init__(self, rate: float = DEFAULT_RATE_LIMIT, capacity: Optional[float] = None,
+                 min_rate: Optional[float] = None):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate or rate / 16
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """토큰 1개 획득 (FIFO 대기)"""
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def penalize(self, pause: float):
+        """429 발생: 전체 작업자 일시정지 + 요청 속도 절반"""
+
+        self._paused_until = max(self._paused_until, time.monotonic() + pause)
+        self.rate = max(self.min_rate, self.rate / 2)
+        self._tokens = 0
+        self._updated = self._paused_until
+
+    def reward(self):
+        """성공: 요청 속도를 최대치까지 서서히 회복"""
+        self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+시즌 생성 실행 계측 (단계별 시간 / 바이트 / 재시도 / 비용)
+
+- 카드별, 단계별 timing span 기록 (스레드 안전)
+- 단계별 p50 / p95 / max 요약
+- 출력: JSON 리포트, JSONL span 이벤트, Prometheus text 파일
+"""
+
+import os
+import json
+import math
+import time
+import threading
+from contextlib import contextmanager
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# 모델별 이미지 1장 단가 (USD, README 비용표 기준)
+MODEL_COSTS = {
+    'recraft-v3': 0.02,
+    'flux-2-pro': 0.04,
+    'gemini-imagen4': 0.08,
+}
+
+# 기본 리포트 디렉토리 (스크립트 위치 기준)
+DEFAULT_REPORT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'reports')
+
+
+class Stage:
+    CARD = 'card'
+    PROMPT = 'prompt'
+    QUEUE_WAIT = 'queue_wait'  # 동시성 세마포어 대기
+    CACHE_LOOKUP = 'cache_lookup'
+    QUALITY_CHECK = 'quality_check'  # 지각 해시 / 디테일 검사 (프로세스 풀)
+    SELECT = 'select'  # best-of-N 후보 다운로드 / 점수 / 선택
+    GENERATE = 'generate'
+    # 업로드로 바로 스트리밍하면 응답 헤더 수신까지 (본문은 upload에 포함),
+    # 파일로 받으면 본문 전체 (immutable 이름 / 품질 검사 / best-of 후보, export blob)
+    DOWNLOAD = 'download'
+    UPLOAD = 'upload'
+    VARIANTS = 'variants'  # 해상도 / 포맷 변형 생성 (프로세스 풀)
+    VARIANT_UPLOAD = 'variant_upload'
+    THUMBNAIL = 'thumbnail'  # 시즌 번들용 썸네일 (프로세스 풀)
+    BUNDLE = 'bundle'  # 아틀라스 + 매니페스트 생성 / 업로드
+    DIFF = 'diff'  # 차등 게시: 원격 상태 조회 / 로컬 해시 비교
+    SUPPLY = 'supply'  # 발행 수량 shard / 시즌 요약 문서
+    FIRESTORE_COMMIT = 'firestore_commit'
+
+
+def percentile(values: List[float], q: float) -> float:
+    """nearest-rank 백분위수 (values는 정렬된 상태)"""
+
+    if not values:
+        return 0.0
+    rank = math.ceil(q / 100 * len(values))
+    return values[max(0, min(len(values), rank) - 1)]
+
+
+class RunMetrics:
+    """시즌 1회 실행의 계측 데이터"""
+
+    def __init__(self, season_id: str, model: str, concurrency: int = 1):
+        self.season_id = season_id
+        self.model = model
+        self.concurrency = concurrency
+        self.started_at = datetime.now().isoformat()
+        self.spans: List[Dict] = []
+        self.bytes_transferred = 0
+        self.retries: Dict[str, int] = defaultdict(int)
+        self.skipped: Dict[str, int] = defaultdict(int)  # 차등 게시로 생략한 쓰기 (upload / document)
+        self.hedges: Dict[str, int] = defaultdict(int)  # 백업 모델 hedge 요청 (sent / won)
+        self.model_stats: Dict[str, Dict] = {}  # 모델별 최근 지연 시간 / 오류율 (ModelRouter.snapshot)
+        self.provider_calls: Dict[str, int] = defaultdict(int)
+        self.billed_images: Dict[str, int] = defaultdict(int)
+        self.cards: Dict[int, Dict] = {}
+        self.generated = 0
+        self.failed = 0
+        self.wall_clock = 0.0
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def _card(self, card_index: int) -> Dict:
+        """카드별 집계 항목 (lock 보유 상태에서 호출)"""
+        return self.cards.setdefault(card_index, {
+            'status': None, 'retries': 0, 'bytes': 0, 'stages': defaultdict(float)
+        })
+
+    def record(self, stage: str, duration: float, card_index: Optional[int] = None, **attrs):
+        """span 1개 기록"""
+
+        span = {'stage': stage, 'duration': duration,
+                'offset': time.perf_counter() - self._start - duration}
+        if card_index is not None:
+            span['card'] = card_index
+        span.update(attrs)
+
+        with self._lock:
+            self.spans.append(span)
+            if card_index is not None:
+                self._card(card_index)['stages'][stage] += duration
+
+    @contextmanager
+    def span(self, stage: str, card_index: Optional[int] = None, **attrs):
+        """with 블록 소요 시간 기록 (예외 발생 시 error 속성 추가)"""
+
+        start = time.perf_counter()
+        try:
+            yield attrs
+        except BaseException as e:
+            attrs['error'] = type(e).__name__
+            raise
+        finally:
+            self.record(stage, time.perf_counter() - start, card_index, **attrs)
+
+    def add_bytes(self, size: int, card_index: Optional[int] = None):
+        with self._lock:
+            self.bytes_transferred += size
+            if card_index is not None:
+                self._card(card_index)['bytes'] += size
+
+    def count_retry(self, kind: str, card_index: Optional[int] = None):
+        with self._lock:
+            self.retries[kind] += 1
+            if card_index is not None:
+                self._card(card_index)['retries'] += 1
+
+    def count_skipped(self, kind: str):
+        """원격과 같아서 생략한 쓰기 1회"""
+        with self._lock:
+            self.skipped[kind] += 1
+
+    def count_hedge(self, kind: str):
+        """hedge 요청 1회 (sent: 보냄, won: 기본 모델보다 먼저 성공)"""
+        with self._lock:
+            self.hedges[kind] += 1
+
+    def count_provider_call(self, model: str, billed: bool, images: int = 1):
+        """provider 호출 1회 (이미지가 반환된 호출만 반환된 장수만큼 과금으로 추정)"""
+        with self._lock:
+            self.provider_calls[model] += 1
+            if billed:
+                self.billed_images[model] += images
+
+    def set_card_status(self, card_index: int, status: str):
+        with self._lock:
+            self._card(card_index)['status'] = status
+
+    def finish(self, generated: int, failed: int):
+        """실행 종료 시각 / 결과 기록"""
+        self.generated = generated
+        self.failed = failed
+        self.wall_clock = time.perf_counter() - self._start
+
+    @property
+    def estimated_cost(self) -> float:
+        return sum(MODEL_COSTS.get(model, 0.0) * count
+                   for model, count in self.billed_images.items())
+
+    def stage_summary(self) -> Dict[str, Dict]:
+        """단계별 count / total / p50 / p95 / max"""
+
+        durations = defaultdict(list)
+        with self._lock:
+            for span in self.spans:
+                durations[span['stage']].append(span['duration'])
+
+        summary = {}
+        for stage, values in durations.items():
+            values.sort()
+            summary[stage] = {
+                'count': len(values),
+                'total': round(sum(values), 4),
+                'p50': round(percentile(values, 50), 4),
+                'p95': round(percentile(values, 95), 4),
+                'max': round(values[-1], 4),
+            }
+        return summary
+
+    def report(self) -> Dict:
+        """머신 리더블 실행 리포트"""
+
+        with self._lock:
+            cards = {
+                str(index): dict(card, stages={k: round(v, 4) for k, v in card['stages'].items()})
+                for index, card in sorted(self.cards.items())
+            }
+
+        return {
+            'season_id': self.season_id,
+            'model': self.model,
+            'concurrency': self.concurrency,
+            'started_at': self.started_at,
+            'wall_clock': round(self.wall_clock, 3),
+            'generated': self.generated,
+            'failed': self.failed,
+            'bytes_transferred': self.bytes_transferred,
+            'retries': dict(self.retries),
+            'skipped': dict(self.skipped),
+            'hedges': dict(self.hedges),
+            'model_stats': self.model_stats,
+            'provider_calls': dict(self.provider_calls),
+            'billed_images': dict(self.billed_images),
+            'estimated_cost': round(self.estimated_cost, 4),
+            'stages': self.stage_summary(),
+            'cards': cards,
+        }
+
+    def write_report(self, report_dir: str = DEFAULT_REPORT_DIR) -> str:
+        """JSON 리포트 + JSONL span 파일 저장, 리포트 경로 반환"""
+
+        os.makedirs(report_dir, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        base = os.path.join(report_dir, f'{self.season_id}_{stamp}')
+
+        with open(base + '.json', 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+
+        with self._lock:
+            spans = list(self.spans)
+        with open(base + '.spans.jsonl', 'w', encoding='utf-8') as f:
+            for span in spans:
+                f.write(json.dumps(dict(span, season_id=self.season_id), ensure_ascii=False) + '\n')
+
+        return base + '.json'
+
+    def write_prometheus(self, path: str):
+        """Prometheus text exposition 형식으로 저장 (node_exporter textfile collector용)"""
+
+        labels = f'season="{self.season_id}",model="{self.model}"'
+        lines = [
+            '# HELP weekly_gacha_stage_seconds Per-stage latency of card generation.',
+            '# TYPE weekly_gacha_stage_seconds summary',
+        ]
+        for stage, stats in sorted(self.stage_summary().items()):
+            stage_labels = f'{labels},stage="{stage}"'
+            lines.append(f'weekly_gacha_stage_seconds{{{stage_labels},quantile="0.5"}} {stats["p50"]}')
+            lines.append(f'weekly_gacha_stage_seconds{{{stage_labels},quantile="0.95"}} {stats["p95"]}')
+            lines.append(f'weekly_gacha_stage_seconds_sum{{{stage_labels}}} {stats["total"]}')
+            lines.append(f'weekly_gacha_stage_seconds_count{{{stage_labels}}} {stats["count"]}')
+
+        lines += [
+            '# HELP weekly_gacha_run_seconds Wall-clock time of the season run.',
+            '# TYPE weekly_gacha_run_seconds gauge',
+            f'weekly_gacha_run_seconds{{{labels}}} {self.wall_clock:.3f}',
+            '# HELP weekly_gacha_cards Cards by final status.',
+            '# TYPE weekly_gacha_cards gauge',
+            f'weekly_gacha_cards{{{labels},status="generated"}} {self.generated}',
+            f'weekly_gacha_cards{{{labels},status="failed"}} {self.failed}',
+            '# HELP weekly_gacha_bytes_transferred Image bytes transferred.',
+            '# TYPE weekly_gacha_bytes_transferred gauge',
+            f'weekly_gacha_bytes_transferred{{{labels}}} {self.bytes_transferred}',
+            '# HELP weekly_gacha_retries Retries by error kind.',
+            '# TYPE weekly_gacha_retries gauge',
+        ]
+        for kind, count in sorted(self.retries.items()):
+            lines.append(f'weekly_gacha_retries{{{labels},kind="{kind}"}} {count}')
+        lines += [
+            '# HELP weekly_gacha_skipped_writes Writes skipped because the remote copy was unchanged.',
+            '# TYPE weekly_gacha_skipped_writes gauge',
+        ]
+        for kind, count in sorted(self.skipped.items()):
+            lines.append(f'weekly_gacha_skipped_writes{{{labels},kind="{kind}"}} {count}')
+        lines += [
+            '# HELP weekly_gacha_estimated_cost_usd Estimated provider cost of the run.',
+            '# TYPE weekly_gacha_estimated_cost_usd gauge',
+            f'weekly_gacha_estimated_cost_usd{{{labels}}} {self.estimated_cost:.4f}',
+        ]
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp_path, path)
+
+    def print_summary(self):
+        """단계별 요약 표 출력"""
+
+        print(f"{'stage':<18}{'count':>7}{'p50':>9}{'p95':>9}{'max':>9}")
+        for stage, stats in sorted(self.stage_summary().items(), key=lambda x: -x[1]['total']):
+            print(f"{stage:<18}{stats['count']:>7}{stats['p50']:>9.2f}{stats['p95']:>9.2f}{stats['max']:>9.2f}")
+        print(f"📦 Bytes: {self.bytes_transferred / (1024 * 1024):.1f} MB  "
+              f"🔁 Retries: {sum(self.retries.values())}  "
+              f"💰 Est. Cost: ${self.estimated_cost:.2f}")
+        if self.hedges:
+            print(f"🏁 Hedged requests: {self.hedges.get('sent', 0)} sent, "
+                  f"{self.hedges.get('won', 0)} won")
+        if self.skipped:
+            print("⏭️  Skipped unchanged: " + ', '.join(
+                f"{count} {kind}s" for kind, count in sorted(self.skipped.items())))
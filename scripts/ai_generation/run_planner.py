@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+실행 계획 예측 (plan 명령, 네트워크 / Firebase / 크레딧 불필요)
+
+이전 실행 리포트(reports/*.json + *.spans.jsonl)의 모델별 호출 지연 시간 / 오류율 / 카드 후처리 시간을
+표본으로, 요청한 설정(카드 수, 동시성, rate limit, 재시도, hedge, best-of, 변형)의 스케줄을
+몬테카를로로 시뮬레이션해서 소요 시간 / 비용 백분위수를 예측합니다.
+- provider 호출: 동시성 슬롯 + rate limit 토큰 필요, 재시도 동안 슬롯 유지 (생성기와 동일)
+- 오류: 모델별 오류율, 오류 종류는 리포트의 재시도 분포, 대기 시간은 RetryPolicy 백오프
+- hedge: 표본 p95를 넘긴 호출은 백업 모델 표본과 경쟁 (취소된 호출도 과금으로 보수적 계산)
+- 후처리(다운로드 / 업로드 / 품질 검사 / 변형): 슬롯 밖에서 병렬
+기록이 없는 모델은 README 기준 사전값(호출 20-30초, 업로드 1-2초)을 씁니다.
+429 발생 시 전체 일시정지 / 캐시 적중 / 품질 검사 재생성은 반영하지 않습니다 (보수적).
+"""
+
+import os
+import glob
+import json
+import heapq
+import random
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Sequence
+
+from retry_policy import RetryPolicy, ErrorKind, BACKOFF_BASE
+from run_metrics import MODEL_COSTS, Stage, percentile, DEFAULT_REPORT_DIR
+
+DEFAULT_HISTORY_RUNS = 20  # 최근 리포트 수
+DEFAULT_TRIALS = 100
+
+# 기록이 없을 때 사전값
+PRIOR_LATENCY = 25.0  # 호출 지연 시간 중앙값 (초)
+PRIOR_LATENCY_SIGMA = 0.3
+PRIOR_ERROR_RATE = 0.05
+PRIOR_POST_SECONDS = 1.5  # 다운로드 + 업로드
+PRIOR_VARIANT_SECONDS = 1.0
+PRIOR_SAMPLES = 200
+
+# 카드 후처리 단계 (슬롯 밖), 변형 관련 단계는 변형 사용 시에만
+POST_STAGES = (Stage.DOWNLOAD, Stage.UPLOAD, Stage.QUALITY_CHECK, Stage.SELECT)
+VARIANT_STAGES = (Stage.VARIANTS, Stage.VARIANT_UPLOAD, Stage.THUMBNAIL)
+
+
+class RunHistory:
+    """이전 실행 리포트에서 모은 표본 (모델별 호출 지연 / 오류, 카드 후처리 시간)"""
+
+    def __init__(self):
+        self.runs = 0
+        self.latencies: Dict[str, List[float]] = defaultdict(list)  # 성공한 호출
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.error_kinds: Dict[str, int] = defaultdict(int)  # 리포트 retries
+        self.post: List[float] = []
+        self.variants: List[float] = []
+        self._priors: Dict[str, List[float]] = {}
+
+    @classmethod
+    def load(cls, report_dir: str = DEFAULT_REPORT_DIR,
+             limit: int = DEFAULT_HISTORY_RUNS) -> 'RunHistory':
+        """최근 리포트 limit개 읽기 (읽을 수 없는 파일은 건너뜀)"""
+
+        history = cls()
+        paths = sorted(glob.glob(os.path.join(report_dir, '*.json')), key=os.path.getmtime)
+        for path in paths[-limit:] if limit else paths:
+            try:
+                with open(path, encoding='utf-8') as f:
+                    report = json.load(f)
+                history._add_report(report, path[:-len('.json')] + '.spans.jsonl')
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+        return history
+
+    def _add_report(self, report: Dict, spans_path: str):
+        default_model = report.get('model') or ''
+        if os.path.exists(spans_path):
+            with open(spans_path, encoding='utf-8') as f:
+                for line in f:
+                    span = json.loads(line)
+                    if span.get('stage') != Stage.GENERATE or span.get('error') == 'CancelledError':
+                        continue
+                    # 희귀도별 모델 리포트는 라벨이 쉼표로 연결됨 → span의 model 속성 우선
+                    model = span.get('model') or default_model.split(',')[0]
+                    self.calls[model] += 1
+                    if span.get('error'):
+                        self.errors[model] += 1
+                    else:
+                        self.latencies[model].append(span['duration'])
+
+        for kind, count in (report.get('retries') or {}).items():
+            self.error_kinds[kind] += count
+
+        for card in (report.get('cards') or {}).values():
+            stages = card.get('stages') or {}
+            if not stages.get(Stage.UPLOAD):
+                continue
+            self.post.append(sum(stages.get(stage, 0.0) for stage in POST_STAGES))
+            variants = sum(stages.get(stage, 0.0) for stage in VARIANT_STAGES)
+            if variants:
+                self.variants.append(variants)
+        self.runs += 1
+
+    def has_model(self, model: str) -> bool:
+        return bool(self.latencies.get(model))
+
+    def latency_samples(self, model: str) -> List[float]:
+        """성공 호출 지연 시간 표본 (기록이 없으면 로그정규 사전값)"""
+
+        if self.latencies.get(model):
+            return self.latencies[model]
+        if model not in self._priors:
+            rng = random.Random(model)
+            self._priors[model] = sorted(PRIOR_LATENCY * rng.lognormvariate(0, PRIOR_LATENCY_SIGMA)
+                                         for _ in range(PRIOR_SAMPLES))
+        return self._priors[model]
+
+    def error_rate(self, model: str) -> float:
+        if not self.calls.get(model):
+            return PRIOR_ERROR_RATE
+        return self.errors[model] / self.calls[model]
+
+    def retry_kinds(self) -> Dict[str, float]:
+        """오류 종류 분포 (콘텐츠 거부 포함, 기록이 없으면 일시 오류)"""
+
+        total = sum(self.error_kinds.values())
+        if not total:
+            return {ErrorKind.TRANSIENT: 1.0}
+        return {kind: count / total for kind, count in self.error_kinds.items()}
+
+    def post_samples(self, variants: bool) -> List[float]:
+        """카드 후처리 시간 표본 (변형 포함 여부)"""
+
+        post = self.post or [PRIOR_POST_SECONDS]
+        if not variants:
+            return post
+        extra = self.variants or [PRIOR_VARIANT_SECONDS]
+        return [value + extra[i % len(extra)] for i, value in enumerate(post)]
+
+
+def _backoff(rng: random.Random, policy: RetryPolicy, kind: str, attempt: int) -> float:
+    """RetryPolicy와 같은 지수 백오프 + full jitter (시드 고정 난수)"""
+    ceiling = min(policy.max_delay, BACKOFF_BASE.get(kind, 1.0) * (2 ** (attempt - 1)))
+    return rng.uniform(0, ceiling)
+
+
+def simulate_schedule(history: RunHistory, card_models: Sequence[str], card_images: Sequence[int],
+                      concurrency: int, rate_limit: float, policy: RetryPolicy,
+                      backups: Sequence[str] = (), hedge_quantile: float = 95.0,
+                      min_hedge_delay: float = 0.0, variants: bool = False,
+                      rng: Optional[random.Random] = None) -> Dict:
+    """시즌 1회 스케줄 시뮬레이션 → {wall_clock, cost, calls, hedges, failed}"""
+
+    rng = rng or random.Random()
+    interval = 1.0 / rate_limit if rate_limit > 0 else 0.0
+    next_token = -interval * (max(1, concurrency) - 1)  # 버킷 용량 = 동시성 (시작 시 burst)
+    kinds = history.retry_kinds()
+    kind_names, kind_weights = list(kinds), list(kinds.values())
+    post = history.post_samples(variants)
+
+    backup = None
+    if backups:
+        backup = min(backups, key=lambda model: (percentile(sorted(history.latency_samples(model)),
+                                                            hedge_quantile),
+                                                 MODEL_COSTS.get(model, 0.0)))
+    hedge_delays = {
+        model: max(min_hedge_delay, percentile(sorted(history.latency_samples(model)), hedge_quantile))
+        for model in set(card_models) if backup and model != backup
+    }
+
+    # 이벤트: (요청 가능 시각, 카드 순번, 시도 횟수) → 시각 순서로 토큰 배정
+    events = [(0.0, card, 1) for card in range(min(max(1, concurrency), len(card_models)))]
+    heapq.heapify(events)
+    next_card = len(events)
+    kind_attempts = defaultdict(Counter)  # 카드 → 오류 종류별 시도 횟수 (생성기와 같은 기준)
+    wall_clock = cost = 0.0
+    calls = hedges = failed = 0
+    while events:
+        ready, card, attempt = heapq.heappop(events)
+        model, images = card_models[card], card_images[card]
+        start = max(ready, next_token)
+        next_token = start + interval
+        calls += 1
+
+        latency = rng.choice(history.latency_samples(model))
+        delay = hedge_delays.get(model)
+        if delay is not None and latency > delay:
+            hedges += 1
+            cost += MODEL_COSTS.get(backup, 0.0) * images
+            latency = min(latency, delay + rng.choice(history.latency_samples(backup)))
+        now = start + latency
+
+        if rng.random() < history.error_rate(model):
+            kind = rng.choices(kind_names, kind_weights)[0]
+            kind_attempts[card][kind] += 1
+            tries = kind_attempts[card][kind]
+            if policy.should_retry(kind, tries):
+                # 백오프 동안 슬롯 유지
+                heapq.heappush(events, (now + _backoff(rng, policy, kind, tries), card, attempt + 1))
+                continue
+            failed += 1
+        else:
+            cost += MODEL_COSTS.get(model, 0.0) * images
+            wall_clock = max(wall_clock, now + rng.choice(post))
+
+        # 슬롯 반환 → 다음 카드
+        wall_clock = max(wall_clock, now)
+        if next_card < len(card_models):
+            heapq.heappush(events, (now, next_card, 1))
+            next_card += 1
+
+    return {'wall_clock': wall_clock, 'cost': cost, 'calls': calls, 'hedges': hedges,
+            'failed': failed}
+
+
+def predict(history: RunHistory, card_models: Sequence[str], card_images: Sequence[int],
+            concurrency: int, rate_limit: float, policy: Optional[RetryPolicy] = None,
+            backups: Sequence[str] = (), min_hedge_delay: float = 0.0, variants: bool = False,
+            trials: int = DEFAULT_TRIALS, seed: Optional[int] = None) -> Dict:
+    """trials회 시뮬레이션 → 소요 시간 / 비용 / 호출 수 백분위수"""
+
+    rng = random.Random(seed)
+    policy = policy or RetryPolicy()
+    runs = [simulate_schedule(history, card_models, card_images, concurrency, rate_limit, policy,
+                              backups, min_hedge_delay=min_hedge_delay, variants=variants, rng=rng)
+            for _ in range(max(1, trials))]
+
+    def summary(key: str) -> Dict:
+        values = sorted(run[key] for run in runs)
+        return {'p50': round(percentile(values, 50), 4), 'p90': round(percentile(values, 90), 4),
+                'p99': round(percentile(values, 99), 4), 'max': round(values[-1], 4)}
+
+    models = sorted(set(card_models) | set(backups))
+    return {
+        'cards': len(card_models),
+        'trials': len(runs),
+        'wall_clock': summary('wall_clock'),
+        'cost': summary('cost'),
+        'calls': summary('calls'),
+        'hedges': summary('hedges'),
+        'failed': summary('failed'),
+        'history_runs': history.runs,
+        'models': {
+            model: {
+                'samples': len(history.latencies.get(model, [])),
+                'p50': round(percentile(sorted(history.latency_samples(model)), 50), 3),
+                'p95': round(percentile(sorted(history.latency_samples(model)), 95), 3),
+                'error_rate': round(history.error_rate(model), 4),
+                'prior': not history.has_model(model),
+            }
+            for model in models
+        },
+    }
+
+
+def format_duration(seconds: float) -> str:
+    """초 → 읽기 쉬운 시간 (45s / 12.5 min / 2.1 h)"""
+    if seconds < 90:
+        return f'{seconds:.0f}s'
+    if seconds < 90 * 60:
+        return f'{seconds / 60:.1f} min'
+    return f'{seconds / 3600:.1f} h'
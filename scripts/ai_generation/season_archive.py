@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+시즌 아카이브 (export / import, Firebase 프로젝트 간 승격)
+
+게시된 시즌 하나(Storage blob + Firestore 문서)를 압축 파일 1개로 내보내고
+다른 프로젝트 / 버킷에 재생성 없이(생성 비용 0) 복원합니다.
+- 형식: ZIP (중앙 디렉토리 = 색인, 멤버 단위 임의 접근)
+  index.json       시즌 ID, 원본 공개 URL prefix, blob 목록 (크기 / md5 / crc32c / sha256 / 헤더)
+  documents.jsonl  seasons/{season_id} 아래 문서 (상대 경로 + 데이터, 타임스탬프는 태그)
+  blobs/{name}     blob 저장 바이트 그대로 (이미지 / gzip은 무압축, 나머지는 deflate)
+- 문서 / 번들 매니페스트 / 시즌 요약의 공개 URL은 대상 버킷 prefix로 바꿔 씀
+- 복원은 대상 원격 해시 / 문서와 비교해서 같은 것은 생략 → 중단 후 같은 명령으로 재개
+"""
+
+import os
+import json
+import time
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from season_publish import ContentDigests, digests_match, DIGEST_CHUNK_SIZE
+
+# zipfile은 아카이브를 열 때 import (CLI의 다른 명령 시작 시간에 포함하지 않음)
+
+ARCHIVE_VERSION = 1
+DEFAULT_ARCHIVE_DIR = 'archives'
+ARCHIVE_SUFFIX = '.season.zip'
+
+INDEX_NAME = 'index.json'
+DOCUMENTS_NAME = 'documents.jsonl'
+BLOB_PREFIX = 'blobs/'
+
+# seasons/{season_id} 아래 컬렉션 (supply 문서마다 shards 하위 컬렉션)
+SEASON_COLLECTIONS = ('cards', 'supply', 'meta')
+SUBCOLLECTIONS = {'supply': 'shards'}
+
+TIMESTAMP_TAG = '__timestamp__'
+
+SPOOL_MAX_BYTES = 8 * 1024 * 1024  # export 시 이보다 큰 blob은 임시 파일에 받음
+
+
+class SeasonArchiveError(ValueError):
+    """아카이브 형식 오류 / 원본과 해시 불일치"""
+
+
+def archive_path(season_id: str, archive_dir: str = DEFAULT_ARCHIVE_DIR) -> str:
+    """시즌 아카이브 기본 경로"""
+    return os.path.join(archive_dir, f'{season_id}{ARCHIVE_SUFFIX}')
+
+
+def public_url_prefix(bucket) -> str:
+    """버킷 공개 URL prefix (blob.public_url에서 이름 부분을 뺀 값)"""
+    return bucket.blob('_').public_url[:-1]
+
+
+def document_ref(season_ref, path: str):
+    """시즌 문서 참조 + 상대 경로 ('cards/card_1', 'supply/card_1/shards/0', '' = 시즌 문서)"""
+
+    ref = season_ref
+    parts = path.split('/') if path else []
+    for collection, doc_id in zip(parts[::2], parts[1::2]):
+        ref = ref.collection(collection).document(doc_id)
+    return ref
+
+
+def rewrite_urls(value, source_prefix: str, target_prefix: str):
+    """문서 값 안의 원본 버킷 공개 URL → 대상 버킷 (dict / list 재귀)"""
+
+    if source_prefix == target_prefix:
+        return value
+    if isinstance(value, str):
+        return target_prefix + value[len(source_prefix):] if value.startswith(source_prefix) else value
+    if isinstance(value, dict):
+        return {key: rewrite_urls(item, source_prefix, target_prefix) for key, item in value.items()}
+    if isinstance(value, list):
+        return [rewrite_urls(item, source_prefix, target_prefix) for item in value]
+    return value
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {TIMESTAMP_TAG: value.isoformat()}
+    raise SeasonArchiveError(f"unsupported Firestore value: {type(value).__name__}")
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if set(value) == {TIMESTAMP_TAG}:
+            return datetime.fromisoformat(value[TIMESTAMP_TAG])
+        return {key: _decode_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_decode_value(item) for item in value]
+    return value
+
+
+def _stored(content_type: Optional[str], content_encoding: Optional[str]) -> bool:
+    """이미 압축된 내용인지 (이미지 / gzip은 deflate해도 줄지 않음)"""
+    return (content_type or '').startswith('image/') or content_encoding == 'gzip'
+
+
+class SeasonArchiveWriter:
+    """시즌 아카이브 쓰기 ({path}.partial에 쓰고 close 시 교체, 예외 시 삭제)"""
+
+    def __init__(self, path: str, season_id: str, source_prefix: str,
+                 source_bucket: Optional[str] = None):
+        self.path = path
+        self.season_id = season_id
+        self.source_prefix = source_prefix
+        self.source_bucket = source_bucket
+        self.blobs: List[Dict] = []
+        self.documents: List[Tuple[str, Dict]] = []
+        self.bytes = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._partial = path + '.partial'
+        import zipfile
+        self._zip = zipfile.ZipFile(self._partial, 'w', allowZip64=True)
+
+    def add_blob(self, blob, stream) -> Dict:
+        """Storage blob 1개 (stream: 저장 바이트 그대로) → 해시 기록, 원본 해시와 다르면 SeasonArchiveError"""
+
+        import zipfile
+        content_encoding = getattr(blob, 'content_encoding', None)
+        info = zipfile.ZipInfo(BLOB_PREFIX + blob.name, date_time=time.localtime()[:6])
+        info.compress_type = (zipfile.ZIP_STORED if _stored(blob.content_type, content_encoding)
+                              else zipfile.ZIP_DEFLATED)
+        digests = ContentDigests()
+        with self._zip.open(info, 'w', force_zip64=True) as out:
+            for chunk in iter(lambda: stream.read(DIGEST_CHUNK_SIZE), b''):
+                digests.update(chunk)
+                out.write(chunk)
+        entry = dict(digests.result(), name=blob.name, contentType=blob.content_type,
+                     cacheControl=blob.cache_control, contentEncoding=content_encoding)
+
+        source = {'md5': blob.md5_hash, 'crc32c': getattr(blob, 'crc32c', None), 'size': blob.size}
+        if (source['md5'] or source['crc32c']) and not digests_match(source, entry):
+            raise SeasonArchiveError(f"checksum mismatch while exporting {blob.name}")
+        self.blobs.append(entry)
+        self.bytes += entry['size']
+        return entry
+
+    def add_document(self, path: str, data: Dict):
+        """seasons/{season_id} 기준 상대 경로 ('' = 시즌 문서)"""
+        self.documents.append((path, data))
+
+    def close(self) -> str:
+        """문서 / 색인 쓰기 → 아카이브 경로"""
+
+        import zipfile
+        lines = [json.dumps({'path': path, 'data': data}, ensure_ascii=False, sort_keys=True,
+                            default=_encode_value)
+                 for path, data in self.documents]
+        self._zip.writestr(DOCUMENTS_NAME, '\n'.join(lines) + '\n', zipfile.ZIP_DEFLATED)
+        index = {
+            'version': ARCHIVE_VERSION,
+            'seasonId': self.season_id,
+            'exportedAt': datetime.now().isoformat(),
+            'source': {'bucket': self.source_bucket, 'urlPrefix': self.source_prefix},
+            'documentCount': len(self.documents),
+            'blobBytes': self.bytes,
+            'blobs': self.blobs,
+        }
+        self._zip.writestr(INDEX_NAME, json.dumps(index, ensure_ascii=False, indent=1),
+                           zipfile.ZIP_DEFLATED)
+        self._zip.close()
+        os.replace(self._partial, self.path)
+        return self.path
+
+    def abort(self):
+        self._zip.close()
+        if os.path.exists(self._partial):
+            os.remove(self._partial)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+class SeasonArchiveReader:
+    """시즌 아카이브 읽기 (blob 스트림은 여러 스레드에서 동시에 열 수 있음)"""
+
+    def __init__(self, path: str):
+        if not os.path.exists(path):
+            raise SeasonArchiveError(f"archive not found: {path}")
+        import zipfile
+        try:
+            self._zip = zipfile.ZipFile(path)
+            index = json.loads(self._zip.read(INDEX_NAME))
+        except (zipfile.BadZipFile, KeyError, ValueError) as e:
+            raise SeasonArchiveError(f"not a season archive: {path} ({e})") from e
+        if index.get('version') != ARCHIVE_VERSION:
+            raise SeasonArchiveError(f"unsupported archive version: {index.get('version')} "
+                                     f"(expected {ARCHIVE_VERSION})")
+        self.path = path
+        self.index = index
+        self.season_id: str = index['seasonId']
+        self.source_prefix: str = index['source']['urlPrefix']
+        self.blobs: List[Dict] = index['blobs']
+
+    def documents(self) -> Iterator[Tuple[str, Dict]]:
+        """(상대 경로, 문서 데이터) (타임스탬프는 datetime으로 복원)"""
+        for line in self._zip.read(DOCUMENTS_NAME).decode('utf-8').splitlines():
+            if line.strip():
+                record = json.loads(line)
+                yield record['path'], _decode_value(record['data'])
+
+    def open_blob(self, name: str):
+        """blob 저장 바이트 스트림 (끝까지 읽으면 ZIP CRC 검사)"""
+        return self._zip.open(BLOB_PREFIX + name)
+
+    def read_blob(self, name: str) -> bytes:
+        return self._zip.read(BLOB_PREFIX + name)
+
+    def close(self):
+        self._zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+시즌 번들 (앱이 요청 1~2번으로 시즌 전체를 로드)
+
+카드마다 공개 blob + Firestore 문서를 따로 읽으면 시즌 로드에 140번 가까이 요청합니다.
+업로드가 끝난 시즌을 다음 두 종류 파일로 묶습니다.
+- 썸네일 스프라이트 아틀라스 (WebP, 페이지당 최대 ATLAS_MAX_EDGE px → 70장은 1페이지)
+- 카드 메타데이터 전체 + 아틀라스 좌표를 담은 JSON 매니페스트 (gzip 업로드)
+
+썸네일은 카드 처리 중 로컬 사본에서 미리 만들어 둡니다 ({manifest_dir}/bundles/{season_id}/).
+Pillow는 썸네일 / 아틀라스 생성 시에만 import합니다.
+"""
+
+import os
+import gzip
+import json
+import hashlib
+from datetime import datetime
+from typing import Dict, List, Sequence, Tuple
+
+from image_variants import FORMAT_CONTENT_TYPES, encode_image
+
+BUNDLE_VERSION = 1
+
+# 기본 썸네일 크기 (긴 변 px) / 아틀라스 설정
+DEFAULT_THUMB_SIZE = 128
+ATLAS_MAX_EDGE = 2048  # 모바일 GPU 텍스처 한도 이내
+ATLAS_FORMAT = 'webp'
+
+
+def thumbnail_path(stage_dir: str, card_index: int) -> str:
+    """카드 썸네일 준비 파일 경로"""
+    return os.path.join(stage_dir, f'card_{card_index}.png')
+
+
+def render_thumbnail(source_path: str, out_path: str,
+                     size: int = DEFAULT_THUMB_SIZE) -> Tuple[int, int]:
+    """원본 → 썸네일 PNG (프로세스 풀에서 실행) → (width, height)"""
+
+    from PIL import Image
+
+    with Image.open(source_path) as source:
+        source.draft('RGB', (size * 2, size * 2))  # JPEG는 디코딩 단계에서 축소
+        mode = 'RGBA' if 'A' in source.getbands() or 'transparency' in source.info else 'RGB'
+        image = source.convert(mode)
+    image.thumbnail((size, size), Image.LANCZOS, reducing_gap=3.0)
+
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    tmp_path = out_path + '.tmp'
+    image.save(tmp_path, 'PNG')
+    os.replace(tmp_path, out_path)
+    return image.size
+
+
+def build_atlas(thumbnails: Sequence[Tuple[int, str]], out_dir: str,
+                size: int = DEFAULT_THUMB_SIZE, fmt: str = ATLAS_FORMAT,
+                max_edge: int = ATLAS_MAX_EDGE) -> Dict:
+    """썸네일 목록 [(card_index, path)] → 아틀라스 페이지 파일 (프로세스 풀에서 실행)
+
+    반환값: {'pages': [{path, width, height, bytes, content_type}],
+             'frames': {card_index: [page, x, y, width, height]}}
+    """
+
+    from PIL import Image
+
+    columns = max(1, max_edge // size)
+    per_page = columns * columns
+    pages, frames = [], {}
+
+    for page, start in enumerate(range(0, len(thumbnails), per_page)):
+        chunk = thumbnails[start:start + per_page]
+        page_columns = min(columns, len(chunk))
+        rows = -(-len(chunk) // page_columns)
+        atlas = Image.new('RGBA', (page_columns * size, rows * size), (0, 0, 0, 0))
+
+        for slot, (card_index, path) in enumerate(chunk):
+            x, y = (slot % page_columns) * size, (slot // page_columns) * size
+            with Image.open(path) as thumbnail:
+                atlas.paste(thumbnail.convert('RGBA'), (x, y))
+                frames[card_index] = [page, x, y, thumbnail.width, thumbnail.height]
+
+        path = os.path.join(out_dir, f'atlas_{page}.{fmt}')
+        encode_image(atlas, fmt, path)
+        pages.append({
+            'path': path,
+            'width': atlas.width,
+            'height': atlas.height,
+            'bytes': os.path.getsize(path),
+            'content_type': FORMAT_CONTENT_TYPES[fmt],
+        })
+
+    return {'pages': pages, 'frames': frames}
+
+
+def build_manifest(season_id: str, cards: List[Dict], atlas_urls: List[str],
+                   thumb_size: int) -> Dict:
+    """시즌 번들 매니페스트
+
+    cards: Firestore 카드 문서와 같은 필드 + sprite ([page, x, y, width, height],
+    아틀라스에 없는 카드는 null → 앱은 imagePath로 대체)
+    """
+
+    return {
+        'version': BUNDLE_VERSION,
+        'seasonId': season_id,
+        'generatedAt': datetime.now().isoformat(),
+        'cardCount': len(cards),
+        'thumbSize': thumb_size,
+        'atlases': atlas_urls,
+        'cards': cards,
+    }
+
+
+def pack_manifest(manifest: Dict) -> Tuple[bytes, str]:
+    """매니페스트 → (gzip 압축 JSON, 체크섬)
+
+    체크섬은 generatedAt을 제외한 내용 기준 (내용이 같으면 재실행해도 같은 값)
+    """
+
+    raw = json.dumps(manifest, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    content = dict(manifest)
+    content.pop('generatedAt', None)
+    stable = json.dumps(content, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+    return (gzip.compress(raw, compresslevel=9, mtime=0),
+            hashlib.sha256(stable.encode('utf-8')).hexdigest()[:16])
+
+
+def unpack_manifest(data: bytes) -> Dict:
+    """gzip 압축 매니페스트 → dict (pack_manifest의 역)"""
+    return json.loads(gzip.decompress(data))
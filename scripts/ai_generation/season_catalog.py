@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+로컬 시즌 카탈로그 (열 단위 저장, 오프라인 조회)
+
+생성한 모든 카드(프롬프트, 희귀도, 테마 / 스타일, 해시, URL, 소요 시간)를 로컬에 모아
+Firestore 문서 수백 개를 읽지 않고 시즌 간 질문에 답합니다.
+- 시즌마다 세그먼트 파일 1개 (추가만, 파일은 다시 쓰지 않음): catalog/{season_id}@{ns}.seg
+  같은 시즌의 새 세그먼트가 이전 세그먼트를 대체 (재실행 / 재동기화)
+- 세그먼트 = 열 블록 (리틀 엔디언 고정 폭 배열, 문자열은 offset + UTF-8 heap,
+  값 종류가 적은 열은 사전 코드) + JSON footer → mmap으로 필요한 열만 읽음
+- 조회: 사전 열 필터는 코드만 비교, 문자열은 남은 행만 디코딩
+"""
+
+import os
+import re
+import sys
+import json
+import mmap
+import heapq
+import struct
+import time
+from array import array
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+DEFAULT_CATALOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'catalog')
+
+SEGMENT_MAGIC = b'GCATSEG1'
+SEGMENT_VERSION = 1
+SEGMENT_SUFFIX = '.seg'
+FOOTER_STRUCT = struct.Struct('<I8s')  # footer 길이 + magic (파일 끝)
+
+
+class ColumnType:
+    DICT = 'dict'  # 값 종류가 적은 문자열 (uint16 코드 + footer의 값 목록)
+    INT = 'int'  # int64 (없으면 -1)
+    FLOAT = 'float'  # float64 (없으면 NaN)
+    STR = 'str'  # int64 offset n+1개 + UTF-8 heap
+
+
+class CatalogSource:
+    RUN = 'run'  # 이 호스트의 생성 실행
+    FIRESTORE = 'firestore'  # index 명령으로 동기화
+
+
+# 열 이름 → 종류 (행 dict의 키와 같음)
+COLUMNS = {
+    'season_id': ColumnType.DICT,
+    'mode': ColumnType.DICT,
+    'theme': ColumnType.DICT,
+    'style': ColumnType.DICT,
+    'rarity': ColumnType.DICT,
+    'model': ColumnType.DICT,
+    'source': ColumnType.DICT,  # CatalogSource
+    'index': ColumnType.INT,
+    'max_supply': ColumnType.INT,
+    'bytes': ColumnType.INT,
+    'generated_at': ColumnType.FLOAT,  # epoch 초
+    'generate_seconds': ColumnType.FLOAT,
+    'card_seconds': ColumnType.FLOAT,
+    'cost': ColumnType.FLOAT,
+    'name': ColumnType.STR,
+    'description': ColumnType.STR,
+    'prompt': ColumnType.STR,
+    'image_url': ColumnType.STR,
+    'checksum': ColumnType.STR,  # sha256 (업로드 원본)
+    'phash': ColumnType.STR,  # 지각 해시 (품질 검사 사용 시)
+    'variants': ColumnType.STR,  # 변형 URL map (JSON)
+}
+GROUP_COLUMNS = tuple(name for name, kind in COLUMNS.items() if kind == ColumnType.DICT)
+DEFAULT_QUERY_COLUMNS = ('season_id', 'index', 'rarity', 'name', 'image_url')
+
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+
+class CatalogError(ValueError):
+    """카탈로그 형식 / 조회 옵션 오류"""
+
+
+def _le(values: array) -> bytes:
+    """배열 → 리틀 엔디언 바이트"""
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _epoch(value) -> float:
+    """ISO 문자열 / datetime / 숫자 → epoch 초 (없으면 NaN)"""
+    if value is None or value == '':
+        return float('nan')
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+    try:
+        return datetime.fromisoformat(str(value)).timestamp()
+    except ValueError:
+        return float('nan')
+
+
+def _cell(kind: str, value):
+    """행 값 → 열 저장 값"""
+    if kind == ColumnType.INT:
+        return -1 if value is None else int(value)
+    if kind == ColumnType.FLOAT:
+        return float('nan') if value is None else float(value)
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, sort_keys=True)
+    return str(value)
+
+
+def write_segment(path: str, rows: Sequence[Dict], meta: Dict):
+    """행 목록 → 세그먼트 파일 ({path}.tmp에 쓰고 교체)"""
+
+    columns = {}
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(SEGMENT_MAGIC)
+        for name, kind in COLUMNS.items():
+            values = [_cell(kind, row.get(name) if name != 'generated_at'
+                            else _epoch(row.get(name))) for row in rows]
+            spec = {'type': kind, 'offset': f.tell()}
+            if kind == ColumnType.DICT:
+                dictionary = list(dict.fromkeys(values))
+                if len(dictionary) > 0xFFFF:
+                    raise CatalogError(f"too many distinct values in column {name}")
+                codes = {value: code for code, value in enumerate(dictionary)}
+                f.write(_le(array('H', (codes[value] for value in values))))
+                spec['values'] = dictionary
+            elif kind == ColumnType.INT:
+                f.write(_le(array('q', values)))
+            elif kind == ColumnType.FLOAT:
+                f.write(_le(array('d', values)))
+            else:
+                encoded = [value.encode('utf-8') for value in values]
+                offsets = array('q', [0])
+                for item in encoded:
+                    offsets.append(offsets[-1] + len(item))
+                f.write(_le(offsets))
+                spec['heap'] = f.tell()
+                f.write(b''.join(encoded))
+            spec['length'] = f.tell() - spec['offset']
+            columns[name] = spec
+        footer = json.dumps(dict(meta, version=SEGMENT_VERSION, rows=len(rows), columns=columns),
+                            ensure_ascii=False).encode('utf-8')
+        f.write(footer)
+        f.write(FOOTER_STRUCT.pack(len(footer), SEGMENT_MAGIC))
+    os.replace(tmp, path)
+
+
+class CatalogSegment:
+    """세그먼트 1개 (mmap, 열은 요청할 때 읽음)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            length, magic = FOOTER_STRUCT.unpack_from(self._mm, len(self._mm) - FOOTER_STRUCT.size)
+            if magic != SEGMENT_MAGIC or self._mm[:len(SEGMENT_MAGIC)] != SEGMENT_MAGIC:
+                raise CatalogError(f"not a catalog segment: {path}")
+            start = len(self._mm) - FOOTER_STRUCT.size - length
+            self.meta = json.loads(self._mm[start:start + length])
+        except (struct.error, ValueError) as e:
+            self._mm.close()
+            raise CatalogError(f"corrupt catalog segment: {path} ({e})") from e
+        if self.meta.get('version') != SEGMENT_VERSION:
+            self._mm.close()
+            raise CatalogError(f"unsupported catalog segment version: {path}")
+        self.rows: int = self.meta['rows']
+        self.season_id: str = self.meta['season_id']
+        self._cache: Dict[str, object] = {}
+
+    def _array(self, typecode: str, offset: int, count: int) -> array:
+        values = array(typecode)
+        values.frombytes(self._mm[offset:offset + count * values.itemsize])
+        if sys.byteorder == 'big':
+            values.byteswap()
+        return values
+
+    def codes(self, name: str) -> array:
+        """사전 열의 코드 배열"""
+        spec = self.meta['columns'][name]
+        if spec['type'] != ColumnType.DICT:
+            raise CatalogError(f"not a dictionary column: {name}")
+        if name not in self._cache:
+            self._cache[name] = self._array('H', spec['offset'], self.rows)
+        return self._cache[name]
+
+    def values(self, name: str) -> List[str]:
+        """사전 열의 값 목록 (코드 → 값)"""
+        return self.meta['columns'][name]['values']
+
+    def value(self, name: str, row: int):
+        """셀 1개 (문자열 열은 해당 행만 디코딩)"""
+
+        spec = self.meta['columns'][name]
+        kind = spec['type']
+        if kind == ColumnType.DICT:
+            return spec['values'][self.codes(name)[row]]
+        if kind in (ColumnType.INT, ColumnType.FLOAT):
+            if name not in self._cache:
+                self._cache[name] = self._array('q' if kind == ColumnType.INT else 'd',
+                                                spec['offset'], self.rows)
+            return self._cache[name][row]
+        if name not in self._cache:
+            self._cache[name] = self._array('q', spec['offset'], self.rows + 1)
+        offsets = self._cache[name]
+        start = spec['heap'] + offsets[row]
+        return self._mm[start:spec['heap'] + offsets[row + 1]].decode('utf-8')
+
+    def close(self):
+        self._cache.clear()
+        self._mm.close()
+
+
+def _tokens(text: str) -> set:
+    return set(_TOKEN.findall(text.lower()))
+
+
+class SeasonCatalog:
+    """카탈로그 디렉토리 (시즌별 최신 세그먼트만 사용)"""
+
+    def __init__(self, catalog_dir: str = DEFAULT_CATALOG_DIR):
+        self.catalog_dir = catalog_dir
+
+    def _segment_files(self) -> Dict[str, List[str]]:
+        """시즌 ID → 세그먼트 파일 목록 (오래된 것부터)"""
+
+        files: Dict[str, List[str]] = {}
+        if not os.path.isdir(self.catalog_dir):
+            return files
+        for name in sorted(os.listdir(self.catalog_dir)):
+            if not name.endswith(SEGMENT_SUFFIX) or '@' not in name:
+                continue
+            season_id, stamp = name[:-len(SEGMENT_SUFFIX)].rsplit('@', 1)
+            files.setdefault(season_id, []).append((int(stamp), name))
+        return {season_id: [os.path.join(self.catalog_dir, name) for _, name in sorted(items)]
+                for season_id, items in files.items()}
+
+    def seasons(self) -> Dict[str, str]:
+        """색인된 시즌 ID → 최신 세그먼트 경로"""
+        return {season_id: paths[-1] for season_id, paths in self._segment_files().items()}
+
+    def append_season(self, season_id: str, rows: Sequence[Dict], source: str) -> str:
+        """시즌 1개의 행 → 새 세그먼트 (이전 세그먼트는 삭제) → 세그먼트 경로"""
+
+        if not season_id or '/' in season_id or '@' in season_id:
+            raise CatalogError(f"invalid season ID for catalog: {season_id!r}")
+        os.makedirs(self.catalog_dir, exist_ok=True)
+        previous = self._segment_files().get(season_id, [])
+        path = os.path.join(self.catalog_dir, f'{season_id}@{time.time_ns()}{SEGMENT_SUFFIX}')
+        write_segment(path, [dict(row, season_id=season_id, source=row.get('source', source))
+                             for row in rows],
+                      {'season_id': season_id, 'source': source,
+                       'created_at': datetime.now().isoformat()})
+        for old in previous:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+        return path
+
+    def segments(self, season_ids: Optional[Iterable[str]] = None) -> Iterator[CatalogSegment]:
+        """시즌별 최신 세그먼트 (season_ids가 있으면 해당 시즌만, 파일 이름으로 거름)"""
+
+        wanted = set(season_ids) if season_ids else None
+        for season_id, path in sorted(self.seasons().items()):
+            if wanted is not None and season_id not in wanted:
+                continue
+            segment = CatalogSegment(path)
+            try:
+                yield segment
+            finally:
+                segment.close()
+
+    def _matches(self, segment: CatalogSegment, where: Dict[str, Sequence[str]],
+                 name_contains: Optional[str]) -> Iterator[int]:
+        """필터를 통과한 행 번호 (사전 열은 코드 비교, 이름은 남은 행만 디코딩)"""
+
+        allowed = []
+        for column, wanted in where.items():
+            if COLUMNS.get(column) != ColumnType.DICT:
+                raise CatalogError(f"cannot filter on column: {column}")
+            codes = {code for code, value in enumerate(segment.values(column)) if value in wanted}
+            if not codes:
+                return
+            allowed.append((segment.codes(column), codes))
+        needle = name_contains.lower() if name_contains else None
+        for row in range(segment.rows):
+            if all(column[row] in codes for column, codes in allowed):
+                if needle is None or needle in segment.value('name', row).lower():
+                    yield row
+
+    def query(self, where: Optional[Dict[str, Sequence[str]]] = None,
+              name_contains: Optional[str] = None,
+              columns: Sequence[str] = DEFAULT_QUERY_COLUMNS,
+              limit: Optional[int] = None) -> List[Dict]:
+        """필터에 맞는 카드 행 (시즌 ID / 카드 순서, limit개까지)"""
+
+        where = dict(where or {})
+        for column in columns:
+            if column not in COLUMNS:
+                raise CatalogError(f"unknown column: {column} (expected {', '.join(COLUMNS)})")
+        results = []
+        for segment in self.segments(where.pop('season_id', None)):
+            for row in self._matches(segment, where, name_contains):
+                results.append({column: segment.value(column, row) for column in columns})
+                if limit and len(results) >= limit:
+                    return results
+        return results
+
+    def group(self, by: Sequence[str], where: Optional[Dict[str, Sequence[str]]] = None,
+              name_contains: Optional[str] = None) -> List[Dict]:
+        """사전 열 기준 카드 수 / 시즌 수 / 예상 비용 (카드 수 많은 순)"""
+
+        for column in by:
+            if column not in GROUP_COLUMNS:
+                raise CatalogError(f"cannot group by {column} (expected {', '.join(GROUP_COLUMNS)})")
+        where = dict(where or {})
+        counts, seasons, costs = Counter(), {}, Counter()
+        for segment in self.segments(where.pop('season_id', None)):
+            codes = [segment.codes(column) for column in by]
+            values = [segment.values(column) for column in by]
+            for row in self._matches(segment, where, name_contains):
+                key = tuple(value[code[row]] for code, value in zip(codes, values))
+                counts[key] += 1
+                seasons.setdefault(key, set()).add(segment.season_id)
+                cost = segment.value('cost', row)
+                if cost == cost:
+                    costs[key] += cost
+        return [dict(zip(by, key), cards=count, seasons=len(seasons[key]),
+                     cost=round(costs[key], 4))
+                for key, count in counts.most_common()]
+
+    def similar(self, text: str, where: Optional[Dict[str, Sequence[str]]] = None,
+                columns: Sequence[str] = DEFAULT_QUERY_COLUMNS, limit: int = 10) -> List[Dict]:
+        """프롬프트(없으면 이름 + 설명)의 단어 집합 Jaccard 유사도 상위 limit개"""
+
+        query = _tokens(text)
+        if not query:
+            raise CatalogError("similarity query has no words")
+        where = dict(where or {})
+        best, order = [], 0  # (점수, 순번, 행) 최소 힙
+        for segment in self.segments(where.pop('season_id', None)):
+            for row in self._matches(segment, where, None):
+                prompt = segment.value('prompt', row) or (
+                    segment.value('name', row) + ' ' + segment.value('description', row))
+                words = _tokens(prompt)
+                score = len(query & words) / len(query | words) if words else 0.0
+                if score <= 0 or (len(best) >= limit and score <= best[0][0]):
+                    continue
+                # 출력 열은 상위 후보에 들어갈 때만 읽음 (세그먼트가 열려 있는 동안)
+                item = (score, order, dict({column: segment.value(column, row) for column in columns},
+                                           similarity=round(score, 4)))
+                order += 1
+                if len(best) < limit:
+                    heapq.heappush(best, item)
+                else:
+                    heapq.heapreplace(best, item)
+        return [item[2] for item in sorted(best, key=lambda item: (-item[0], item[1]))]
+
+    def summary(self) -> Dict:
+        """색인된 시즌 / 카드 수"""
+        seasons = self.seasons()
+        cards = 0
+        for segment in self.segments():
+            cards += segment.rows
+        return {'catalog_dir': self.catalog_dir, 'seasons': len(seasons), 'cards': cards}
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+시즌 생성 매니페스트 (체크포인트)
+
+완료된 카드마다 한 줄씩 JSONL 파일에 추가 기록합니다.
+- 시즌 ID별 파일: manifests/{season_id}.jsonl
+- 카드 인덱스 기준으로 마지막 기록이 최종 상태
+- --resume 실행 시 완료된 카드는 건너뛰고 누락/실패 카드만 재생성
+"""
+
+import os
+import json
+import threading
+from typing import Dict, Optional
+from datetime import datetime
+
+# 기본 매니페스트 디렉토리 (스크립트 위치 기준)
+DEFAULT_MANIFEST_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'manifests')
+
+
+class ManifestStatus:
+    DONE = 'done'
+    FAILED = 'failed'
+
+
+class SeasonManifest:
+    """시즌별 append-only 카드 매니페스트"""
+
+    def __init__(self, season_id: str, manifest_dir: str = DEFAULT_MANIFEST_DIR):
+        self.season_id = season_id
+        self.manifest_dir = manifest_dir
+        self.path = os.path.join(manifest_dir, f'{season_id}.jsonl')
+        self._lock = threading.Lock()
+
+    def load(self) -> Dict[int, Dict]:
+        """카드 인덱스별 최신 기록 로드"""
+
+        entries = {}
+        if not os.path.exists(self.path):
+            return entries
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # 크래시로 마지막 줄이 잘린 경우 무시
+                    print(f"   ⚠️ Skipping corrupt manifest line {line_no}: {self.path}")
+                    continue
+                if entry.get('season_id') != self.season_id:
+                    continue
+                entries[entry['index']] = entry
+
+        return entries
+
+    def completed(self) -> Dict[int, Dict]:
+        """완료(done) 상태의 카드만 반환"""
+
+        return {
+            index: entry for index, entry in self.load().items()
+            if entry.get('status') == ManifestStatus.DONE and entry.get('storage_url')
+        }
+
+    def _append(self, entry: Dict):
+        """한 줄 추가 (flush + fsync로 크래시에도 보존)"""
+
+        entry = dict(entry, season_id=self.season_id,
+                     recorded_at=datetime.now().isoformat())
+        line = json.dumps(entry, ensure_ascii=False)
+
+        with self._lock:
+            os.makedirs(self.manifest_dir, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+
+    def record_done(self, concept: Dict, prompt: str, image_url: str,
+                    storage_url: str, checksum: str):
+        """완료된 카드 기록"""
+
+        self._append({
+            'index': concept['index'],
+            'status': ManifestStatus.DONE,
+            'concept': concept,
+            'prompt': prompt,
+            'image_url': image_url,
+            'storage_url': storage_url,
+            'checksum': checksum,
+        })
+
+    def record_failed(self, concept: Dict, prompt: Optional[str], error: str):
+        """실패한 카드 기록 (--resume 시 재생성 대상)"""
+
+        self._append({
+            'index': concept['index'],
+            'status': ManifestStatus.FAILED,
+            'concept': concept,
+            'prompt': prompt,
+            'error': error,
+        })
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+다중 시즌 배치 계획 파일
+
+여러 주차 시즌을 한 프로세스에서 생성하기 위한 JSON 계획 파일을 읽습니다.
+- 시즌마다 mode / theme / style / week (또는 season_id)
+- 선택: cards (시즌 카드 수), rarity (희귀도 분배, 장수 또는 비율)
+- defaults 항목으로 공통 값 지정 가능
+
+예시:
+    {
+      "defaults": {"mode": "evolution", "style": "cute"},
+      "seasons": [
+        {"week": 12, "theme": "진화하는 몬스터"},
+        {"week": 13, "theme": "여름 이벤트", "cards": 5000, "rarity": {"normal": 60, "rare": 25, "superRare": 10, "ultraRare": 4.5, "secret": 0.5}},
+        {"week": 14, "mode": "thematic", "theme": "귀여운 동물들", "style": "pixelArt"},
+        {"season_id": "2025_S15_v2", "theme": "귀여운 공룡들"}
+      ]
+    }
+"""
+
+import json
+from typing import Dict, Iterable, List
+
+from card_allocation import RarityAllocationError, parse_rarity_spec
+
+# 시즌 ID 형식 기준 연도 (주차는 이 해의 1월 1일부터 계산)
+SEASON_YEAR = 2025
+
+
+class SeasonPlanError(ValueError):
+    """계획 파일 형식 오류"""
+
+
+def season_id_for_week(week: int, version: int = 1) -> str:
+    """주차 → 시즌 ID (예: 2025_S12_v1)"""
+    return f"{SEASON_YEAR}_S{week}_v{version}"
+
+
+def _positive_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+
+def parse_season_plan(plan, modes: Iterable[str], styles: Iterable[str]) -> List[Dict]:
+    """계획 데이터 검증 → 시즌 항목 목록
+
+    각 항목: {'season_id', 'mode', 'theme', 'style', 'custom_names', 'cards', 'rarity_weights'}
+    (cards / rarity_weights는 지정하지 않으면 None → 생성기 기본값)
+    """
+
+    if isinstance(plan, list):
+        plan = {'seasons': plan}
+    if not isinstance(plan, dict) or not isinstance(plan.get('seasons'), list):
+        raise SeasonPlanError("plan must be a list of seasons or an object with a 'seasons' list")
+
+    modes, styles = set(modes), set(styles)
+    defaults = plan.get('defaults', {})
+    entries = []
+    seen = set()
+
+    for position, raw in enumerate(plan['seasons'], start=1):
+        if not isinstance(raw, dict):
+            raise SeasonPlanError(f"season #{position}: entry must be an object")
+        entry = dict(defaults, **raw)
+
+        version = entry.get('version', 1)
+        if not _positive_int(version):
+            raise SeasonPlanError(f"season #{position}: 'version' must be a positive int")
+        if entry.get('season_id'):
+            season_id = str(entry['season_id'])
+        elif _positive_int(entry.get('week')):
+            season_id = season_id_for_week(entry['week'], version)
+        else:
+            raise SeasonPlanError(f"season #{position}: 'week' (positive int) or 'season_id' is required")
+
+        if season_id in seen:
+            raise SeasonPlanError(f"season #{position}: duplicate season {season_id}")
+        seen.add(season_id)
+
+        if entry.get('mode') not in modes:
+            raise SeasonPlanError(f"{season_id}: unknown mode {entry.get('mode')!r} "
+                                  f"(expected one of {', '.join(sorted(modes))})")
+        if entry.get('style') not in styles:
+            raise SeasonPlanError(f"{season_id}: unknown style {entry.get('style')!r} "
+                                  f"(expected one of {', '.join(sorted(styles))})")
+        if not entry.get('theme'):
+            raise SeasonPlanError(f"{season_id}: 'theme' is required")
+        cards = entry.get('cards')
+        if cards is not None and not _positive_int(cards):
+            raise SeasonPlanError(f"{season_id}: 'cards' must be a positive int")
+        custom_names = entry.get('custom_names')
+        if custom_names is not None and not (
+                isinstance(custom_names, list)
+                and all(isinstance(name, str) and name.strip() for name in custom_names)):
+            raise SeasonPlanError(f"{season_id}: 'custom_names' must be a list of non-empty strings")
+        rarity_weights = None
+        if entry.get('rarity') is not None:
+            try:
+                rarity_weights = parse_rarity_spec(entry['rarity'])
+            except RarityAllocationError as e:
+                raise SeasonPlanError(f"{season_id}: {e}") from e
+
+        entries.append({
+            'season_id': season_id,
+            'mode': entry['mode'],
+            'theme': entry['theme'],
+            'style': entry['style'],
+            'custom_names': custom_names,
+            'cards': cards,
+            'rarity_weights': rarity_weights,
+        })
+
+    if not entries:
+        raise SeasonPlanError("plan has no seasons")
+    return entries
+
+
+def load_season_plan(path: str, modes: Iterable[str], styles: Iterable[str]) -> List[Dict]:
+    """JSON 계획 파일 로드 + 검증"""
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            plan = json.load(f)
+    except json.JSONDecodeError as e:
+        raise SeasonPlanError(f"{path}: invalid JSON ({e})") from e
+    return parse_season_plan(plan, modes, styles)
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+시즌 차등 게시 (바뀐 blob / 문서 필드만 쓰기)
+
+같은 시즌을 다시 올릴 때 모든 이미지를 재업로드하고 카드 문서를 새 createdAt / generatedAt으로
+덮어쓰면 CDN 캐시가 무효화되고 앱이 같은 이미지를 다시 받습니다.
+원격 상태를 한 번 읽어(blob MD5 / CRC32C, 카드 문서 필드) 로컬 결과와 비교합니다.
+- 내용이 같은 blob: 업로드 생략
+- 카드 문서: 바뀐 필드만 merge (새 문서만 createdAt / generatedAt 기록)
+계획(PublishPlan)을 먼저 출력하고 적용은 병렬로 실행합니다.
+"""
+
+import base64
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+# 재실행마다 값이 바뀌는 필드 (비교 제외, 기존 값 유지)
+VOLATILE_FIELDS = ('createdAt', 'generatedAt')
+
+DIGEST_CHUNK_SIZE = 1024 * 1024
+
+
+class ContentDigests:
+    """스트림 해시 누적 → Storage와 같은 형식 (md5 / crc32c는 base64, sha256은 hex)
+
+    crc32c는 google-crc32c(google-cloud-storage 의존성)가 있을 때만 계산합니다.
+    """
+
+    def __init__(self):
+        try:
+            import google_crc32c
+            self._crc = google_crc32c.Checksum()
+        except ImportError:
+            self._crc = None
+        self._md5, self._sha256 = hashlib.md5(), hashlib.sha256()
+        self.size = 0
+
+    def update(self, chunk: bytes):
+        self._md5.update(chunk)
+        self._sha256.update(chunk)
+        if self._crc is not None:
+            self._crc.update(chunk)
+        self.size += len(chunk)
+
+    def result(self) -> Dict:
+        return {
+            'md5': base64.b64encode(self._md5.digest()).decode('ascii'),
+            'crc32c': (base64.b64encode(self._crc.digest()).decode('ascii')
+                       if self._crc is not None else None),
+            'sha256': self._sha256.hexdigest(),
+            'size': self.size,
+        }
+
+
+def file_digests(path: str) -> Dict:
+    """로컬 파일 → Storage와 같은 형식의 해시 (ContentDigests 참고)"""
+
+    digests = ContentDigests()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(DIGEST_CHUNK_SIZE), b''):
+            digests.update(chunk)
+    return digests.result()
+
+
+def digests_match(remote: Dict, digests: Dict) -> bool:
+    """원격 blob 정보 {md5, crc32c, size} ↔ 로컬 해시 (MD5 우선, composite 객체는 CRC32C)"""
+
+    if remote.get('size') is not None and remote['size'] != digests['size']:
+        return False
+    if remote.get('md5'):
+        return remote['md5'] == digests['md5']
+    return bool(remote.get('crc32c')) and remote['crc32c'] == digests['crc32c']
+
+
+class RemoteSeason:
+    """원격 시즌 상태 스냅샷 (blob 해시, 카드 문서, 시즌 문서, 발행 수량 / 요약 문서)"""
+
+    def __init__(self, season_id: str, blobs: Dict[str, Dict], docs: Dict[str, Dict],
+                 season_doc: Optional[Dict] = None, supply: Optional[Dict[str, Dict]] = None,
+                 summary: Optional[Dict] = None):
+        self.season_id = season_id
+        self.blobs = blobs
+        self.docs = docs
+        self.season_doc = season_doc or {}
+        self.supply = supply or {}
+        self.summary = summary or {}
+
+    @classmethod
+    def fetch(cls, bucket, db, season_id: str) -> 'RemoteSeason':
+        """blob 목록 / 카드 문서 / 시즌 문서 / 발행 수량 / 요약을 병렬로 읽기 (blocking)"""
+
+        season_ref = db.collection('seasons').document(season_id)
+
+        def list_blobs():
+            return {
+                blob.name: {'md5': blob.md5_hash, 'crc32c': getattr(blob, 'crc32c', None),
+                            'size': blob.size}
+                for blob in bucket.list_blobs(prefix=f'seasons/{season_id}/')
+            }
+
+        def read_docs():
+            return {snapshot.id: snapshot.to_dict()
+                    for snapshot in season_ref.collection('cards').stream()}
+
+        def read_season():
+            snapshot = season_ref.get()
+            return snapshot.to_dict() if snapshot.exists else None
+
+        def read_supply():
+            return {snapshot.id: snapshot.to_dict()
+                    for snapshot in season_ref.collection('supply').stream()}
+
+        def read_summary():
+            snapshot = season_ref.collection('meta').document('summary').get()
+            return snapshot.to_dict() if snapshot.exists else None
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            blobs, docs, season_doc, supply, summary = (
+                executor.submit(list_blobs), executor.submit(read_docs),
+                executor.submit(read_season), executor.submit(read_supply),
+                executor.submit(read_summary)
+            )
+            return cls(season_id, blobs.result(), docs.result(), season_doc.result(),
+                       supply.result(), summary.result())
+
+    def blob_unchanged(self, name: str, digests: Dict) -> bool:
+        """원격 blob이 같은 내용인지 (MD5 우선, composite 객체는 CRC32C)"""
+
+        remote = self.blobs.get(name)
+        return bool(remote) and digests_match(remote, digests)
+
+    def document_write(self, doc_id: str, document: Dict) -> Optional[Tuple[Dict, bool, List[str]]]:
+        """카드 문서 → 필요한 쓰기 (data, merge, 바뀐 필드), 같으면 None
+
+        - 새 문서: 전체 (createdAt 포함)
+        - 바뀐 필드만 있음: 해당 필드만 merge
+        - 로컬에서 빠진 필드가 있음: 전체 덮어쓰기 (createdAt / generatedAt은 기존 값 유지)
+        """
+
+        remote = self.docs.get(doc_id)
+        if remote is None:
+            return document, False, sorted(document)
+
+        stable = {key: value for key, value in document.items() if key not in VOLATILE_FIELDS}
+        changed = sorted(key for key, value in stable.items() if remote.get(key) != value)
+        removed = sorted(set(remote) - set(document))
+        if removed:
+            kept = {key: remote[key] for key in VOLATILE_FIELDS if key in remote}
+            return dict(stable, **kept), False, changed + [f'-{key}' for key in removed]
+        if not changed:
+            return None
+        return {key: stable[key] for key in changed}, True, changed
+
+
+class PublishPlan:
+    """차등 게시 계획 (업로드할 blob, 쓸 문서, 생략한 개수)"""
+
+    def __init__(self, season_id: str):
+        self.season_id = season_id
+        self.uploads: List[Dict] = []  # {name, path, content_type, card_index, reason}
+        self.writes: List[Dict] = []  # {doc_id, data, merge, fields}
+        self.unchanged_blobs = 0
+        self.unchanged_docs = 0
+
+    def add_upload(self, name: str, path: str, content_type: str,
+                   card_index: Optional[int], remote: RemoteSeason):
+        reason = 'changed' if name in remote.blobs else 'new'
+        self.uploads.append({'name': name, 'path': path, 'content_type': content_type,
+                             'card_index': card_index, 'reason': reason})
+
+    def add_write(self, doc_id: str, write: Optional[Tuple[Dict, bool, List[str]]]):
+        if write is None:
+            self.unchanged_docs += 1
+            return
+        data, merge, fields = write
+        self.writes.append({'doc_id': doc_id, 'data': data, 'merge': merge, 'fields': fields})
+
+    @property
+    def empty(self) -> bool:
+        return not self.uploads and not self.writes
+
+    def print_plan(self, limit: int = 20):
+        """계획 출력 (항목이 많으면 앞쪽 limit개만)"""
+
+        print(f"📝 Publish plan for {self.season_id}: "
+              f"{len(self.uploads)} uploads ({self.unchanged_blobs} unchanged), "
+              f"{len(self.writes)} document writes ({self.unchanged_docs} unchanged)")
+        for upload in self.uploads[:limit]:
+            print(f"   ⬆️  {upload['reason']:<7} {upload['name']}")
+        for write in self.writes[:limit]:
+            mode = 'merge' if write['merge'] else 'set'
+            print(f"   ✏️  {mode:<7} cards/{write['doc_id']}: {', '.join(write['fields'])}")
+        hidden = max(0, len(self.uploads) - limit) + max(0, len(self.writes) - limit)
+        if hidden:
+            print(f"   ... {hidden} more")
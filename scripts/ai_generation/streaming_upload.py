@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+스트리밍 다운로드 → 업로드 유틸리티
+
+provider 응답을 청크 단위로 읽어 GCS resumable upload에 그대로 전달합니다.
+- 전체 이미지를 메모리에 올리지 않음 (카드당 최대 메모리 ≈ 업로드 청크 크기)
+- 읽는 동안 sha256 체크섬과 바이트 수를 계산
+- 선택적으로 캐시 파일에 동시에 기록 (tee)
+- 앞부분 바이트로 이미지 포맷 감지 (Content-Type / 확장자)
+"""
+
+import os
+import hashlib
+import tempfile
+from typing import Iterator, Optional, Tuple
+
+# 다운로드 청크 크기 (requests iter_content)
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# GCS resumable upload 청크 크기 (256KB 배수여야 함)
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# 포맷 감지에 필요한 앞부분 바이트 수
+SNIFF_SIZE = 16
+
+
+def sniff_image_type(head: bytes) -> Tuple[str, str]:
+    """파일 앞부분 → (Content-Type, 확장자)
+
+    알 수 없는 포맷은 기존 동작대로 PNG로 간주합니다.
+    """
+
+    if head.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'image/png', 'png'
+    if head.startswith(b'\xff\xd8\xff'):
+        return 'image/jpeg', 'jpg'
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'image/webp', 'webp'
+    if head[:6] in (b'GIF87a', b'GIF89a'):
+        return 'image/gif', 'gif'
+    if head[4:12] in (b'ftypavif', b'ftypavis'):
+        return 'image/avif', 'avif'
+    return 'image/png', 'png'
+
+
+class ChunkedStreamReader:
+    """bytes 청크 iterator를 업로드용 file-like 객체로 감싸기"""
+
+    def __init__(self, chunks: Iterator[bytes], sink=None):
+        self._chunks = iter(chunks)
+        self._buffer = bytearray()
+        self._position = 0
+        self._sha256 = hashlib.sha256()
+        self._sink = sink
+
+    def _fill(self, size: int):
+        """버퍼에 size 바이트 이상 채우기 (size < 0이면 끝까지)"""
+
+        while size < 0 or len(self._buffer) < size:
+            try:
+                chunk = next(self._chunks)
+            except StopIteration:
+                break
+            if not chunk:
+                continue
+            self._sha256.update(chunk)
+            if self._sink is not None:
+                self._sink.write(chunk)
+            self._buffer.extend(chunk)
+
+    def peek(self, size: int) -> bytes:
+        """소비하지 않고 앞부분 미리 보기 (포맷 감지용)"""
+
+        self._fill(size)
+        return bytes(self._buffer[:size])
+
+    def read(self, size: int = -1) -> bytes:
+        """size 바이트를 채울 때까지 읽기 (EOF 전에는 짧게 반환하지 않음)
+
+        GCS resumable upload는 요청보다 짧은 청크를 마지막 청크로 간주합니다.
+        """
+
+        self._fill(size)
+        if size < 0:
+            size = len(self._buffer)
+
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        self._position += len(data)
+        return data
+
+    def tell(self) -> int:
+        return self._position
+
+    @property
+    def checksum(self) -> str:
+        """지금까지 읽은 데이터의 sha256"""
+        return self._sha256.hexdigest()
+
+    @property
+    def bytes_read(self) -> int:
+        return self._position
+
+
+class SpoolWriter:
+    """스트림 사본을 임시 파일로 기록 (CacheWriter와 같은 write/commit/abort)
+
+    캐시를 쓰지 않을 때 업로드한 원본을 후처리(변형 생성)용으로 남깁니다.
+    commit() 후 파일 삭제는 호출한 쪽의 책임입니다.
+    """
+
+    def __init__(self, spool_dir: Optional[str] = None):
+        fd, self.path = tempfile.mkstemp(prefix='gacha_card_', suffix='.img', dir=spool_dir)
+        self._file = os.fdopen(fd, 'wb')
+
+    def write(self, data: bytes):
+        self._file.write(data)
+
+    def commit(self) -> str:
+        self._file.close()
+        return self.path
+
+    def abort(self):
+        self._file.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def iter_file_chunks(f, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """파일 객체를 청크 단위로 읽기"""
+    return iter(lambda: f.read(chunk_size), b'')
+
+
+def create_http_session(pool_size: int, retries: Optional[int] = 2):
+    """카드 전체에서 재사용할 커넥션 풀 HTTP 세션 생성"""
+
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                          max_retries=retries)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+카드 발행 수량 분산 카운터 (shard) / 시즌 요약 문서
+
+앱의 뽑기 트랜잭션(lib/services/gacha_service.dart)은 카드마다 재고 문서 1개를 읽고 올립니다.
+출시일에 인기 카드 하나로 뽑기가 몰리면 그 문서 하나에서 트랜잭션이 경합합니다
+(Firestore 문서 1개는 초당 약 1회 쓰기).
+- 카드의 maxSupply를 N개 shard로 나눠 각 shard가 capacity / 시리얼 구간을 가짐
+  → 뽑기는 임의의 shard 1개만 읽고 올림 (합계가 maxSupply를 넘지 않음, 전역 시리얼 카운터 불필요)
+- shard 수: 드롭 확률 × 예상 최대 초당 뽑기 수 / 같은 희귀도 카드 수 (희귀도 / 수요 비례)
+- 시즌 요약 문서: 카드 ID, 희귀도별 목록, 이름 / 설명 / 이미지 / 변형, 발행 수량, shard 수 → 앱은 읽기 1번
+
+Firestore 구조:
+  seasons/{season_id}/supply/{card_id}            {cardId, rarity, maxSupply, shards}
+  seasons/{season_id}/supply/{card_id}/shards/{i}  {count, capacity, serialOffset}
+  seasons/{season_id}/meta/summary                 시즌 요약
+"""
+
+import json
+import math
+import hashlib
+from typing import Dict, List, Sequence
+
+from card_allocation import RARITY_ORDER
+from gacha_simulator import DEFAULT_DROP_RATES
+
+DEFAULT_PEAK_PULLS_PER_SECOND = 500.0  # 출시 직후 시즌 전체 초당 뽑기 수 (플레이어 수만 명 기준)
+SHARD_WRITES_PER_SECOND = 1.0  # 문서 1개가 경합 없이 받는 초당 쓰기 수
+MAX_SHARDS = 64
+
+SUMMARY_VERSION = 1
+SUMMARY_MAX_BYTES = 900 * 1024  # Firestore 문서 최대 1 MiB (필드 이름 / 인덱스 여유)
+
+# 요약에 넣는 카드 문서 필드 (createdAt 등 실행마다 바뀌는 값 제외)
+SUMMARY_FIELDS = ('name', 'rarity', 'description', 'imagePath', 'variants', 'maxSupply')
+
+
+def shard_counts(documents: Sequence[Dict],
+                 peak_pulls_per_second: float = DEFAULT_PEAK_PULLS_PER_SECOND,
+                 drop_rates: Sequence[float] = DEFAULT_DROP_RATES) -> Dict[str, int]:
+    """카드 문서 목록 → {카드 ID: shard 수} (1 ~ MAX_SHARDS, 발행 수량 이하)
+
+    카드 1장의 예상 초당 뽑기 수 = 최대 초당 뽑기 수 × 희귀도 드롭 확률 / 같은 희귀도 카드 수
+    """
+
+    rates = dict(zip(RARITY_ORDER, drop_rates))
+    per_rarity = {}
+    for document in documents:
+        per_rarity[document['rarity']] = per_rarity.get(document['rarity'], 0) + 1
+
+    counts = {}
+    for document in documents:
+        demand = (peak_pulls_per_second * rates.get(document['rarity'], 0.0)
+                  / per_rarity[document['rarity']])
+        shards = math.ceil(demand / SHARD_WRITES_PER_SECOND)
+        counts[document['id']] = max(1, min(shards, MAX_SHARDS, document['maxSupply']))
+    return counts
+
+
+def shard_documents(max_supply: int, shards: int) -> List[Dict]:
+    """발행 수량 → shard별 {capacity, serialOffset} (앞쪽 shard가 나머지를 1개씩 더 가짐)
+
+    shard i의 시리얼 번호: serialOffset + count (1부터, 카드 안에서 겹치지 않음)
+    """
+
+    base, extra = divmod(max_supply, shards)
+    documents, offset = [], 0
+    for shard in range(shards):
+        capacity = base + (1 if shard < extra else 0)
+        documents.append({'capacity': capacity, 'serialOffset': offset})
+        offset += capacity
+    return documents
+
+
+def layout_changed(previous: Dict, supply: Dict) -> bool:
+    """supply 문서의 shard 구성(shard 수 / 발행 수량)이 바뀌었는지 (shard 시리얼 구간이 달라짐)"""
+    return (previous.get('shards'), previous.get('maxSupply')) != (supply['shards'], supply['maxSupply'])
+
+
+def migrate_shards(max_supply: int, shards: int, existing: Dict[int, Dict]) -> List[Dict]:
+    """이미 뽑힌 기존 shard(번호 → {count, capacity, serialOffset}) → 새 구성 shard 문서 (count 포함)
+
+    기존 shard i가 발행한 시리얼: serialOffset + 1 ~ serialOffset + count.
+    새 shard의 count = 자기 구간 안에서 이미 발행된 가장 큰 시리얼 - serialOffset
+    → 같은 시리얼을 다시 발행하지 않고 합계도 max_supply를 넘지 않음 (구간 사이의 빈 번호는 버림).
+    """
+
+    issued = [(shard.get('serialOffset', 0), shard.get('serialOffset', 0) + shard.get('count', 0))
+              for shard in existing.values() if shard.get('count', 0) > 0]
+    documents = []
+    for document in shard_documents(max_supply, shards):
+        start, end = document['serialOffset'], document['serialOffset'] + document['capacity']
+        high = max((min(last, end) for first, last in issued if first < end and last > start),
+                   default=start)
+        documents.append(dict(document, count=high - start))
+    return documents
+
+
+def build_summary(season_id: str, documents: Sequence[Dict],
+                  shards: Dict[str, int]) -> Dict:
+    """카드 문서 목록 → 시즌 요약 (checksum은 내용 기준, 같으면 다시 쓸 필요 없음)"""
+
+    cards = {}
+    rarities = {rarity: [] for rarity in RARITY_ORDER}
+    for document in documents:
+        entry = {key: document[key] for key in SUMMARY_FIELDS if document.get(key) is not None}
+        if document['id'] in shards:
+            entry['supplyShards'] = shards[document['id']]
+        cards[document['id']] = entry
+        rarities.setdefault(document['rarity'], []).append(document['id'])
+
+    summary = {
+        'seasonId': season_id,
+        'version': SUMMARY_VERSION,
+        'cardCount': len(cards),
+        'cardIds': list(cards),
+        'rarities': rarities,
+        'cards': cards,
+    }
+    summary['checksum'] = summary_checksum(summary)
+    return summary
+
+
+def summary_checksum(summary: Dict) -> str:
+    """요약 내용 체크섬 (checksum / updatedAt 제외)"""
+    content = {key: value for key, value in summary.items() if key not in ('checksum', 'updatedAt')}
+    encoded = json.dumps(content, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def summary_size(summary: Dict) -> int:
+    """요약 문서 크기 추정 (JSON 바이트)"""
+    return len(json.dumps(summary, ensure_ascii=False).encode('utf-8'))
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+모델 라우터 테스트
+
+백업 모델이 계속 이겨도 (기본 모델 요청이 취소되거나 빠르게 실패해도) hedge 대기 시간이
+관측된 p95에서 내려가지 않는지 확인합니다.
+실행: python3 test_model_router.py (또는 pytest)
+"""
+
+import sys
+import random
+
+from model_router import ModelRouter, MIN_SAMPLES
+
+PRIMARY, BACKUP = 'recraft-v3', 'flux-2-pro'
+
+
+def _warm_router(rng: random.Random) -> ModelRouter:
+    """기본 모델 지연 시간 표본(20-30초)을 채운 라우터"""
+
+    router = ModelRouter(backups=[BACKUP], min_hedge_delay=0.0)
+    for _ in range(MIN_SAMPLES * 2):
+        router.record(PRIMARY, rng.uniform(20.0, 30.0), ok=True)
+    return router
+
+
+def test_hedge_delay_stable_when_backup_wins():
+    rng = random.Random(7)
+    router = _warm_router(rng)
+    initial = router.hedge_delay(PRIMARY)
+
+    cancelled = 0
+    for _ in range(1000):
+        delay = router.hedge_delay(PRIMARY)
+        latency = rng.uniform(20.0, 30.0)
+        if rng.random() < 0.8:
+            # 429 폭주: 빠른 실패
+            router.record(PRIMARY, rng.uniform(0.01, 0.2), ok=False)
+        elif latency <= delay:
+            router.record(PRIMARY, latency, ok=True)
+        else:
+            # hedge 후 백업이 먼저 끝남 → 기본 모델 요청 취소
+            router.record_cancelled(PRIMARY, delay + 0.5)
+            cancelled += 1
+
+    # 실패 / 취소를 성공 지연 시간으로 넣으면 p95가 20초대 초반까지 내려가서 hedge가 점점 늘어남
+    assert initial * 0.97 <= router.hedge_delay(PRIMARY) <= 31.0
+    stats = router.snapshot()[PRIMARY]
+    assert stats['cancelled'] == cancelled > 0
+    assert stats['error_rate'] > 0.5  # 취소는 오류율에 넣지 않음
+
+
+def test_cancelled_backup_keeps_delay():
+    rng = random.Random(3)
+    router = _warm_router(rng)
+    initial = router.hedge_delay(PRIMARY)
+    # 경쟁 요청이 먼저 끝나서 일찍 취소된 요청도 표본은 hedge 대기 시간 이상
+    for _ in range(500):
+        router.record_cancelled(PRIMARY, rng.uniform(0.0, 1.0))
+    assert router.hedge_delay(PRIMARY) >= initial
+
+
+def test_failures_do_not_shorten_delay():
+    rng = random.Random(11)
+    router = _warm_router(rng)
+    initial = router.hedge_delay(PRIMARY)
+    for _ in range(500):
+        router.record(PRIMARY, 0.05, ok=False)
+    assert router.hedge_delay(PRIMARY) == initial
+
+
+def main():
+    print("\n🧪 Starting model router tests...\n")
+    for test in (test_hedge_delay_stable_when_backup_wins, test_cancelled_backup_keeps_delay,
+                 test_failures_do_not_shorten_delay):
+        test()
+        print(f"   ✅ {test.__name__}")
+    print("\n✅ Model router tests passed!")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+재시도 정책 테스트
+
+오류 분류(상태 코드 / 메시지 대체 판정)와 오류 종류별 시도 횟수를 확인합니다.
+실행: python3 test_retry_policy.py (또는 pytest)
+"""
+
+import io
+import sys
+import asyncio
+from contextlib import redirect_stdout
+
+from generate_cards_with_ai import AICardGenerator, GenerationFailedError
+from fake_backends import FakeProviderError
+from retry_policy import ErrorKind, RetryPolicy, classify_error, classify_transfer_error
+
+
+def test_classify_by_status():
+    assert classify_error(FakeProviderError('slow down', 429)) == ErrorKind.RATE_LIMIT
+    assert classify_error(FakeProviderError('bad prompt', 400)) == ErrorKind.CONTENT_REJECTED
+    assert classify_error(FakeProviderError('gateway', 504)) == ErrorKind.TIMEOUT
+    assert classify_error(FakeProviderError('boom', 500)) == ErrorKind.TRANSIENT
+    assert classify_error(asyncio.TimeoutError()) == ErrorKind.TIMEOUT
+    # 다운로드 / 업로드: 403 (만료된 서명 URL 등)은 콘텐츠 거부가 아님
+    assert classify_transfer_error(FakeProviderError('forbidden', 403)) == ErrorKind.TRANSIENT
+
+
+def test_classify_by_message():
+    assert classify_error(Exception('HTTP 429 Too Many Requests')) == ErrorKind.RATE_LIMIT
+    assert classify_error(Exception('rate limit reached')) == ErrorKind.RATE_LIMIT
+    assert classify_error(Exception('monthly quota exceeded')) == ErrorKind.QUOTA_EXHAUSTED
+    assert classify_error(Exception('blocked by safety filter')) == ErrorKind.CONTENT_REJECTED
+    assert classify_error(Exception('read timed out')) == ErrorKind.TIMEOUT
+    # 숫자 안의 429, 일반적인 'rejected'는 해당 없음
+    assert classify_error(Exception('image 4290x2160 failed to render')) == ErrorKind.TRANSIENT
+    assert classify_transfer_error(
+        Exception('upload failed: bucket request id 84291 internal error')) == ErrorKind.TRANSIENT
+    assert classify_error(Exception('request rejected by upstream proxy')) == ErrorKind.TRANSIENT
+
+
+def test_quota_fails_fast():
+    policy = RetryPolicy()
+    assert not policy.should_retry(ErrorKind.QUOTA_EXHAUSTED, 1)
+    assert policy.should_retry(ErrorKind.RATE_LIMIT, 5)
+
+
+def _scripted_generator(errors):
+    """errors를 차례로 던진 뒤 성공하는 생성기 (백오프 대기 없음)"""
+
+    generator = AICardGenerator(season_id='RETRY_TEST', retry_policy=RetryPolicy(max_delay=0.0),
+                                report_dir=None, catalog_dir=None)
+    script = list(errors)
+
+    async def request_routed(client, concept, prompt, count, attempt):
+        if script:
+            raise script.pop(0)
+        return 'model', ['https://example.invalid/image.png']
+
+    generator._request_routed = request_routed
+    return generator
+
+
+def _generate(generator):
+    concept = {'index': 0, 'name': 'Retry Card', 'rarity': 'normal', 'description': 'retry test'}
+    with redirect_stdout(io.StringIO()):
+        return asyncio.run(generator._generate_image_urls(None, concept, 'cute'))
+
+
+def test_attempts_counted_per_kind():
+    # 429 5번 뒤의 timeout도 timeout 시도 횟수(3회) 안에서 다시 시도
+    errors = [FakeProviderError('slow down', 429)] * 5 + [asyncio.TimeoutError()] * 2
+    assert _generate(_scripted_generator(errors)) == ['https://example.invalid/image.png']
+
+    errors = [FakeProviderError('slow down', 429)] * 2 + [asyncio.TimeoutError()] * 3
+    try:
+        _generate(_scripted_generator(errors))
+    except GenerationFailedError as e:
+        assert (e.kind, e.attempts) == (ErrorKind.TIMEOUT, 5)
+    else:
+        raise AssertionError('timeout limit was not applied')
+
+
+def main():
+    print("\n🧪 Starting retry policy tests...\n")
+    for test in (test_classify_by_status, test_classify_by_message, test_quota_fails_fast,
+                 test_attempts_counted_per_kind):
+        test()
+        print(f"   ✅ {test.__name__}")
+    print("\n✅ Retry policy tests passed!")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
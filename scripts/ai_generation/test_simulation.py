@@ -2,85 +2,95 @@
 """
 AI 카드 생성 시뮬레이션 테스트
 
-Firebase Admin SDK 없이 전체 프로세스를 테스트합니다.
-실제 Firebase 업로드 없이 로컬에서 동작을 확인할 수 있습니다.
+가짜 백엔드(fake_backends)로 70장 시즌 전체 경로를 실행하고 결과를 확인합니다.
+Firebase Admin SDK / Genspark 크레딧 없이 실행: python3 test_simulation.py (또는 pytest)
 """
 
-import time
-from datetime import datetime
-
-class SimulationTest:
-    """시뮬레이션 테스트"""
-    
-    def __init__(self):
-        self.season_id = "2025_S1_v1_SIMULATION"
-    
-    def test_card_generation(self):
-        """70장 카드 생성 시뮬레이션"""
-        
-        print("=" * 60)
-        print("🎴 AI Card Generation - SIMULATION MODE")
-        print("=" * 60)
-        print("⚠️  This is a simulation without actual AI generation")
-        print("=" * 60)
-        
-        # 카드 컨셉 (간단한 예시)
-        concepts = []
-        rarities = ['normal'] * 20 + ['rare'] * 20 + ['superRare'] * 20 + ['ultraRare'] * 9 + ['secret'] * 1
-        
-        for i, rarity in enumerate(rarities):
-            concepts.append({
-                'index': i,
-                'name': f'Test Card #{i+1}',
-                'rarity': rarity,
-                'description': f'This is a test card with {rarity} rarity'
-            })
-        
-        print(f"\n✅ Generated {len(concepts)} card concepts")
-        print(f"   Normal: 20, Rare: 20, SR: 20, UR: 9, Secret: 1")
-        
-        # 이미지 생성 시뮬레이션
-        print(f"\n🎨 Simulating AI image generation...")
-        print(f"   (In real mode, this would take 30-40 minutes)")
-        
-        start_time = time.time()
-        
-        for i, concept in enumerate(concepts):
-            # 빠른 시뮬레이션 (0.1초)
-            time.sleep(0.1)
-            
-            # 진행률 표시
-            if (i + 1) % 10 == 0 or i == 0 or i == len(concepts) - 1:
-                progress = (i + 1) / len(concepts) * 100
-                print(f"   [{i+1}/70] {concept['name']} - Progress: {progress:.1f}%")
-        
-        elapsed = time.time() - start_time
-        
-        print(f"\n✅ Simulation complete!")
-        print(f"   Time: {elapsed:.1f} seconds (vs. 30-40 min in real mode)")
-        print(f"   Average: {elapsed/70:.3f}s per card")
-        print(f"\n📊 Summary:")
-        print(f"   Total Cards: 70")
-        print(f"   Success: 70/70 (100%)")
-        print(f"   Season ID: {self.season_id}")
-        
-        return True
+import io
+import os
+import sys
+import tempfile
+from collections import Counter
+from contextlib import redirect_stdout
+
+from generate_cards_with_ai import AICardGenerator, CardStyle, GenerationMode
+from card_allocation import allocate_counts, thematic_table, DEFAULT_RARITY_WEIGHTS, RARITY_ORDER
+from fake_backends import FakeImageServer, FakeGenSparkSDK, FakeBucket, FakeFirestore
+
+SEASON_ID = '2025_S1_v1_SIMULATION'
+SEASON_SIZE = 70
+
+
+def run_simulation(work_dir: str):
+    """가짜 백엔드로 시즌 1개 생성 → (결과, Firestore, Storage bucket, 카드 컨셉)"""
+
+    concepts = thematic_table(allocate_counts(SEASON_SIZE, DEFAULT_RARITY_WEIGHTS), 'Test Card')
+    db, bucket = FakeFirestore(), FakeBucket()
+    with FakeImageServer() as server:
+        generator = AICardGenerator(
+            season_id=SEASON_ID,
+            manifest_dir=os.path.join(work_dir, 'manifests'),
+            rate_limit=1000.0,
+            report_dir=None,
+            catalog_dir=None,
+            db=db,
+            bucket=bucket,
+            sdk_factory=FakeGenSparkSDK(server, latency_ms=5, seed=1).factory
+        )
+        with redirect_stdout(io.StringIO()):
+            result = generator.generate_full_season(
+                mode=GenerationMode.THEMATIC,
+                theme='simulation',
+                style=CardStyle.CUTE,
+                card_concepts=[dict(concept) for concept in concepts]
+            )
+    return result, db, bucket, concepts
+
+
+def test_fake_season():
+    """70장 시즌: 전부 성공, 카드 문서 / 이미지 / 발행 수량 / 시즌 요약 기록"""
+
+    with tempfile.TemporaryDirectory(prefix='gacha_sim_') as work_dir:
+        result, db, bucket, concepts = run_simulation(work_dir)
+
+    assert result['success']
+    assert (result['generated'], result['saved'], result['failed']) == (SEASON_SIZE, SEASON_SIZE, 0)
+
+    prefix = f'seasons/{SEASON_ID}'
+    cards = {path.rsplit('/', 1)[1]: data for path, data in db.docs.items()
+             if path.startswith(f'{prefix}/cards/')}
+    assert sorted(cards) == sorted(f"card_{concept['index']}" for concept in concepts)
+    for concept in concepts:
+        card = cards[f"card_{concept['index']}"]
+        blob_name = f"{prefix}/cards/card_{concept['index']}.png"
+        assert (card['name'], card['rarity'], card['seasonId']) == \
+            (concept['name'], concept['rarity'], SEASON_ID)
+        assert card['imagePath'] == bucket.blobs[blob_name].public_url
+    assert Counter(card['rarity'] for card in cards.values()) == \
+        Counter(concept['rarity'] for concept in concepts)
+
+    images = [name for name in bucket.blobs if name.startswith(f'{prefix}/cards/')]
+    assert len(images) == SEASON_SIZE
+    assert set(images) <= bucket.public
+    assert all(bucket.blobs[name].size > 0 and bucket.blobs[name].content_type == 'image/png'
+               for name in images)
+
+    supply = [path for path in db.docs if path.startswith(f'{prefix}/supply/') and path.count('/') == 3]
+    assert len(supply) == SEASON_SIZE
+    summary = db.docs[f'{prefix}/meta/summary']
+    assert summary['cardCount'] == SEASON_SIZE
+    assert sorted(summary['cardIds']) == sorted(cards)
+    assert set(summary['rarities']) <= set(RARITY_ORDER)
+
 
 def main():
     print("\n🧪 Starting simulation test...\n")
-    
-    tester = SimulationTest()
-    success = tester.test_card_generation()
-    
-    if success:
-        print("\n" + "=" * 60)
-        print("✅ Simulation test passed!")
-        print("=" * 60)
-        print("\n📝 Next Steps:")
-        print("   1. Upload Firebase Admin SDK key to /opt/flutter/")
-        print("   2. Integrate real Genspark AI image_generation tool")
-        print("   3. Run: python3 generate_cards_with_ai.py")
-        print("=" * 60)
+    test_fake_season()
+    print("=" * 60)
+    print(f"✅ Simulation test passed! ({SEASON_SIZE} cards, fake Firestore / Storage)")
+    print("=" * 60)
+    return 0
+
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())